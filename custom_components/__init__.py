@@ -0,0 +1 @@
+"""Dummy init so that pytest works."""
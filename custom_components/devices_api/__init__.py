@@ -3,22 +3,70 @@
 from __future__ import annotations
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.typing import ConfigType
-from .constants import DOMAIN, CONFIG, YAML_CONFIG
+from .constants import (
+    DOMAIN,
+    CONFIG,
+    YAML_CONFIG,
+    INDEX,
+    RESPONSE_CACHE,
+    CHANGE_LOG,
+    EVENT_BROKER,
+    SEARCH_INDEX,
+    REQUEST_COALESCER,
+    METRICS,
+    PROFILER,
+    CHATGPT_CLIENT,
+    JOB_QUEUE,
+    STATE_CACHE,
+)
+from .cache import ResponseCache
+from .changes import ChangeLog
+from .chatgpt import ChatGPTClient
+from .coalescing import RequestCoalescer
+from .events import EventBroker
 from .configuration import Configuration
+from .index import RegistryIndex
+from .jobs import JobQueue
+from .metrics import Metrics
+from .profiling import Profiler
+from .search import SearchIndex
+from .state import StateCache
 from .router import (
     Router,
     DevicesAPIDevicesListView,
+    DevicesAPIDevicesBatchView,
     DevicesAPIDeviceInformationView,
+    DevicesAPIDevicePromptView,
+    DevicesAPIEntitiesListView,
     DevicesAPIAreasListView,
     DevicesAPIAreaInformationView,
     DevicesAPIAreaDevicesListView,
+    DevicesAPISnapshotView,
+    DevicesAPIChangesView,
+    DevicesAPISearchView,
+    DevicesAPIJobsView,
+    DevicesAPIJobView,
+    DevicesAPIStatsView,
+    DevicesAPIMetricsView,
+    DevicesAPIEventsView,
 )
 
 
 # Initializes the component
-def setup(hass: HomeAssistant, configuration: ConfigType) -> bool:
+async def async_setup(hass: HomeAssistant, configuration: ConfigType) -> bool:
     """Perform the setup for devices_api component."""
     _initialize_configuration(hass, configuration)
+    _initialize_index(hass)
+    _initialize_response_cache(hass)
+    _initialize_request_coalescer(hass)
+    _initialize_change_log(hass)
+    _initialize_event_broker(hass)
+    _initialize_search_index(hass)
+    _initialize_state_cache(hass)
+    await _async_initialize_chatgpt_client(hass)
+    _initialize_job_queue(hass)
+    _initialize_metrics(hass)
+    _initialize_profiler(hass)
     _register_routes(hass)
     return True
 
@@ -31,6 +79,93 @@ def _initialize_configuration(hass: HomeAssistant, configuration: ConfigType) ->
     hass.data[DOMAIN][YAML_CONFIG] = configuration
 
 
+# Builds the registry index and keeps it current from the registry events
+def _initialize_index(hass: HomeAssistant) -> None:
+    """Build the registry index of the component."""
+    index = RegistryIndex(hass, hass.data[DOMAIN][CONFIG])
+    index.async_setup()
+    hass.data[DOMAIN][INDEX] = index
+
+
+# Initializes the cache of the encoded responses, dropping the stale ones on every registry change
+def _initialize_response_cache(hass: HomeAssistant) -> None:
+    """Initialize the cache of the encoded responses."""
+    config = hass.data[DOMAIN][CONFIG].get_response_cache()
+    response_cache = ResponseCache(config.get_max_entries(), config.get_max_size())
+    hass.data[DOMAIN][INDEX].async_add_listener(response_cache.apply_change)
+    hass.data[DOMAIN][RESPONSE_CACHE] = response_cache
+
+
+# Initializes the coalescer of the concurrent identical requests
+def _initialize_request_coalescer(hass: HomeAssistant) -> None:
+    """Initialize the coalescer of the concurrent identical requests."""
+    hass.data[DOMAIN][REQUEST_COALESCER] = RequestCoalescer()
+
+
+# Initializes the log of the registry changes
+def _initialize_change_log(hass: HomeAssistant) -> None:
+    """Initialize the log of the registry changes."""
+    change_log = ChangeLog()
+    hass.data[DOMAIN][INDEX].async_add_listener(change_log.append)
+    hass.data[DOMAIN][CHANGE_LOG] = change_log
+
+
+# Initializes the broker of the Server-Sent Events
+def _initialize_event_broker(hass: HomeAssistant) -> None:
+    """Initialize the broker of the Server-Sent Events."""
+    event_broker = EventBroker(hass, hass.data[DOMAIN][CONFIG])
+    hass.data[DOMAIN][INDEX].async_add_listener(event_broker.async_publish)
+    hass.data[DOMAIN][EVENT_BROKER] = event_broker
+
+
+# Builds the name search index and keeps it current from the registry changes
+def _initialize_search_index(hass: HomeAssistant) -> None:
+    """Build the name search index of the component."""
+    search_index = SearchIndex(hass)
+    search_index.async_setup()
+    hass.data[DOMAIN][INDEX].async_add_listener(search_index.async_apply_change)
+    hass.data[DOMAIN][SEARCH_INDEX] = search_index
+
+
+# Initializes the cache of the encoded entity states, dropped on their state changes
+def _initialize_state_cache(hass: HomeAssistant) -> None:
+    """Initialize the cache of the encoded entity states."""
+    state_cache = StateCache(hass)
+    state_cache.async_setup()
+    hass.data[DOMAIN][STATE_CACHE] = state_cache
+
+
+# Initializes the ChatGPT client and loads its stored response cache
+async def _async_initialize_chatgpt_client(hass: HomeAssistant) -> None:
+    """Initialize the ChatGPT client of the component."""
+    client = ChatGPTClient(hass, hass.data[DOMAIN][CONFIG].get_chatgpt())
+    await client.async_load()
+    hass.data[DOMAIN][CHATGPT_CLIENT] = client
+
+
+# Initializes the queue of the automation generation jobs (its workers start with the first job)
+def _initialize_job_queue(hass: HomeAssistant) -> None:
+    """Initialize the queue of the automation generation jobs."""
+    hass.data[DOMAIN][JOB_QUEUE] = JobQueue(
+        hass, hass.data[DOMAIN][CONFIG], hass.data[DOMAIN][CHATGPT_CLIENT]
+    )
+
+
+# Initializes the request metrics (left out when disabled, so that the views are not instrumented)
+def _initialize_metrics(hass: HomeAssistant) -> None:
+    """Initialize the request metrics of the component."""
+    if hass.data[DOMAIN][CONFIG].get_metrics().is_enabled():
+        hass.data[DOMAIN][METRICS] = Metrics()
+
+
+# Initializes the request profiler (left out when disabled, so that the views are not instrumented)
+def _initialize_profiler(hass: HomeAssistant) -> None:
+    """Initialize the request profiler of the component."""
+    profiling = hass.data[DOMAIN][CONFIG].get_profiling()
+    if profiling.is_enabled():
+        hass.data[DOMAIN][PROFILER] = Profiler(profiling.get_max_entries())
+
+
 # Registers all available routes of the component
 def _register_routes(hass: HomeAssistant) -> None:
     router = Router(hass)
@@ -39,8 +174,19 @@ def _register_routes(hass: HomeAssistant) -> None:
             DevicesAPIAreasListView(),
             DevicesAPIAreaInformationView(),
             DevicesAPIDevicesListView(),
+            DevicesAPIDevicesBatchView(),
             DevicesAPIDeviceInformationView(),
+            DevicesAPIDevicePromptView(),
+            DevicesAPIEntitiesListView(),
             DevicesAPIAreaDevicesListView(),
+            DevicesAPISnapshotView(),
+            DevicesAPIChangesView(),
+            DevicesAPISearchView(),
+            DevicesAPIJobsView(),
+            DevicesAPIJobView(),
+            DevicesAPIStatsView(),
+            DevicesAPIMetricsView(),
+            DevicesAPIEventsView(),
         ]
     )
     router.register()
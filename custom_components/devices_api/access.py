@@ -0,0 +1,113 @@
+"""Client address matching for the Devices API component."""
+
+from __future__ import annotations
+from ipaddress import IPv6Address, ip_address, ip_network
+from typing import Callable, Dict, List
+
+
+# Class: AddressTrie
+class AddressTrie:
+    """Binary prefix tree of networks of one IP version, looked up in O(prefix length)."""
+
+    # Root node: [child for bit 0, child for bit 1, TRUE if a network ends here]
+    _root: List
+    # Address size in bits (32 or 128)
+    _bits: int
+
+    # Constructor
+    def __init__(self, bits: int) -> None:
+        """Constructor."""
+        self._root = [None, None, False]
+        self._bits = bits
+
+    # Adds the network given by its address and prefix length
+    def add(self, address: int, prefix_length: int) -> None:
+        """Add the network given by its address and prefix length."""
+        node = self._root
+        for position in range(prefix_length):
+            bit = (address >> (self._bits - 1 - position)) & 1
+            child = node[bit]
+            if child is None:
+                child = node[bit] = [None, None, False]
+            node = child
+        node[2] = True
+
+    # Returns TRUE if the address is in one of the networks
+    def contains(self, address: int) -> bool:
+        """Return TRUE if the address is in one of the networks."""
+        node = self._root
+        for position in range(self._bits - 1, -1, -1):
+            if node[2]:
+                return True
+            node = node[(address >> position) & 1]
+            if node is None:
+                return False
+        return node[2]
+
+
+# Class: AddressMatcher
+class AddressMatcher:
+    """IPv4 and IPv6 addresses and CIDR ranges, compiled into one prefix tree per IP version."""
+
+    # IP version -> Prefix tree
+    _tries: Dict[int, AddressTrie]
+    # Number of added networks
+    _size: int
+
+    # Constructor (raises ValueError on an invalid address or range)
+    def __init__(self, networks: List[str] | None = None) -> None:
+        """Constructor."""
+        self._tries = {4: AddressTrie(32), 6: AddressTrie(128)}
+        self._size = 0
+        for network in networks or []:
+            self.add(network)
+
+    # Adds the address or CIDR range
+    def add(self, network: str) -> None:
+        """Add the address or CIDR range."""
+        parsed = ip_network(network.strip(), strict=False)
+        self._tries[parsed.version].add(
+            int(parsed.network_address), parsed.prefixlen
+        )
+        self._size += 1
+
+    # Returns TRUE if no network was added
+    def is_empty(self) -> bool:
+        """Return TRUE if no network was added."""
+        return self._size == 0
+
+    # Returns TRUE if the address is in one of the networks (FALSE for an invalid address)
+    def matches(self, address: str | None) -> bool:
+        """Return TRUE if the address is in one of the networks."""
+        if not address:
+            return False
+
+        try:
+            parsed = ip_address(address.strip())
+        except ValueError:
+            return False
+
+        # IPv4 clients of dual-stack sockets show up as ::ffff:a.b.c.d
+        if isinstance(parsed, IPv6Address) and parsed.ipv4_mapped is not None:
+            parsed = parsed.ipv4_mapped
+
+        return self._tries[parsed.version].contains(int(parsed))
+
+
+# Returns the client address: the peer address, or the last address of X-Forwarded-For
+# not added by a trusted proxy when the peer is one
+def get_client_address(
+    remote: str | None,
+    forwarded_for: str | None,
+    is_trusted_proxy: Callable[[str], bool],
+) -> str | None:
+    """Return the client address, honouring X-Forwarded-For from trusted proxies only."""
+    if not forwarded_for or remote is None or not is_trusted_proxy(remote):
+        return remote
+
+    addresses = [address.strip() for address in forwarded_for.split(",")]
+    for address in reversed(addresses):
+        if address and not is_trusted_proxy(address):
+            return address
+
+    return addresses[0] or remote
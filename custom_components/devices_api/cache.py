@@ -0,0 +1,181 @@
+"""Response cache for the Devices API component."""
+
+from __future__ import annotations
+from collections import OrderedDict
+from hashlib import blake2b
+from typing import Dict
+from .changes import RegistryChange
+
+
+# Class: CachedResponse
+class CachedResponse:
+    """Encoded response body, valid for a single registry revision."""
+
+    # Registry revision the body was built for
+    _revision: int
+    # Encoded response body
+    _body: bytes
+    # Entity tag of the response body
+    _etag: str
+    # Compressed bodies by content coding
+    _variants: Dict[str, bytes]
+
+    # Constructor
+    def __init__(self, revision: int, body: bytes) -> None:
+        """Constructor."""
+        self._revision = revision
+        self._body = body
+        self._etag = '"{:x}-{}"'.format(
+            revision, blake2b(body, digest_size=8).hexdigest()
+        )
+        self._variants = {}
+
+    # Returns the registry revision the body was built for
+    def get_revision(self) -> int:
+        """Return the registry revision the body was built for."""
+        return self._revision
+
+    # Returns the encoded response body (its compressed variant if a content coding is given, None until built)
+    def get_body(self, encoding: str | None = None) -> bytes | None:
+        """Return the encoded response body, or its compressed variant if a content coding is given."""
+        if encoding is None:
+            return self._body
+        return self._variants.get(encoding)
+
+    # Stores the body compressed with the content coding
+    def set_variant(self, encoding: str, body: bytes) -> None:
+        """Store the body compressed with the content coding."""
+        self._variants[encoding] = body
+
+    # Returns the size (in bytes) of the body and of its compressed variants
+    def get_size(self) -> int:
+        """Return the size of the body and of its compressed variants."""
+        return len(self._body) + sum(len(body) for body in self._variants.values())
+
+    # Returns the entity tag of the response body (of its compressed variant if a content coding is given)
+    def get_etag(self, encoding: str | None = None) -> str:
+        """Return the entity tag of the response body."""
+        if encoding is None:
+            return self._etag
+        return self._etag[:-1] + "-" + encoding + '"'
+
+
+# Class: ResponseCache
+class ResponseCache:
+    """LRU cache of encoded response bodies, keyed by request.
+
+    The cache is bounded by its number of responses and by their total size,
+    compressed variants included. Responses of an older registry revision are
+    dropped as soon as the registries change, not when their key comes back.
+    """
+
+    # Cached responses by request key
+    _entries: OrderedDict[str, CachedResponse]
+    # Maximum number of cached responses
+    _max_entries: int
+    # Maximum total size (in bytes) of the cached responses
+    _max_size: int
+    # Total size (in bytes) of the cached responses
+    _size: int
+    # Number of lookups that found a current response
+    _hits: int
+    # Number of lookups that did not
+    _misses: int
+
+    # Constructor
+    def __init__(self, max_entries: int = 256, max_size: int = 16 * 1024 * 1024) -> None:
+        """Constructor."""
+        self._entries = OrderedDict()
+        self._max_entries = max_entries
+        self._max_size = max_size
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+
+    # Returns the cached response for the key if it was built for the revision
+    def get(self, key: str, revision: int) -> CachedResponse | None:
+        """Return the cached response for the key if it was built for the revision."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+
+        if entry.get_revision() != revision:
+            self._remove(key)
+            self._misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return entry
+
+    # Stores the response for the key (a response larger than the whole cache is not stored)
+    def set(self, key: str, entry: CachedResponse) -> None:
+        """Store the response for the key."""
+        self._remove(key)
+        if entry.get_size() > self._max_size:
+            return
+
+        self._entries[key] = entry
+        self._size += entry.get_size()
+        self._trim()
+
+    # Stores the compressed variant of the response for the key, counting it in the cache size
+    def set_variant(self, key: str, entry: CachedResponse, encoding: str, body: bytes) -> None:
+        """Store the compressed variant of the response for the key."""
+        previous = entry.get_body(encoding)
+        entry.set_variant(encoding, body)
+        # The response may have been dropped since it was looked up
+        if self._entries.get(key) is not entry:
+            return
+
+        self._size += len(body) - (len(previous) if previous is not None else 0)
+        if entry.get_size() > self._max_size:
+            self._remove(key)
+        self._trim()
+
+    # Drops the responses built for another registry revision
+    def drop_stale(self, revision: int) -> None:
+        """Drop the responses built for another registry revision."""
+        for key in [key for key, entry in self._entries.items() if entry.get_revision() != revision]:
+            self._remove(key)
+
+    # Drops the responses made stale by the registry change
+    def apply_change(self, change: RegistryChange) -> None:
+        """Drop the responses made stale by the registry change."""
+        self.drop_stale(change.get_revision())
+
+    # Removes all cached responses
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        self._entries.clear()
+        self._size = 0
+
+    # Returns the lookup counters, the number of cached responses and their total size as a dictionary
+    def as_dict(self) -> Dict[str, int]:
+        """Return the lookup counters, the number of cached responses and their total size as a dictionary."""
+        return {
+            "entries": len(self._entries),
+            "size": self._size,
+            "hits": self._hits,
+            "misses": self._misses,
+        }
+
+    # Removes the response for the key, if any
+    def _remove(self, key: str) -> None:
+        """Remove the response for the key, if any."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry.get_size()
+
+    # Removes the least recently used responses above the number and size limits
+    def _trim(self) -> None:
+        """Remove the least recently used responses above the number and size limits."""
+        while self._entries and (len(self._entries) > self._max_entries or self._size > self._max_size):
+            _, entry = self._entries.popitem(last=False)
+            self._size -= entry.get_size()
+
+    # Returns the number of cached responses
+    def __len__(self) -> int:
+        """Return the number of cached responses."""
+        return len(self._entries)
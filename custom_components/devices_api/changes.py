@@ -0,0 +1,127 @@
+"""Registry change log for the Devices API component."""
+
+from __future__ import annotations
+from collections import deque
+from typing import Any, Deque, Dict, List
+
+# Area registry change type.
+CHANGE_TYPE_AREA = "area"
+# Device registry change type.
+CHANGE_TYPE_DEVICE = "device"
+# Entity registry change type.
+CHANGE_TYPE_ENTITY = "entity"
+
+
+# Class: RegistryChange
+class RegistryChange:
+    """Single area, device or entity registry mutation."""
+
+    # Registry revision the change produced
+    _revision: int
+    # Changed object type (area, device or entity)
+    _type: str
+    # Change action (create, update or remove)
+    _action: str
+    # Changed object ID
+    _id: str
+    # Previous object ID (renamed entities only)
+    _old_id: str | None
+    # Names of the changed registry fields (updates only)
+    _fields: List[str]
+
+    # Constructor
+    def __init__(
+        self,
+        revision: int,
+        change_type: str,
+        action: str,
+        object_id: str,
+        old_id: str | None = None,
+        fields: List[str] = None,
+    ) -> None:
+        """Constructor."""
+        self._revision = revision
+        self._type = change_type
+        self._action = action
+        self._id = object_id
+        self._old_id = old_id
+        self._fields = fields or []
+
+    # Returns the registry revision the change produced
+    def get_revision(self) -> int:
+        """Return the registry revision the change produced."""
+        return self._revision
+
+    # Returns the changed object type
+    def get_type(self) -> str:
+        """Return the changed object type."""
+        return self._type
+
+    # Returns the change action
+    def get_action(self) -> str:
+        """Return the change action."""
+        return self._action
+
+    # Returns the changed object ID
+    def get_id(self) -> str:
+        """Return the changed object ID."""
+        return self._id
+
+    # Returns the previous object ID
+    def get_old_id(self) -> str | None:
+        """Return the previous object ID."""
+        return self._old_id
+
+    # Returns the names of the changed registry fields
+    def get_fields(self) -> List[str]:
+        """Return the names of the changed registry fields."""
+        return self._fields
+
+    # Returns the change as a dictionary
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the change as a dictionary."""
+        return {
+            "revision": self._revision,
+            "type": self._type,
+            "action": self._action,
+            "id": self._id,
+            "old_id": self._old_id,
+            "fields": self._fields,
+        }
+
+
+# Class: ChangeLog
+class ChangeLog:
+    """Bounded log of the latest registry changes, ordered by revision."""
+
+    # Logged changes, oldest first
+    _changes: Deque[RegistryChange]
+
+    # Constructor
+    def __init__(self, max_changes: int = 10000) -> None:
+        """Constructor."""
+        self._changes = deque(maxlen=max_changes)
+
+    # Appends the change to the log (dropping the oldest one when the log is full)
+    def append(self, change: RegistryChange) -> None:
+        """Append the change to the log."""
+        self._changes.append(change)
+
+    # Returns the changes made after the revision, or None when the log no longer covers it
+    def get_since(self, revision: int, current_revision: int) -> List[RegistryChange] | None:
+        """Return the changes made after the revision, or None when the log no longer covers it."""
+        if revision > current_revision:
+            return None
+        if revision == current_revision:
+            return []
+        if not self._changes or self._changes[0].get_revision() > revision + 1:
+            return None
+
+        changes: List[RegistryChange] = []
+        for change in reversed(self._changes):
+            if change.get_revision() <= revision:
+                break
+            changes.append(change)
+        changes.reverse()
+
+        return changes
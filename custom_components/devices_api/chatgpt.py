@@ -0,0 +1,196 @@
+"""ChatGPT client for the Devices API component."""
+
+from __future__ import annotations
+from asyncio import Semaphore, TimeoutError, sleep
+from collections import OrderedDict
+from hashlib import sha256
+from random import random
+from typing import Any, Dict
+from unicodedata import normalize
+from aiohttp import ClientError, ClientSession, ClientTimeout, hdrs
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import Store
+from .coalescing import RequestCoalescer
+from .configuration import ChatGPTConfiguration
+from .constants import DOMAIN
+from .errors import ERROR_CHATGPT_FAILED, ERROR_CHATGPT_NOT_CONFIGURED
+
+# Version of the stored response cache.
+STORAGE_VERSION = 1
+# Storage key of the response cache.
+STORAGE_KEY = f"{DOMAIN}.chatgpt_cache"
+# Seconds the response cache waits for more changes before it is saved.
+STORAGE_SAVE_DELAY = 10
+# Response statuses worth retrying.
+RETRY_STATUSES = frozenset((408, 409, 429, 500, 502, 503, 504))
+# Delay before the first retry (in seconds), doubled on every retry.
+BACKOFF_BASE = 1.0
+# Longest delay between two retries (in seconds).
+BACKOFF_MAX = 30.0
+
+
+# Class: ChatGPTClient
+class ChatGPTClient:
+    """Chat completions client with bounded concurrency, retries and a persistent response cache.
+
+    Requests go through the Home Assistant shared aiohttp session (and its
+    connection pool). Responses are cached by model and normalized prompt and
+    saved to the Home Assistant storage, so asking again for an unchanged prompt
+    does not call the API, and identical prompts in flight share one request.
+    """
+
+    # HomeAssistant instance
+    _hass: HomeAssistant
+    # ChatGPT configuration
+    _config: ChatGPTConfiguration
+    # Limits the number of concurrent API requests
+    _semaphore: Semaphore
+    # Storage of the response cache
+    _store: Store
+    # Cache key -> Response content, least recently used first
+    _cache: OrderedDict[str, str]
+    # Shares the in-flight requests between identical prompts
+    _coalescer: RequestCoalescer
+    # Number of API requests sent (retries included)
+    _requests: int
+    # Number of completions answered from the cache
+    _cache_hits: int
+
+    # Constructor
+    def __init__(self, hass: HomeAssistant, config: ChatGPTConfiguration) -> None:
+        """Constructor."""
+        self._hass = hass
+        self._config = config
+        self._semaphore = Semaphore(config.get_max_concurrency())
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._cache = OrderedDict()
+        self._coalescer = RequestCoalescer()
+        self._requests = 0
+        self._cache_hits = 0
+
+    # Loads the stored response cache
+    async def async_load(self) -> None:
+        """Load the stored response cache."""
+        stored = await self._store.async_load()
+        if stored:
+            self._cache.update(stored.get("responses", {}))
+            self._trim_cache()
+
+    # Returns the completion of the prompt, from the cache when the same prompt was already answered
+    async def async_complete(self, prompt: str) -> str:
+        """Return the completion of the prompt."""
+        if not self._config.get_api_key():
+            raise ERROR_CHATGPT_NOT_CONFIGURED.copy()
+
+        prompt = normalize_prompt(prompt)
+        key = build_cache_key(self._config.get_model_name(), prompt)
+
+        content = self._cache.get(key)
+        if content is not None:
+            self._cache.move_to_end(key)
+            self._cache_hits += 1
+            return content
+
+        return await self._coalescer.run(key, lambda: self._async_request(key, prompt))
+
+    # Returns the counters as a dictionary
+    def as_dict(self) -> Dict[str, int]:
+        """Return the counters as a dictionary."""
+        return {
+            "requests": self._requests,
+            "cache_hits": self._cache_hits,
+            "cached": len(self._cache),
+        }
+
+    # Sends the prompt, retrying the transient failures with an exponential backoff, and caches the response
+    async def _async_request(self, key: str, prompt: str) -> str:
+        """Send the prompt and cache the response."""
+        session: ClientSession = async_get_clientsession(self._hass)
+        url = f"{self._config.get_base_url()}/chat/completions"
+        headers = {hdrs.AUTHORIZATION: f"Bearer {self._config.get_api_key()}"}
+        payload = {
+            "model": self._config.get_model_name(),
+            "messages": [{"role": "user", "content": prompt}],
+        }
+        timeout = ClientTimeout(total=self._config.get_timeout())
+        max_retries = self._config.get_max_retries()
+
+        for attempt in range(max_retries + 1):
+            # Jitter keeps concurrent retries from hitting the API at once
+            delay = min(BACKOFF_BASE * 2**attempt, BACKOFF_MAX) * (0.5 + random() / 2)
+            try:
+                # The semaphore is only held while a request is in flight, not while backing off
+                async with self._semaphore:
+                    self._requests += 1
+                    async with session.post(
+                        url, json=payload, headers=headers, timeout=timeout
+                    ) as response:
+                        if response.status == 200:
+                            content = _get_content(await response.json(content_type=None))
+                            self._store_response(key, content)
+                            return content
+
+                        if response.status not in RETRY_STATUSES or attempt == max_retries:
+                            raise ERROR_CHATGPT_FAILED.copy()
+                        delay = _get_retry_after(response.headers, delay)
+            except (ClientError, TimeoutError, ValueError) as error:
+                if attempt == max_retries:
+                    raise ERROR_CHATGPT_FAILED.copy() from error
+
+            await sleep(delay)
+
+        raise ERROR_CHATGPT_FAILED.copy()
+
+    # Caches the response and schedules the save of the cache
+    def _store_response(self, key: str, content: str) -> None:
+        """Cache the response and schedule the save of the cache."""
+        self._cache[key] = content
+        self._cache.move_to_end(key)
+        self._trim_cache()
+        self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
+    # Removes the least recently used responses above the cache size
+    def _trim_cache(self) -> None:
+        """Remove the least recently used responses above the cache size."""
+        while len(self._cache) > self._config.get_cache_size():
+            self._cache.popitem(last=False)
+
+    # Returns the response cache to save
+    def _data_to_save(self) -> Dict[str, Any]:
+        """Return the response cache to save."""
+        return {"responses": dict(self._cache)}
+
+
+# Normalizes the prompt, so that formatting-only changes do not miss the cache
+def normalize_prompt(prompt: str) -> str:
+    """Normalize the prompt (Unicode form, line endings and trailing whitespace)."""
+    lines = normalize("NFC", prompt).replace("\r\n", "\n").split("\n")
+    return "\n".join(line.rstrip() for line in lines).strip()
+
+
+# Builds the cache key of the normalized prompt sent to the model
+def build_cache_key(model_name: str, prompt: str) -> str:
+    """Build the cache key of the normalized prompt sent to the model."""
+    return sha256(f"{model_name}\n{prompt}".encode("utf-8")).hexdigest()
+
+
+# Returns the message content of the chat completion (raises ValueError when it is missing)
+def _get_content(data: Any) -> str:
+    """Return the message content of the chat completion."""
+    try:
+        content = data["choices"][0]["message"]["content"]
+    except (KeyError, IndexError, TypeError) as error:
+        raise ValueError("Malformed chat completion") from error
+    if not isinstance(content, str):
+        raise ValueError("Malformed chat completion")
+    return content
+
+
+# Returns the delay requested by the Retry-After header (in seconds), or the given one
+def _get_retry_after(headers: Any, delay: float) -> float:
+    """Return the delay requested by the Retry-After header, or the given one."""
+    try:
+        return min(float(headers.get(hdrs.RETRY_AFTER, delay)), BACKOFF_MAX)
+    except ValueError:
+        return delay
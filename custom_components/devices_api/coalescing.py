@@ -0,0 +1,72 @@
+"""Request coalescing for the Devices API component."""
+
+from __future__ import annotations
+from asyncio import Task, ensure_future, shield
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+# Class: RequestCoalescer
+class RequestCoalescer:
+    """Single-flight runner: concurrent calls with the same key share one in-flight computation."""
+
+    # Key -> In-flight computation
+    _in_flight: Dict[Hashable, Task]
+    # Number of computations started
+    _computed: int
+    # Number of calls that joined an in-flight computation
+    _coalesced: int
+
+    # Constructor
+    def __init__(self) -> None:
+        """Constructor."""
+        self._in_flight = {}
+        self._computed = 0
+        self._coalesced = 0
+
+    # Returns the result of the in-flight computation for the key, starting it with the factory if there is none
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the result of the in-flight computation for the key, starting it if there is none.
+
+        The computation runs as its own task, so a caller that is cancelled (e.g.
+        its client disconnected) does not cancel it for the other callers.
+        """
+        task = self._in_flight.get(key)
+        if task is None:
+            self._computed += 1
+            task = ensure_future(factory())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self._coalesced += 1
+
+        return await shield(task)
+
+    # Returns the number of computations started
+    def get_computed(self) -> int:
+        """Return the number of computations started."""
+        return self._computed
+
+    # Returns the number of calls that joined an in-flight computation
+    def get_coalesced(self) -> int:
+        """Return the number of calls that joined an in-flight computation."""
+        return self._coalesced
+
+    # Returns the number of computations in flight
+    def get_in_flight(self) -> int:
+        """Return the number of computations in flight."""
+        return len(self._in_flight)
+
+    # Returns the counters as a dictionary
+    def as_dict(self) -> Dict[str, int]:
+        """Return the counters as a dictionary."""
+        return {
+            "computed": self._computed,
+            "coalesced": self._coalesced,
+            "in_flight": len(self._in_flight),
+        }
+
+    # Removes the finished computation
+    def _forget(self, key: Hashable, task: Task) -> None:
+        """Remove the finished computation."""
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
@@ -0,0 +1,76 @@
+"""Response compression for the Devices API component."""
+
+from __future__ import annotations
+from gzip import compress as gzip_compress
+from typing import Dict, List
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+# Gzip content coding.
+ENCODING_GZIP = "gzip"
+# Brotli content coding.
+ENCODING_BROTLI = "br"
+
+
+# Returns the content codings this installation can produce, in order of preference
+def get_supported_encodings() -> List[str]:
+    """Return the supported content codings, in order of preference."""
+    if brotli is not None:
+        return [ENCODING_BROTLI, ENCODING_GZIP]
+    return [ENCODING_GZIP]
+
+
+# Picks the preferred supported content coding accepted by the client (None for identity)
+def negotiate_encoding(accept_encoding: str | None) -> str | None:
+    """Pick the preferred supported content coding accepted by the client."""
+    if not accept_encoding:
+        return None
+
+    accepted = _parse_accept_encoding(accept_encoding)
+    best: str | None = None
+    best_quality = 0.0
+
+    for encoding in get_supported_encodings():
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best = encoding
+            best_quality = quality
+
+    return best
+
+
+# Compresses the body with the content coding
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress the body with the content coding."""
+    if encoding == ENCODING_BROTLI:
+        return brotli.compress(body, quality=5)
+    if encoding == ENCODING_GZIP:
+        return gzip_compress(body, compresslevel=6, mtime=0)
+    raise ValueError(f"Unsupported content coding: {encoding}")
+
+
+# Parses the Accept-Encoding header into content coding -> quality
+def _parse_accept_encoding(accept_encoding: str) -> Dict[str, float]:
+    """Parse the Accept-Encoding header into content coding -> quality."""
+    accepted: Dict[str, float] = {}
+
+    for item in accept_encoding.split(","):
+        encoding, _, parameters = item.strip().partition(";")
+        encoding = encoding.strip().lower()
+        if not encoding:
+            continue
+
+        quality = 1.0
+        parameter = parameters.strip()
+        if parameter.startswith("q="):
+            try:
+                quality = float(parameter[2:])
+            except ValueError:
+                quality = 0.0
+
+        accepted[encoding] = quality
+
+    return accepted
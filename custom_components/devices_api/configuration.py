@@ -1,8 +1,12 @@
 """Container for the Device API configuration"""
 
 from __future__ import annotations
-from typing import Any, Dict, List
-from json import dumps, loads
+from fnmatch import translate
+from re import Pattern, compile as compile_regex
+from typing import Any, Dict, List, Set
+from json import loads
+from .access import AddressMatcher, get_client_address
+from .encoder import encode_text
 
 
 # Class: ChatGPTConfiguration
@@ -13,11 +17,39 @@ class ChatGPTConfiguration:
     _model_name: str
     # API Key
     _api_key: str
+    # Largest estimated number of tokens of a device prompt context
+    _token_budget: int
+    # Base URL of the OpenAI compatible API
+    _base_url: str
+    # Largest number of concurrent API requests
+    _max_concurrency: int
+    # API request timeout (in seconds)
+    _timeout: float
+    # Number of retries of a failed API request
+    _max_retries: int
+    # Largest number of cached API responses
+    _cache_size: int
 
     # Constructor
-    def __init__(self, api_key: str = "", model_name: str = "gpt-3.5-turbo") -> None:
+    def __init__(
+        self,
+        api_key: str = "",
+        model_name: str = "gpt-3.5-turbo",
+        token_budget: int = 2000,
+        base_url: str = "https://api.openai.com/v1",
+        max_concurrency: int = 4,
+        timeout: float = 60.0,
+        max_retries: int = 3,
+        cache_size: int = 1000,
+    ) -> None:
         self._model_name = model_name
         self._api_key = api_key
+        self._token_budget = token_budget
+        self._base_url = base_url.rstrip("/")
+        self._max_concurrency = max_concurrency
+        self._timeout = timeout
+        self._max_retries = max_retries
+        self._cache_size = cache_size
 
     # Returns the model name
     def get_model_name(self) -> str:
@@ -29,18 +61,54 @@ class ChatGPTConfiguration:
         """Returns the API key"""
         return self._api_key
 
+    # Returns the largest estimated number of tokens of a device prompt context
+    def get_token_budget(self) -> int:
+        """Returns the largest estimated number of tokens of a device prompt context"""
+        return self._token_budget
+
+    # Returns the base URL of the OpenAI compatible API
+    def get_base_url(self) -> str:
+        """Returns the base URL of the OpenAI compatible API"""
+        return self._base_url
+
+    # Returns the largest number of concurrent API requests
+    def get_max_concurrency(self) -> int:
+        """Returns the largest number of concurrent API requests"""
+        return self._max_concurrency
+
+    # Returns the API request timeout (in seconds)
+    def get_timeout(self) -> float:
+        """Returns the API request timeout (in seconds)"""
+        return self._timeout
+
+    # Returns the number of retries of a failed API request
+    def get_max_retries(self) -> int:
+        """Returns the number of retries of a failed API request"""
+        return self._max_retries
+
+    # Returns the largest number of cached API responses
+    def get_cache_size(self) -> int:
+        """Returns the largest number of cached API responses"""
+        return self._cache_size
+
     # Returns the configuration as a dictionary
     def as_dict(self) -> Dict[str, Any]:
         """Returns the configuration as a dictionary"""
         return {
             "model_name": self._model_name,
             "api_key": self._api_key,
+            "token_budget": self._token_budget,
+            "base_url": self._base_url,
+            "max_concurrency": self._max_concurrency,
+            "timeout": self._timeout,
+            "max_retries": self._max_retries,
+            "cache_size": self._cache_size,
         }
 
     # Returns the configuration as a JSON string
     def as_json(self) -> str:
         """Returns the configuration as a JSON string"""
-        return dumps(self.as_dict(), indent=4)
+        return encode_text(self.as_dict(), pretty=True)
 
     # Returns the configuration as a string
     def __str__(self) -> str:
@@ -54,6 +122,12 @@ class ChatGPTConfiguration:
         return ChatGPTConfiguration(
             model_name=config.get("model_name", "gpt-3.5-turbo"),
             api_key=config.get("api_key", ""),
+            token_budget=int(config.get("token_budget", 2000)),
+            base_url=config.get("base_url", "https://api.openai.com/v1"),
+            max_concurrency=int(config.get("max_concurrency", 4)),
+            timeout=float(config.get("timeout", 60.0)),
+            max_retries=int(config.get("max_retries", 3)),
+            cache_size=int(config.get("cache_size", 1000)),
         )
 
     # Creates a configuration from a JSON string
@@ -76,39 +150,89 @@ class ChatGPTConfiguration:
 
 # Class: IgnoredDomainsConfiguration
 class IgnoredDomainsConfiguration:
-    """Configuration for the list of ignored domains"""
+    """Configuration for the list of ignored domains
+
+    Entries are either domains (`sensor`) or entity IDs (`sensor.*_linkquality`),
+    both accepting glob patterns. Exact entries are kept in sets and all patterns
+    are compiled into a single regular expression, rebuilt when the list changes.
+    """
 
-    # Ignored domains
+    # Ignored domains (and entity ID patterns)
     _ignored_domains: List[str]
+    # Exactly ignored domains
+    _exact_domains: Set[str]
+    # Exactly ignored entity IDs
+    _exact_entities: Set[str]
+    # Combined matcher of the glob patterns, applied to entity IDs (None without patterns)
+    _matcher: Pattern | None
+    # Version of the list, bumped on every change
+    _version: int
 
     # Constructor
-    def __init__(self, ignored_domains: List[str] = []) -> None:
-        self._ignored_domains = ignored_domains
+    def __init__(self, ignored_domains: List[str] | None = None) -> None:
+        self._ignored_domains = list(ignored_domains or [])
+        self._version = 0
+        self._compile()
 
     # Adds a domain to the list of ignored domains
     def add_ignored_domain(self, domain: str) -> None:
         """Adds a domain to the list of ignored domains"""
         self._ignored_domains.append(domain)
+        self._compile()
 
     # Removes a domain from the list of ignored domains
     def remove_ignored_domain(self, domain: str) -> None:
         """Removes a domain from the list of ignored domains"""
         self._ignored_domains.remove(domain)
+        self._compile()
 
     # Returns the list of ignored domains
     def get_ignored_domains(self) -> List[str]:
         """Returns the list of ignored domains"""
         return self._ignored_domains
 
+    # Returns the version of the list, bumped on every change
+    def get_version(self) -> int:
+        """Returns the version of the list"""
+        return self._version
+
     # Indicates whether a domain is ignored
     def is_ignored_domain(self, domain: str) -> bool:
         """Indicates whether a domain is ignored"""
-        return domain in self._ignored_domains
+        if domain in self._exact_domains:
+            return True
+        return self._matcher is not None and self._matcher.match(domain + ".") is not None
 
-    # Indicates whether entity belongs to an ignored domain
+    # Indicates whether entity belongs to an ignored domain (or matches an ignored entity pattern)
     def is_ignored_entity(self, entity_id: str) -> bool:
         """Indicates whether entity belongs to an ignored domain"""
-        return self.is_ignored_domain(entity_id.split(".")[0])
+        if entity_id in self._exact_entities:
+            return True
+        if entity_id[: entity_id.find(".")] in self._exact_domains:
+            return True
+        return self._matcher is not None and self._matcher.match(entity_id) is not None
+
+    # Compiles the list into the exact sets and the combined pattern matcher
+    def _compile(self) -> None:
+        """Compiles the list into the exact sets and the combined pattern matcher"""
+        self._exact_domains = set()
+        self._exact_entities = set()
+        patterns: List[str] = []
+
+        for entry in self._ignored_domains:
+            entry = entry.strip().lower()
+            is_entity = "." in entry
+            if not any(character in entry for character in "*?["):
+                if is_entity:
+                    self._exact_entities.add(entry)
+                else:
+                    self._exact_domains.add(entry)
+                continue
+            # Domain patterns match the domain part of the entity IDs
+            patterns.append(translate(entry if is_entity else entry + ".*"))
+
+        self._matcher = compile_regex("|".join(patterns)) if patterns else None
+        self._version += 1
 
     # Returns the configuration as a dictionary
     def as_dict(self) -> Dict[str, Any]:
@@ -120,7 +244,7 @@ class IgnoredDomainsConfiguration:
     # Returns the configuration as a JSON string
     def as_json(self) -> str:
         """Returns the configuration as a JSON string"""
-        return dumps(self.as_dict(), indent=4)
+        return encode_text(self.as_dict(), pretty=True)
 
     # Returns the configuration as a string
     def __str__(self) -> str:
@@ -163,82 +287,512 @@ class IgnoredDomainsConfiguration:
 
 # Class: AllowedIPsConfiguration
 class AllowedIPsConfiguration:
-    """Configuration for the list of allowed IPs"""
+    """Configuration for the list of allowed IPs
 
-    # Allowed IPs
-    _allowed_ips: List[str]
+    Entries are IPv4 or IPv6 addresses or CIDR ranges, compiled into prefix
+    trees. An empty list allows every client. `X-Forwarded-For` is only
+    honoured on requests coming from one of the trusted proxies.
+    """
 
-    # Constructor
-    def __init__(self, allowed_ips: List[str] = []) -> None:
-        self._allowed_ips = allowed_ips
+    # Allowed IPs (and CIDR ranges)
+    _allowed_ips: List[str]
+    # Trusted proxies (IPs and CIDR ranges)
+    _trusted_proxies: List[str]
+    # Compiled allowed IPs
+    _allowed_matcher: AddressMatcher
+    # Compiled trusted proxies
+    _trusted_matcher: AddressMatcher
+
+    # Constructor (raises ValueError on an invalid IP or CIDR range)
+    def __init__(
+        self,
+        allowed_ips: List[str] | None = None,
+        trusted_proxies: List[str] | None = None,
+    ) -> None:
+        self._allowed_ips = list(allowed_ips or [])
+        self._trusted_proxies = list(trusted_proxies or [])
+        self._allowed_matcher = AddressMatcher(self._allowed_ips)
+        self._trusted_matcher = AddressMatcher(self._trusted_proxies)
 
     # Adds an IP to the list of allowed IPs
     def add_allowed_ip(self, ip: str) -> None:
         """Adds an IP to the list of allowed IPs"""
+        self._allowed_matcher.add(ip)
         self._allowed_ips.append(ip)
 
     # Removes an IP from the list of allowed IPs
     def remove_allowed_ip(self, ip: str) -> None:
         """Removes an IP from the list of allowed IPs"""
         self._allowed_ips.remove(ip)
+        self._allowed_matcher = AddressMatcher(self._allowed_ips)
 
     # Returns the list of allowed IPs
     def get_allowed_ips(self) -> List[str]:
         """Returns the list of allowed IPs"""
         return self._allowed_ips
 
-    # Indicates whether an IP is allowed
-    def is_allowed_ip(self, ip: str) -> bool:
+    # Returns the list of trusted proxies
+    def get_trusted_proxies(self) -> List[str]:
+        """Returns the list of trusted proxies"""
+        return self._trusted_proxies
+
+    # Indicates whether an IP is allowed (every IP is when the list is empty)
+    def is_allowed_ip(self, ip: str | None) -> bool:
         """Indicates whether an IP is allowed"""
-        return ip in self._allowed_ips
+        if self._allowed_matcher.is_empty():
+            return True
+        return self._allowed_matcher.matches(ip)
+
+    # Indicates whether an IP is a trusted proxy
+    def is_trusted_proxy(self, ip: str) -> bool:
+        """Indicates whether an IP is a trusted proxy"""
+        return self._trusted_matcher.matches(ip)
+
+    # Indicates whether the client is allowed, given the peer IP and the X-Forwarded-For header
+    def is_allowed_client(self, remote: str | None, forwarded_for: str | None) -> bool:
+        """Indicates whether the client is allowed"""
+        if self._allowed_matcher.is_empty():
+            return True
+        return self.is_allowed_ip(
+            get_client_address(remote, forwarded_for, self.is_trusted_proxy)
+        )
 
     # Returns the configuration as a dictionary
     def as_dict(self) -> Dict[str, Any]:
         """Returns the configuration as a dictionary"""
         return {
             "allowed_ips": self._allowed_ips,
+            "trusted_proxies": self._trusted_proxies,
         }
 
     # Returns the configuration as a JSON string
     def as_json(self) -> str:
         """Returns the configuration as a JSON string"""
-        return dumps(self.as_dict(), indent=4)
+        return encode_text(self.as_dict(), pretty=True)
 
     # Returns the configuration as a string
     def __str__(self) -> str:
         """Returns the configuration as a string"""
         return self.as_json()
 
-    # Creates a configuration from a dictionary
+    # Creates a configuration from a dictionary (merging in the trusted proxies given next to it)
     @staticmethod
-    def from_dict(config: Dict[str, Any]) -> AllowedIPsConfiguration:
+    def from_dict(
+        config: Dict[str, Any], trusted_proxies: List[str] | None = None
+    ) -> AllowedIPsConfiguration:
         """Creates a configuration from a dictionary"""
+        proxies = list(config.get("trusted_proxies", []))
+        for proxy in trusted_proxies or []:
+            if proxy not in proxies:
+                proxies.append(proxy)
+
         return AllowedIPsConfiguration(
             allowed_ips=config.get("allowed_ips", []),
+            trusted_proxies=proxies,
         )
 
-    # Creates a configuration from a JSON string
+    # Creates a configuration from a JSON string (merging in the trusted proxies given next to it)
     @staticmethod
-    def from_json(config: str) -> AllowedIPsConfiguration:
+    def from_json(
+        config: str, trusted_proxies: List[str] | None = None
+    ) -> AllowedIPsConfiguration:
         """Creates a configuration from a JSON string"""
-        return AllowedIPsConfiguration.from_dict(loads(config))
+        return AllowedIPsConfiguration.from_dict(loads(config), trusted_proxies)
 
     # Creates a configuration from list of allowed IPs
     @staticmethod
-    def from_list(allowed_ips: List[str]) -> AllowedIPsConfiguration:
+    def from_list(
+        allowed_ips: List[str], trusted_proxies: List[str] | None = None
+    ) -> AllowedIPsConfiguration:
         """Creates a configuration from list of allowed IPs"""
-        return AllowedIPsConfiguration(allowed_ips=allowed_ips)
+        return AllowedIPsConfiguration(
+            allowed_ips=allowed_ips, trusted_proxies=trusted_proxies
+        )
 
     # Creates a configuration from either a dictionary, list or a JSON string
     @staticmethod
-    def from_any(config: Any) -> AllowedIPsConfiguration:
+    def from_any(
+        config: Any, trusted_proxies: List[str] | None = None
+    ) -> AllowedIPsConfiguration:
         """Creates a configuration from either a dictionary, list or a JSON string"""
         if isinstance(config, str):
-            return AllowedIPsConfiguration.from_json(config)
+            return AllowedIPsConfiguration.from_json(config, trusted_proxies)
         elif isinstance(config, dict):
-            return AllowedIPsConfiguration.from_dict(config)
+            return AllowedIPsConfiguration.from_dict(config, trusted_proxies)
         elif isinstance(config, list):
-            return AllowedIPsConfiguration.from_list(config)
+            return AllowedIPsConfiguration.from_list(config, trusted_proxies)
+        else:
+            raise ValueError("Invalid configuration")
+
+
+# Class: CompressionConfiguration
+class CompressionConfiguration:
+    """Configuration for the response compression"""
+
+    # Enables or disables the response compression
+    _enabled: bool
+    # Smallest body size (in bytes) that gets compressed
+    _min_size: int
+
+    # Constructor
+    def __init__(self, enabled: bool = True, min_size: int = 1024) -> None:
+        self._enabled = enabled
+        self._min_size = min_size
+
+    # Indicates whether the response compression is enabled
+    def is_enabled(self) -> bool:
+        """Indicates whether the response compression is enabled"""
+        return self._enabled
+
+    # Returns the smallest body size (in bytes) that gets compressed
+    def get_min_size(self) -> int:
+        """Returns the smallest body size (in bytes) that gets compressed"""
+        return self._min_size
+
+    # Indicates whether a body of the given size should be compressed
+    def should_compress(self, size: int) -> bool:
+        """Indicates whether a body of the given size should be compressed"""
+        return self._enabled and size >= self._min_size
+
+    # Returns the configuration as a dictionary
+    def as_dict(self) -> Dict[str, Any]:
+        """Returns the configuration as a dictionary"""
+        return {
+            "enabled": self._enabled,
+            "min_size": self._min_size,
+        }
+
+    # Returns the configuration as a JSON string
+    def as_json(self) -> str:
+        """Returns the configuration as a JSON string"""
+        return encode_text(self.as_dict(), pretty=True)
+
+    # Returns the configuration as a string
+    def __str__(self) -> str:
+        """Returns the configuration as a string"""
+        return self.as_json()
+
+    # Creates a configuration from a dictionary
+    @staticmethod
+    def from_dict(config: Dict[str, Any]) -> CompressionConfiguration:
+        """Creates a configuration from a dictionary"""
+        return CompressionConfiguration(
+            enabled=config.get("enabled", True),
+            min_size=int(config.get("min_size", 1024)),
+        )
+
+    # Creates a configuration from a JSON string
+    @staticmethod
+    def from_json(config: str) -> CompressionConfiguration:
+        """Creates a configuration from a JSON string"""
+        return CompressionConfiguration.from_dict(loads(config))
+
+    # Creates a configuration from either a dictionary, a boolean or a JSON string
+    @staticmethod
+    def from_any(config: Any) -> CompressionConfiguration:
+        """Creates a configuration from either a dictionary, a boolean or a JSON string"""
+        if isinstance(config, str):
+            return CompressionConfiguration.from_json(config)
+        elif isinstance(config, dict):
+            return CompressionConfiguration.from_dict(config)
+        elif isinstance(config, bool):
+            return CompressionConfiguration(enabled=config)
+        else:
+            raise ValueError("Invalid configuration")
+
+
+# Class: ResponseCacheConfiguration
+class ResponseCacheConfiguration:
+    """Configuration for the cache of the encoded responses"""
+
+    # Largest number of cached responses
+    _max_entries: int
+    # Largest total size (in bytes) of the cached responses, compressed variants included
+    _max_size: int
+
+    # Constructor
+    def __init__(self, max_entries: int = 256, max_size: int = 16 * 1024 * 1024) -> None:
+        self._max_entries = max_entries
+        self._max_size = max_size
+
+    # Returns the largest number of cached responses
+    def get_max_entries(self) -> int:
+        """Returns the largest number of cached responses"""
+        return self._max_entries
+
+    # Returns the largest total size (in bytes) of the cached responses
+    def get_max_size(self) -> int:
+        """Returns the largest total size (in bytes) of the cached responses"""
+        return self._max_size
+
+    # Returns the configuration as a dictionary
+    def as_dict(self) -> Dict[str, Any]:
+        """Returns the configuration as a dictionary"""
+        return {
+            "max_entries": self._max_entries,
+            "max_size": self._max_size,
+        }
+
+    # Returns the configuration as a JSON string
+    def as_json(self) -> str:
+        """Returns the configuration as a JSON string"""
+        return encode_text(self.as_dict(), pretty=True)
+
+    # Returns the configuration as a string
+    def __str__(self) -> str:
+        """Returns the configuration as a string"""
+        return self.as_json()
+
+    # Creates a configuration from a dictionary
+    @staticmethod
+    def from_dict(config: Dict[str, Any]) -> ResponseCacheConfiguration:
+        """Creates a configuration from a dictionary"""
+        return ResponseCacheConfiguration(
+            max_entries=int(config.get("max_entries", 256)),
+            max_size=int(config.get("max_size", 16 * 1024 * 1024)),
+        )
+
+    # Creates a configuration from a JSON string
+    @staticmethod
+    def from_json(config: str) -> ResponseCacheConfiguration:
+        """Creates a configuration from a JSON string"""
+        return ResponseCacheConfiguration.from_dict(loads(config))
+
+    # Creates a configuration from either a dictionary or a JSON string
+    @staticmethod
+    def from_any(config: Any) -> ResponseCacheConfiguration:
+        """Creates a configuration from either a dictionary or a JSON string"""
+        if isinstance(config, str):
+            return ResponseCacheConfiguration.from_json(config)
+        elif isinstance(config, dict):
+            return ResponseCacheConfiguration.from_dict(config)
+        else:
+            raise ValueError("Invalid configuration")
+
+
+# Class: MetricsConfiguration
+class MetricsConfiguration:
+    """Configuration for the request metrics"""
+
+    # Enables or disables the request metrics (and the Server-Timing headers)
+    _enabled: bool
+
+    # Constructor
+    def __init__(self, enabled: bool = False) -> None:
+        self._enabled = enabled
+
+    # Indicates whether the request metrics are enabled
+    def is_enabled(self) -> bool:
+        """Indicates whether the request metrics are enabled"""
+        return self._enabled
+
+    # Returns the configuration as a dictionary
+    def as_dict(self) -> Dict[str, Any]:
+        """Returns the configuration as a dictionary"""
+        return {
+            "enabled": self._enabled,
+        }
+
+    # Returns the configuration as a JSON string
+    def as_json(self) -> str:
+        """Returns the configuration as a JSON string"""
+        return encode_text(self.as_dict(), pretty=True)
+
+    # Returns the configuration as a string
+    def __str__(self) -> str:
+        """Returns the configuration as a string"""
+        return self.as_json()
+
+    # Creates a configuration from a dictionary
+    @staticmethod
+    def from_dict(config: Dict[str, Any]) -> MetricsConfiguration:
+        """Creates a configuration from a dictionary"""
+        return MetricsConfiguration(
+            enabled=config.get("enabled", False),
+        )
+
+    # Creates a configuration from a JSON string
+    @staticmethod
+    def from_json(config: str) -> MetricsConfiguration:
+        """Creates a configuration from a JSON string"""
+        return MetricsConfiguration.from_dict(loads(config))
+
+    # Creates a configuration from either a dictionary, a boolean or a JSON string
+    @staticmethod
+    def from_any(config: Any) -> MetricsConfiguration:
+        """Creates a configuration from either a dictionary, a boolean or a JSON string"""
+        if isinstance(config, str):
+            return MetricsConfiguration.from_json(config)
+        elif isinstance(config, dict):
+            return MetricsConfiguration.from_dict(config)
+        elif isinstance(config, bool):
+            return MetricsConfiguration(enabled=config)
+        else:
+            raise ValueError("Invalid configuration")
+
+
+# Class: ProfilingConfiguration
+class ProfilingConfiguration:
+    """Configuration for the on-demand request profiling"""
+
+    # Enables or disables the request profiling
+    _enabled: bool
+    # Largest number of functions or allocation sites in a profiling report
+    _max_entries: int
+
+    # Constructor
+    def __init__(self, enabled: bool = False, max_entries: int = 50) -> None:
+        self._enabled = enabled
+        self._max_entries = max_entries
+
+    # Indicates whether the request profiling is enabled
+    def is_enabled(self) -> bool:
+        """Indicates whether the request profiling is enabled"""
+        return self._enabled
+
+    # Returns the largest number of functions or allocation sites in a profiling report
+    def get_max_entries(self) -> int:
+        """Returns the largest number of functions or allocation sites in a profiling report"""
+        return self._max_entries
+
+    # Returns the configuration as a dictionary
+    def as_dict(self) -> Dict[str, Any]:
+        """Returns the configuration as a dictionary"""
+        return {
+            "enabled": self._enabled,
+            "max_entries": self._max_entries,
+        }
+
+    # Returns the configuration as a JSON string
+    def as_json(self) -> str:
+        """Returns the configuration as a JSON string"""
+        return encode_text(self.as_dict(), pretty=True)
+
+    # Returns the configuration as a string
+    def __str__(self) -> str:
+        """Returns the configuration as a string"""
+        return self.as_json()
+
+    # Creates a configuration from a dictionary
+    @staticmethod
+    def from_dict(config: Dict[str, Any]) -> ProfilingConfiguration:
+        """Creates a configuration from a dictionary"""
+        return ProfilingConfiguration(
+            enabled=config.get("enabled", False),
+            max_entries=int(config.get("max_entries", 50)),
+        )
+
+    # Creates a configuration from a JSON string
+    @staticmethod
+    def from_json(config: str) -> ProfilingConfiguration:
+        """Creates a configuration from a JSON string"""
+        return ProfilingConfiguration.from_dict(loads(config))
+
+    # Creates a configuration from either a dictionary, a boolean or a JSON string
+    @staticmethod
+    def from_any(config: Any) -> ProfilingConfiguration:
+        """Creates a configuration from either a dictionary, a boolean or a JSON string"""
+        if isinstance(config, str):
+            return ProfilingConfiguration.from_json(config)
+        elif isinstance(config, dict):
+            return ProfilingConfiguration.from_dict(config)
+        elif isinstance(config, bool):
+            return ProfilingConfiguration(enabled=config)
+        else:
+            raise ValueError("Invalid configuration")
+
+
+# Class: JobsConfiguration
+class JobsConfiguration:
+    """Configuration for the background automation generation jobs"""
+
+    # Number of workers generating automations concurrently
+    _concurrency: int
+    # Largest number of jobs kept (the oldest finished ones are dropped first)
+    _max_jobs: int
+    # Largest number of devices in one job
+    _max_devices: int
+    # Largest number of work items waiting for a worker
+    _max_queued: int
+
+    # Constructor
+    def __init__(
+        self,
+        concurrency: int = 2,
+        max_jobs: int = 100,
+        max_devices: int = 500,
+        max_queued: int = 1000,
+    ) -> None:
+        self._concurrency = concurrency
+        self._max_jobs = max_jobs
+        self._max_devices = max_devices
+        self._max_queued = max_queued
+
+    # Returns the number of workers generating automations concurrently
+    def get_concurrency(self) -> int:
+        """Returns the number of workers generating automations concurrently"""
+        return self._concurrency
+
+    # Returns the largest number of jobs kept
+    def get_max_jobs(self) -> int:
+        """Returns the largest number of jobs kept"""
+        return self._max_jobs
+
+    # Returns the largest number of devices in one job
+    def get_max_devices(self) -> int:
+        """Returns the largest number of devices in one job"""
+        return self._max_devices
+
+    # Returns the largest number of work items waiting for a worker
+    def get_max_queued(self) -> int:
+        """Returns the largest number of work items waiting for a worker"""
+        return self._max_queued
+
+    # Returns the configuration as a dictionary
+    def as_dict(self) -> Dict[str, Any]:
+        """Returns the configuration as a dictionary"""
+        return {
+            "concurrency": self._concurrency,
+            "max_jobs": self._max_jobs,
+            "max_devices": self._max_devices,
+            "max_queued": self._max_queued,
+        }
+
+    # Returns the configuration as a JSON string
+    def as_json(self) -> str:
+        """Returns the configuration as a JSON string"""
+        return encode_text(self.as_dict(), pretty=True)
+
+    # Returns the configuration as a string
+    def __str__(self) -> str:
+        """Returns the configuration as a string"""
+        return self.as_json()
+
+    # Creates a configuration from a dictionary
+    @staticmethod
+    def from_dict(config: Dict[str, Any]) -> JobsConfiguration:
+        """Creates a configuration from a dictionary"""
+        return JobsConfiguration(
+            concurrency=int(config.get("concurrency", 2)),
+            max_jobs=int(config.get("max_jobs", 100)),
+            max_devices=int(config.get("max_devices", 500)),
+            max_queued=int(config.get("max_queued", 1000)),
+        )
+
+    # Creates a configuration from a JSON string
+    @staticmethod
+    def from_json(config: str) -> JobsConfiguration:
+        """Creates a configuration from a JSON string"""
+        return JobsConfiguration.from_dict(loads(config))
+
+    # Creates a configuration from either a dictionary or a JSON string
+    @staticmethod
+    def from_any(config: Any) -> JobsConfiguration:
+        """Creates a configuration from either a dictionary or a JSON string"""
+        if isinstance(config, str):
+            return JobsConfiguration.from_json(config)
+        elif isinstance(config, dict):
+            return JobsConfiguration.from_dict(config)
         else:
             raise ValueError("Invalid configuration")
 
@@ -254,6 +808,17 @@ class Configuration:
     # Ignored domains configuration
     _ignored_domains: IgnoredDomainsConfiguration
     # Allowed IPs configuration
+    _allowed_ips: AllowedIPsConfiguration
+    # Response compression configuration
+    _compression: CompressionConfiguration
+    # Response cache configuration
+    _response_cache: ResponseCacheConfiguration
+    # Request metrics configuration
+    _metrics: MetricsConfiguration
+    # Request profiling configuration
+    _profiling: ProfilingConfiguration
+    # Automation generation jobs configuration
+    _jobs: JobsConfiguration
 
     # Constructor
     def __init__(
@@ -262,11 +827,21 @@ class Configuration:
         chatgpt: ChatGPTConfiguration,
         ignored_domains: IgnoredDomainsConfiguration,
         allowed_ips: AllowedIPsConfiguration,
+        compression: CompressionConfiguration,
+        response_cache: ResponseCacheConfiguration,
+        metrics: MetricsConfiguration,
+        profiling: ProfilingConfiguration,
+        jobs: JobsConfiguration,
     ) -> None:
         self._enabled = enabled
         self._chatgpt = chatgpt
         self._ignored_domains = ignored_domains
         self._allowed_ips = allowed_ips
+        self._compression = compression
+        self._response_cache = response_cache
+        self._metrics = metrics
+        self._profiling = profiling
+        self._jobs = jobs
 
     # Enables or disables the component
     def set_enabled(self, enabled: bool) -> None:
@@ -293,6 +868,31 @@ class Configuration:
         """Returns the allowed IPs configuration"""
         return self._allowed_ips
 
+    # Returns the response compression configuration
+    def get_compression(self) -> CompressionConfiguration:
+        """Returns the response compression configuration"""
+        return self._compression
+
+    # Returns the response cache configuration
+    def get_response_cache(self) -> ResponseCacheConfiguration:
+        """Returns the response cache configuration"""
+        return self._response_cache
+
+    # Returns the request metrics configuration
+    def get_metrics(self) -> MetricsConfiguration:
+        """Returns the request metrics configuration"""
+        return self._metrics
+
+    # Returns the request profiling configuration
+    def get_profiling(self) -> ProfilingConfiguration:
+        """Returns the request profiling configuration"""
+        return self._profiling
+
+    # Returns the automation generation jobs configuration
+    def get_jobs(self) -> JobsConfiguration:
+        """Returns the automation generation jobs configuration"""
+        return self._jobs
+
     # Returns the configuration as a dictionary
     def as_dict(self) -> Dict[str, Any]:
         """Returns the configuration as a dictionary"""
@@ -301,12 +901,18 @@ class Configuration:
             "chatgpt": self._chatgpt.as_dict(),
             "ignored_domains": self._ignored_domains.get_ignored_domains(),
             "allowed_ips": self._allowed_ips.get_allowed_ips(),
+            "trusted_proxies": self._allowed_ips.get_trusted_proxies(),
+            "compression": self._compression.as_dict(),
+            "response_cache": self._response_cache.as_dict(),
+            "metrics": self._metrics.as_dict(),
+            "profiling": self._profiling.as_dict(),
+            "jobs": self._jobs.as_dict(),
         }
 
     # Returns the configuration as a JSON string
     def as_json(self) -> str:
         """Returns the configuration as a JSON string"""
-        return dumps(self.as_dict(), indent=4)
+        return encode_text(self.as_dict(), pretty=True)
 
     # Returns the configuration as a string
     def __str__(self) -> str:
@@ -323,7 +929,18 @@ class Configuration:
             ignored_domains=IgnoredDomainsConfiguration.from_any(
                 config.get("ignored_domains", [])
             ),
-            allowed_ips=AllowedIPsConfiguration.from_any(config.get("allowed_ips", [])),
+            allowed_ips=AllowedIPsConfiguration.from_any(
+                config.get("allowed_ips", []), config.get("trusted_proxies", [])
+            ),
+            compression=CompressionConfiguration.from_any(
+                config.get("compression", {})
+            ),
+            response_cache=ResponseCacheConfiguration.from_any(
+                config.get("response_cache", {})
+            ),
+            metrics=MetricsConfiguration.from_any(config.get("metrics", {})),
+            profiling=ProfilingConfiguration.from_any(config.get("profiling", {})),
+            jobs=JobsConfiguration.from_any(config.get("jobs", {})),
         )
 
     # Creates a configuration from a JSON string
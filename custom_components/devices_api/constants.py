@@ -4,3 +4,29 @@ DOMAIN = "devices_api"
 CONFIG = "config"
 # Yaml configuration key.
 YAML_CONFIG = "yaml_config"
+# Registry index key.
+INDEX = "index"
+# Pseudo area ID of the devices without an area.
+NO_AREA_ID = "__none__"
+# Response cache key.
+RESPONSE_CACHE = "response_cache"
+# Registry change log key.
+CHANGE_LOG = "change_log"
+# Server-Sent Events broker key.
+EVENT_BROKER = "event_broker"
+# Search index key.
+SEARCH_INDEX = "search_index"
+# Request coalescer key.
+REQUEST_COALESCER = "request_coalescer"
+# Request metrics key.
+METRICS = "metrics"
+# Request profiler key.
+PROFILER = "profiler"
+# ChatGPT client key.
+CHATGPT_CLIENT = "chatgpt_client"
+# Automation generation job queue key.
+JOB_QUEUE = "job_queue"
+# Entity state fragment cache key.
+STATE_CACHE = "state_cache"
+# Header carrying the time of the request (bodies do not hold it, so that they can be cached).
+REQUEST_TIME_HEADER = "X-Request-Time"
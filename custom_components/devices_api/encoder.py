@@ -0,0 +1,107 @@
+"""JSON encoder for the Devices API component."""
+
+from __future__ import annotations
+from enum import Enum
+from json import dumps
+from re import compile as compile_pattern, escape
+from typing import Any, Callable, List
+from uuid import uuid4
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+# Placeholder the fragments are encoded as, followed by their position (random, so no data can collide with it)
+_FRAGMENT_MARKER = f"devices-api-fragment-{uuid4().hex}-"
+# Encoded placeholder of a fragment, capturing its position
+_FRAGMENT_PATTERN = compile_pattern(
+    b'"' + escape(_FRAGMENT_MARKER.encode("ascii")) + rb'(\d+)"'
+)
+
+
+# Class: Fragment
+class Fragment:
+    """JSON encoded once, spliced as is into the output of `encode`."""
+
+    # Fixed attribute layout (one fragment is kept per entity state and attributes)
+    __slots__ = ("_json",)
+
+    # Encoded JSON
+    _json: bytes
+
+    # Constructor
+    def __init__(self, json: bytes) -> None:
+        """Constructor."""
+        self._json = json
+
+    # Returns the encoded JSON
+    def get_json(self) -> bytes:
+        """Return the encoded JSON."""
+        return self._json
+
+
+# Encodes the data as JSON bytes (compact unless pretty output is requested)
+def encode(data: Any, pretty: bool = False) -> bytes:
+    """Encode the data as JSON bytes, using orjson when it is installed.
+
+    Fragments are encoded as placeholders, then their bytes are spliced in
+    place of the placeholders, so they are not encoded again.
+    """
+    fragments: List[bytes] = []
+
+    # Encodes the fragments as placeholders and converts the other unsupported values
+    def default(value: Any) -> Any:
+        """Encode the fragments as placeholders and convert the other unsupported values."""
+        if isinstance(value, Fragment):
+            fragments.append(value.get_json())
+            return f"{_FRAGMENT_MARKER}{len(fragments) - 1}"
+        return _default(value)
+
+    body = _dumps(data, pretty, default)
+    if not fragments:
+        return body
+
+    # Text and fragment positions alternate, starting and ending with text
+    pieces = _FRAGMENT_PATTERN.split(body)
+    pieces[1::2] = [fragments[int(position)] for position in pieces[1::2]]
+    return b"".join(pieces)
+
+
+# Encodes the data once into a fragment the encoder splices as is
+def encode_fragment(data: Any) -> Fragment:
+    """Encode the data once into a fragment the encoder splices as is."""
+    return Fragment(encode(data))
+
+
+# Encodes the data as a JSON string
+def encode_text(data: Any, pretty: bool = False) -> str:
+    """Encode the data as a JSON string."""
+    return encode(data, pretty).decode("utf-8")
+
+
+# Encodes the data as JSON bytes with the installed encoder
+def _dumps(data: Any, pretty: bool, default: Callable[[Any], Any]) -> bytes:
+    """Encode the data as JSON bytes with the installed encoder."""
+    if orjson is not None:
+        options = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            options |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=default, option=options)
+
+    if pretty:
+        return dumps(data, indent=2, default=default).encode("utf-8")
+    return dumps(
+        data, separators=(",", ":"), ensure_ascii=False, default=default
+    ).encode("utf-8")
+
+
+# Converts the values the encoders do not support natively
+def _default(value: Any) -> Any:
+    """Convert the values the encoders do not support natively."""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    return str(value)
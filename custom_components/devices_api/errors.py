@@ -1,8 +1,10 @@
 """Errors for the Devices API component."""
 
 from __future__ import annotations
-from json import dumps
+from time import time
 from aiohttp.web import Response
+from .constants import REQUEST_TIME_HEADER
+from .encoder import encode, encode_text
 
 
 # Class: Error
@@ -13,12 +15,15 @@ class Error(Exception):
     _code: int
     # Error message
     _message: str
+    # Encoded HTTP response body (built once, on first use)
+    _http_body: bytes | None
 
     # Constructor
     def __init__(self, code: int, message: str) -> None:
         """Constructor."""
         self._code = code
         self._message = message
+        self._http_body = None
         super().__init__(self, message)
 
     # Return error code
@@ -39,17 +44,31 @@ class Error(Exception):
     # Returns the error as a JSON string
     def as_json(self) -> str:
         """Return error as a JSON string."""
-        return dumps(self.as_dict(), indent=4)
+        return encode_text(self.as_dict(), pretty=True)
 
     # Returns the error as a JSON for HTTP response
     def as_http_json(self) -> str:
         """Return error as a JSON for HTTP response."""
-        return dumps({"error": self.as_dict()}, indent=4)
+        return encode_text({"error": self.as_dict()})
 
     # Returns the error as aiohttp response
     def as_http_response(self) -> Response:
         """Return error as aiohttp response."""
-        return Response(status=self.get_code(), text=self.as_http_json())
+        if self._http_body is None:
+            self._http_body = encode({"error": self.as_dict()})
+        return Response(
+            status=self.get_code(),
+            body=self._http_body,
+            content_type="application/json",
+            headers={REQUEST_TIME_HEADER: str(time())},
+        )
+
+    # Returns a new error with the same code and message, to raise instead of the shared constant
+    def copy(self) -> Error:
+        """Return a new error with the same code and message."""
+        error = Error(self._code, self._message)
+        error._http_body = self._http_body
+        return error
 
     # Returns the error as a string
     def __str__(self) -> str:
@@ -91,3 +110,51 @@ ERROR_GATEWAY_TIMEOUT = Error(504, "Gateway Timeout")
 
 # Unsupported HTTP version error constant.
 ERROR_HTTP_VERSION_NOT_SUPPORTED = Error(505, "HTTP Version Not Supported")
+
+# Invalid pagination cursor error constant.
+ERROR_INVALID_CURSOR = Error(400, "Invalid pagination cursor")
+
+# Invalid pagination limit error constant.
+ERROR_INVALID_LIMIT = Error(400, "Invalid pagination limit")
+
+# Unknown field in the field selection error constant.
+ERROR_UNKNOWN_FIELD = Error(400, "Unknown field in the field selection")
+
+# Batch too large error constant.
+ERROR_BATCH_TOO_LARGE = Error(400, "Too many identifiers in the batch request")
+
+# Invalid revision error constant.
+ERROR_INVALID_REVISION = Error(400, "Invalid revision")
+
+# Invalid search query error constant.
+ERROR_INVALID_QUERY = Error(400, "Missing or invalid search query")
+
+# Invalid filter value error constant.
+ERROR_INVALID_FILTER = Error(400, "Invalid filter value")
+
+# Metrics disabled error constant.
+ERROR_METRICS_DISABLED = Error(404, "Metrics are disabled")
+
+# Invalid profiling mode error constant.
+ERROR_INVALID_PROFILE = Error(400, "Invalid profiling mode or format")
+
+# Profiler busy error constant.
+ERROR_PROFILER_BUSY = Error(409, "A profiled request is already running")
+
+# Invalid token budget error constant.
+ERROR_INVALID_BUDGET = Error(400, "Invalid token budget")
+
+# ChatGPT not configured error constant.
+ERROR_CHATGPT_NOT_CONFIGURED = Error(503, "ChatGPT API key is not configured")
+
+# ChatGPT request failed error constant.
+ERROR_CHATGPT_FAILED = Error(502, "ChatGPT request failed")
+
+# Job queue full error constant.
+ERROR_JOB_QUEUE_FULL = Error(503, "Too many automation generation jobs pending")
+
+# Invalid prompt error constant.
+ERROR_INVALID_PROMPT = Error(400, "Missing or invalid prompt")
+
+# Invalid include error constant.
+ERROR_INVALID_INCLUDE = Error(400, "Invalid include value")
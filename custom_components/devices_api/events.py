@@ -0,0 +1,241 @@
+"""Server-Sent Events broker for the Devices API component."""
+
+from __future__ import annotations
+from asyncio import Queue, QueueFull
+from typing import Dict, List, Set, Tuple
+from homeassistant.core import HomeAssistant, callback
+from .changes import CHANGE_TYPE_AREA, CHANGE_TYPE_DEVICE, RegistryChange
+from .configuration import Configuration
+from .constants import NO_AREA_ID
+from .encoder import encode
+from .manager import ChangesManager, Device
+from .projection import Projection
+
+# Comment line sent to keep idle connections open.
+KEEPALIVE_PAYLOAD = b": keepalive\n\n"
+# Event telling the client it missed changes and has to fetch a new snapshot.
+RESYNC_PAYLOAD = b"event: resync\ndata: {}\n\n"
+
+
+# Class: EventSubscriber
+class EventSubscriber:
+    """Single event stream client, with its filters and bounded queue of encoded events."""
+
+    # Encoded events waiting to be written (None closes the stream)
+    _queue: Queue
+    # Maximum number of queued events before the subscriber is dropped
+    _max_queued: int
+    # Projection of the device fields (entity fields are taken from its "entities" selection)
+    _projection: Projection | None
+    # Area IDs to receive the changes of (None for all)
+    _area_ids: Set[str] | None
+    # Device IDs to receive the changes of (None for all)
+    _device_ids: Set[str] | None
+    # TRUE once the subscriber has been dropped
+    _closed: bool
+
+    # Constructor
+    def __init__(
+        self,
+        projection: Projection | None,
+        area_ids: Set[str] | None,
+        device_ids: Set[str] | None,
+        max_queued: int,
+    ) -> None:
+        """Constructor."""
+        # One extra slot is kept for the resync event and one for the closing sentinel
+        self._queue = Queue(maxsize=max_queued + 2)
+        self._max_queued = max_queued
+        self._projection = projection
+        self._area_ids = area_ids
+        self._device_ids = device_ids
+        self._closed = False
+
+    # Returns the projection of the device fields
+    def get_projection(self) -> Projection | None:
+        """Return the projection of the device fields."""
+        return self._projection
+
+    # Returns TRUE if the subscriber has been dropped
+    def is_closed(self) -> bool:
+        """Return TRUE if the subscriber has been dropped."""
+        return self._closed
+
+    # Returns TRUE if the change of an object in the area / of the device passes the filters
+    # (changes of objects that can no longer be located, e.g. removed ones, always pass)
+    def matches(self, area_id: str | None, device_id: str | None, known: bool) -> bool:
+        """Return TRUE if the change passes the filters of the subscriber."""
+        if not known:
+            return True
+        if self._area_ids is not None and area_id not in self._area_ids:
+            return False
+        if self._device_ids is not None and device_id not in self._device_ids:
+            return False
+        return True
+
+    # Queues the encoded event, dropping the subscriber with a resync marker when it fell behind
+    def offer(self, payload: bytes) -> bool:
+        """Queue the encoded event, returning FALSE once the subscriber is dropped."""
+        if self._closed:
+            return False
+
+        if self._queue.qsize() >= self._max_queued:
+            self.close(resync=True)
+            return False
+
+        self._queue.put_nowait(payload)
+        return True
+
+    # Closes the stream, discarding the queued events (and telling the client to resync if asked)
+    def close(self, resync: bool = False) -> None:
+        """Close the stream, discarding the queued events."""
+        if self._closed:
+            return
+        self._closed = True
+
+        while not self._queue.empty():
+            self._queue.get_nowait()
+
+        try:
+            if resync:
+                self._queue.put_nowait(RESYNC_PAYLOAD)
+            self._queue.put_nowait(None)
+        except QueueFull:  # pragma: no cover
+            pass
+
+    # Waits for the next encoded event (None once the stream is closed)
+    async def get(self) -> bytes | None:
+        """Wait for the next encoded event."""
+        return await self._queue.get()
+
+
+# Class: EventBroker
+class EventBroker:
+    """Encodes every registry change once per distinct field selection and fans it out to the subscribers."""
+
+    # Changes manager, used to serialize the changed objects
+    _changes_manager: ChangesManager
+    # Active subscribers
+    _subscribers: Set[EventSubscriber]
+    # Maximum number of events queued per subscriber
+    _max_queued: int
+
+    # Constructor
+    def __init__(
+        self, hass: HomeAssistant, config: Configuration, max_queued: int = 256
+    ) -> None:
+        """Constructor."""
+        self._changes_manager = ChangesManager(hass, config)
+        self._subscribers = set()
+        self._max_queued = max_queued
+
+    # Adds a subscriber, replaying the changes made after `last_event_id` when it is given
+    @callback
+    def async_subscribe(
+        self,
+        projection: Projection | None = None,
+        area_ids: Set[str] | None = None,
+        device_ids: Set[str] | None = None,
+        last_event_id: int | None = None,
+    ) -> EventSubscriber:
+        """Add a subscriber, replaying the changes made after `last_event_id` when it is given."""
+        subscriber = EventSubscriber(projection, area_ids, device_ids, self._max_queued)
+
+        if last_event_id is not None:
+            changes = self._changes_manager.get_change_log().get_since(
+                last_event_id,
+                self._changes_manager.get_registry_index().get_revision(),
+            )
+            if changes is None:
+                subscriber.offer(RESYNC_PAYLOAD)
+            else:
+                for change in changes:
+                    self._publish_to(change, [subscriber])
+
+        if not subscriber.is_closed():
+            self._subscribers.add(subscriber)
+
+        return subscriber
+
+    # Removes the subscriber
+    @callback
+    def async_unsubscribe(self, subscriber: EventSubscriber) -> None:
+        """Remove the subscriber."""
+        self._subscribers.discard(subscriber)
+        subscriber.close()
+
+    # Publishes the registry change to the subscribers (registry index listener)
+    @callback
+    def async_publish(self, change: RegistryChange) -> None:
+        """Publish the registry change to the subscribers."""
+        if not self._subscribers:
+            return
+
+        for subscriber in self._publish_to(change, list(self._subscribers)):
+            self._subscribers.discard(subscriber)
+
+    # Encodes the change for and queues it to the matching subscribers, returning the dropped ones
+    def _publish_to(
+        self, change: RegistryChange, subscribers: List[EventSubscriber]
+    ) -> List[EventSubscriber]:
+        """Queue the change to the matching subscribers, returning the dropped ones."""
+        area_id, device_id, known = self._locate(change)
+        payloads: Dict[Projection | None, bytes] = {}
+        dropped: List[EventSubscriber] = []
+
+        for subscriber in subscribers:
+            if not subscriber.matches(area_id, device_id, known):
+                continue
+
+            projection = subscriber.get_projection()
+            payload = payloads.get(projection)
+            if payload is None:
+                payload = self._encode(change, projection)
+                payloads[projection] = payload
+
+            if not subscriber.offer(payload):
+                dropped.append(subscriber)
+
+        return dropped
+
+    # Returns the area ID and the device ID of the changed object, and whether they are known
+    def _locate(self, change: RegistryChange) -> Tuple[str | None, str | None, bool]:
+        """Return the area ID and the device ID of the changed object, and whether they are known."""
+        if change.get_type() == CHANGE_TYPE_AREA:
+            return change.get_id(), None, True
+
+        changed = self._changes_manager.get_changed_object(change)
+        if changed is None:
+            return None, None, False
+
+        if isinstance(changed, Device):
+            return changed.get_area() or NO_AREA_ID, changed.get_id(), True
+
+        device_id = changed.get_device_id()
+        if device_id is None:
+            return NO_AREA_ID, None, True
+
+        index = self._changes_manager.get_registry_index()
+        return index.get_device_area(device_id), device_id, True
+
+    # Encodes the change as a Server-Sent Event
+    def _encode(self, change: RegistryChange, projection: Projection | None) -> bytes:
+        """Encode the change as a Server-Sent Event."""
+        if change.get_type() == CHANGE_TYPE_DEVICE:
+            object_projection = projection
+        elif change.get_type() == CHANGE_TYPE_AREA or projection is None:
+            object_projection = None
+        else:
+            object_projection = projection.get_nested("entities")
+
+        dictionary = self._changes_manager.serialize_change(change, object_projection)
+
+        return (
+            b"id: "
+            + str(change.get_revision()).encode("ascii")
+            + b"\nevent: "
+            + change.get_type().encode("ascii")
+            + b"\ndata: "
+            + encode(dictionary)
+            + b"\n\n"
+        )
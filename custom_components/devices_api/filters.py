@@ -0,0 +1,135 @@
+"""Attribute filters for the Devices API component."""
+
+from __future__ import annotations
+from typing import Any, Dict, FrozenSet, List, Tuple
+from aiohttp.web import Request
+from homeassistant.helpers.device_registry import DeviceEntry
+from homeassistant.helpers.entity_registry import RegistryEntry
+from .errors import ERROR_INVALID_FILTER
+
+# Filterable device attributes.
+DEVICE_FILTERS = ("manufacturer", "model")
+# Filterable entity attributes.
+ENTITY_FILTERS = ("platform", "domain", "device_class", "entity_category", "capability")
+# Query parameter filtering on the disabled status.
+DISABLED_FILTER = "disabled"
+
+
+# Class: Filters
+class Filters:
+    """Requested attribute filters: values are OR-ed within an attribute and AND-ed across attributes."""
+
+    # Attribute -> accepted (normalized) values
+    _values: Dict[str, FrozenSet[str]]
+    # Requested disabled status (None when not filtered on)
+    _disabled: bool | None
+
+    # Constructor
+    def __init__(
+        self, values: Dict[str, FrozenSet[str]] = None, disabled: bool | None = None
+    ) -> None:
+        """Constructor."""
+        self._values = values or {}
+        self._disabled = disabled
+
+    # Returns the accepted values of the attribute (an empty set when it is not filtered on)
+    def get_values(self, attribute: str) -> FrozenSet[str]:
+        """Return the accepted values of the attribute."""
+        return self._values.get(attribute, frozenset())
+
+    # Returns TRUE if any of the attributes is filtered on
+    def has_any(self, attributes: Tuple[str, ...]) -> bool:
+        """Return TRUE if any of the attributes is filtered on."""
+        return any(attribute in self._values for attribute in attributes)
+
+    # Returns the requested disabled status
+    def get_disabled(self) -> bool | None:
+        """Return the requested disabled status."""
+        return self._disabled
+
+    # Creates the filters from the query parameters (None when no filter is given)
+    @staticmethod
+    def from_request(request: Request) -> Filters | None:
+        """Create the filters from the request, raising an Error on invalid values."""
+        values: Dict[str, FrozenSet[str]] = {}
+
+        for attribute in DEVICE_FILTERS + ENTITY_FILTERS:
+            accepted = set()
+            for parameter in request.query.getall(attribute, []):
+                for value in parameter.split(","):
+                    if value.strip():
+                        accepted.add(normalize_value(value))
+            if accepted:
+                values[attribute] = frozenset(accepted)
+
+        disabled = request.query.get(DISABLED_FILTER)
+        if disabled is not None:
+            disabled = _parse_bool(disabled)
+
+        if not values and disabled is None:
+            return None
+
+        return Filters(values, disabled)
+
+
+# Normalizes an attribute value for case-insensitive matching
+def normalize_value(value: Any) -> str:
+    """Normalize an attribute value for case-insensitive matching."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value).strip().casefold()
+
+
+# Returns the indexed (attribute, value) terms of the device entry
+def get_device_terms(device_entry: DeviceEntry) -> List[Tuple[str, str]]:
+    """Return the indexed terms of the device entry."""
+    terms: List[Tuple[str, str]] = []
+
+    if device_entry.manufacturer:
+        terms.append(("manufacturer", normalize_value(device_entry.manufacturer)))
+    if device_entry.model:
+        terms.append(("model", normalize_value(device_entry.model)))
+
+    return terms
+
+
+# Returns the indexed (attribute, value) terms of the entity entry
+def get_entity_terms(entity_entry: RegistryEntry) -> List[Tuple[str, str]]:
+    """Return the indexed terms of the entity entry."""
+    terms: List[Tuple[str, str]] = [
+        ("domain", normalize_value(entity_entry.entity_id.split(".", 1)[0])),
+        (DISABLED_FILTER, normalize_value(entity_entry.disabled_by is not None)),
+    ]
+
+    if entity_entry.platform:
+        terms.append(("platform", normalize_value(entity_entry.platform)))
+
+    device_class = entity_entry.device_class or entity_entry.original_device_class
+    if device_class:
+        terms.append(("device_class", normalize_value(device_class)))
+
+    if entity_entry.entity_category:
+        terms.append(
+            ("entity_category", normalize_value(entity_entry.entity_category.value))
+        )
+
+    # Capabilities match by key ("state_class") and by scalar key=value ("state_class=measurement")
+    for key, value in (entity_entry.capabilities or {}).items():
+        terms.append(("capability", normalize_value(key)))
+        if isinstance(value, (str, int, float, bool)):
+            terms.append(
+                ("capability", normalize_value(key) + "=" + normalize_value(value))
+            )
+
+    return terms
+
+
+# Parses a boolean query parameter
+def _parse_bool(value: str) -> bool:
+    """Parse a boolean query parameter."""
+    value = value.strip().lower()
+    if value in ("1", "true", "yes"):
+        return True
+    if value in ("0", "false", "no"):
+        return False
+    raise ERROR_INVALID_FILTER.copy()
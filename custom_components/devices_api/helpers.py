@@ -3,10 +3,36 @@
 from __future__ import annotations
 from typing import List, Dict, Any
 from homeassistant.core import HomeAssistant
+from aiohttp import hdrs
 from aiohttp.web import Request
-from .constants import DOMAIN, CONFIG
+from .constants import (
+    DOMAIN,
+    CONFIG,
+    INDEX,
+    RESPONSE_CACHE,
+    EVENT_BROKER,
+    REQUEST_COALESCER,
+    METRICS,
+    CHATGPT_CLIENT,
+    JOB_QUEUE,
+    STATE_CACHE,
+)
+from .cache import ResponseCache
+from .chatgpt import ChatGPTClient
+from .coalescing import RequestCoalescer
 from .configuration import Configuration
-from .manager import AreaManager, DeviceManager
+from .events import EventBroker
+from .index import RegistryIndex
+from .jobs import JobQueue
+from .metrics import Metrics
+from .state import StateCache
+from .manager import (
+    AreaManager,
+    ChangesManager,
+    DeviceManager,
+    SearchManager,
+    SnapshotManager,
+)
 
 
 # Builds the view name for the endpoint
@@ -47,6 +73,54 @@ def get_config_from_request(request: Request) -> Configuration:
     return get_hass_from_request(request).data[DOMAIN][CONFIG]
 
 
+# Returns the RegistryIndex instance from the Request object
+def get_registry_index_from_request(request: Request) -> RegistryIndex:
+    """Return the RegistryIndex instance from the Request object."""
+    return get_hass_from_request(request).data[DOMAIN][INDEX]
+
+
+# Returns the ResponseCache instance from the Request object
+def get_response_cache_from_request(request: Request) -> ResponseCache:
+    """Return the ResponseCache instance from the Request object."""
+    return get_hass_from_request(request).data[DOMAIN][RESPONSE_CACHE]
+
+
+# Returns the RequestCoalescer instance from the Request object
+def get_request_coalescer_from_request(request: Request) -> RequestCoalescer:
+    """Return the RequestCoalescer instance from the Request object."""
+    return get_hass_from_request(request).data[DOMAIN][REQUEST_COALESCER]
+
+
+# Returns the Metrics instance from the Request object (None when the metrics are disabled)
+def get_metrics_from_request(request: Request) -> Metrics | None:
+    """Return the Metrics instance from the Request object."""
+    return get_hass_from_request(request).data[DOMAIN].get(METRICS)
+
+
+# Returns the ChatGPTClient instance from the Request object
+def get_chatgpt_client_from_request(request: Request) -> ChatGPTClient:
+    """Return the ChatGPTClient instance from the Request object."""
+    return get_hass_from_request(request).data[DOMAIN][CHATGPT_CLIENT]
+
+
+# Returns the JobQueue instance from the Request object
+def get_job_queue_from_request(request: Request) -> JobQueue:
+    """Return the JobQueue instance from the Request object."""
+    return get_hass_from_request(request).data[DOMAIN][JOB_QUEUE]
+
+
+# Returns the StateCache instance from the Request object
+def get_state_cache_from_request(request: Request) -> StateCache:
+    """Return the StateCache instance from the Request object."""
+    return get_hass_from_request(request).data[DOMAIN][STATE_CACHE]
+
+
+# Returns the EventBroker instance from the Request object
+def get_event_broker_from_request(request: Request) -> EventBroker:
+    """Return the EventBroker instance from the Request object."""
+    return get_hass_from_request(request).data[DOMAIN][EVENT_BROKER]
+
+
 # Returns the DeviceManager instance from the Request object
 def get_device_manager_from_request(request: Request) -> DeviceManager:
     """Return the DeviceManager instance from the Request object."""
@@ -65,12 +139,49 @@ def get_area_manager_from_request(request: Request) -> AreaManager:
     )
 
 
+# Returns the SnapshotManager instance from the Request object
+def get_snapshot_manager_from_request(request: Request) -> SnapshotManager:
+    """Return the SnapshotManager instance from the Request object."""
+    return SnapshotManager(
+        get_hass_from_request(request),
+        get_config_from_request(request),
+    )
+
+
+# Returns the ChangesManager instance from the Request object
+def get_changes_manager_from_request(request: Request) -> ChangesManager:
+    """Return the ChangesManager instance from the Request object."""
+    return ChangesManager(
+        get_hass_from_request(request),
+        get_config_from_request(request),
+    )
+
+
+# Returns the SearchManager instance from the Request object
+def get_search_manager_from_request(request: Request) -> SearchManager:
+    """Return the SearchManager instance from the Request object."""
+    return SearchManager(
+        get_hass_from_request(request),
+        get_config_from_request(request),
+    )
+
+
 # Returns TRUE if component is enabled in the configuration (from the Request object)
 def is_component_enabled(request: Request) -> bool:
     """Return TRUE if component is enabled in the configuration."""
     return get_config_from_request(request).is_enabled()
 
 
+# Returns TRUE if the client address is allowed in the configuration (from the Request object)
+def is_client_allowed(request: Request) -> bool:
+    """Return TRUE if the client address is allowed in the configuration."""
+    return (
+        get_config_from_request(request)
+        .get_allowed_ips()
+        .is_allowed_client(request.remote, request.headers.get(hdrs.X_FORWARDED_FOR))
+    )
+
+
 # Removes the unwanted keys from the dictionary
 def dictionary_without(dictionary: Dict[str, Any], keys: List[str]) -> Dict[str, Any]:
     """Return the dictionary without the unwanted keys."""
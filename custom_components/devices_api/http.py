@@ -1,39 +1,310 @@
 """Http helpers for the Devices API component."""
 
 from __future__ import annotations
-from time import time
-from json import dumps, loads, JSONDecodeError
-from typing import List, Dict, Any
-from aiohttp.web import Request, Response
-from inspect import isclass
-from .errors import ERROR_NOT_FOUND
+from asyncio import get_running_loop
+from time import perf_counter, time
+from json import loads, JSONDecodeError
+from typing import Callable, Iterable, List, Dict, Any, Tuple
+from urllib.parse import urlencode
+from aiohttp import hdrs
+from aiohttp.web import Request, Response, StreamResponse
+from .cache import CachedResponse, ResponseCache
+from .coalescing import RequestCoalescer
+from .compression import compress, negotiate_encoding
+from .configuration import CompressionConfiguration
+from .constants import REQUEST_TIME_HEADER
+from .encoder import encode
+from .errors import Error, ERROR_NOT_FOUND
+from .metrics import PHASE_ENCODE, PHASE_LOOKUP, PHASE_SERIALIZE, RequestTimings
 
 
-def respond(data: Any, none_is_error: bool = True) -> Response:
+# Responds with the encoded data (the time of the request is sent in the X-Request-Time header)
+def respond(data: Any, none_is_error: bool = True, pretty: bool = False) -> Response:
+    """Respond with the encoded data."""
+    request_time = str(time())
+    body, status = _encode_response(data, none_is_error, pretty)
+
+    return Response(
+        body=body,
+        status=status,
+        content_type="application/json",
+        headers={REQUEST_TIME_HEADER: request_time},
+    )
+
+
+# Responds with the cached body for the request, building it only on a cache miss
+# (concurrent misses for the same request and revision share one build when a coalescer is given)
+async def respond_cached(
+    request: Request,
+    cache: ResponseCache,
+    revision: int,
+    builder: Callable[[], Any],
+    none_is_error: bool = True,
+    compression: CompressionConfiguration | None = None,
+    coalescer: RequestCoalescer | None = None,
+    timings: RequestTimings | None = None,
+) -> Response:
+    """Respond with the cached body for the request, building it only on a cache miss.
+
+    The data is built on the event loop (the registries are not thread-safe) and
+    encoded in the executor, which is when identical concurrent requests join the
+    in-flight build instead of starting their own. The phases are timed only when
+    timings are given. Compressed variants are built in the executor as well:
+    along with the body on a miss, and on their first request otherwise. As
+    with every response, the time of the request is sent in the X-Request-Time
+    header, so that the cached body does not change.
+    """
+    request_time = str(time())
+    key = _build_cache_key(request)
+    accepted = None
+    if compression is not None and compression.is_enabled():
+        accepted = negotiate_encoding(request.headers.get(hdrs.ACCEPT_ENCODING))
+    if timings is None:
+        entry = cache.get(key, revision)
+    else:
+        started = perf_counter()
+        entry = cache.get(key, revision)
+        timings.add(PHASE_LOOKUP, perf_counter() - started)
+
+    if entry is None:
+        pretty = is_pretty_requested(request)
+
+        async def build() -> Tuple[CachedResponse | None, bytes, int, Dict[str, float]]:
+            durations: Dict[str, float] = {}
+            if timings is None:
+                data = builder()
+                built, body, status = await get_running_loop().run_in_executor(
+                    None, _build_entry, data, none_is_error, pretty, revision, compression, accepted
+                )
+            else:
+                started = perf_counter()
+                data = builder()
+                built_at = perf_counter()
+                built, body, status = await get_running_loop().run_in_executor(
+                    None, _build_entry, data, none_is_error, pretty, revision, compression, accepted
+                )
+                durations[PHASE_SERIALIZE] = built_at - started
+                durations[PHASE_ENCODE] = perf_counter() - built_at
+            if built is not None:
+                cache.set(key, built)
+            return built, body, status, durations
+
+        if coalescer is None:
+            entry, body, status, durations = await build()
+        else:
+            entry, body, status, durations = await coalescer.run((key, revision), build)
+
+        # Requests that joined an in-flight build report the phases of that build
+        if timings is not None:
+            for phase, duration in durations.items():
+                timings.add(phase, duration)
+
+        if entry is None:
+            return Response(
+                body=body,
+                status=status,
+                content_type="application/json",
+                headers={REQUEST_TIME_HEADER: request_time},
+            )
+
+    encoding = None
+    if compression is not None and compression.should_compress(len(entry.get_body())):
+        encoding = accepted
+
+    headers = {
+        hdrs.ETAG: entry.get_etag(encoding),
+        hdrs.VARY: hdrs.ACCEPT_ENCODING,
+        REQUEST_TIME_HEADER: request_time,
+    }
+
+    if_none_match = request.headers.get(hdrs.IF_NONE_MATCH)
+    if _etag_matches(if_none_match, entry.get_etag(encoding)) or _etag_matches(
+        if_none_match, entry.get_etag()
+    ):
+        return Response(status=304, headers=headers)
+
+    body = entry.get_body(encoding)
+    if body is None:
+        # Compressing a large body takes a while, which would block the event loop
+        body = await get_running_loop().run_in_executor(None, compress, entry.get_body(), encoding)
+        cache.set_variant(key, entry, encoding, body)
+
+    if encoding is not None:
+        headers[hdrs.CONTENT_ENCODING] = encoding
+
+    return Response(
+        body=body,
+        status=200,
+        content_type="application/json",
+        headers=headers,
+    )
+
+
+# Streams the serialized items, flushing them in chunks, as a JSON document or as NDJSON (one item per line)
+async def respond_stream(
+    request: Request,
+    items: Iterable[Any],
+    serializer: Callable[[Any], Any],
+    compression: CompressionConfiguration | None = None,
+    chunk_size: int = 100,
+    head: bytes = b'{"data":[',
+    tail: bytes = b"]}",
+) -> StreamResponse:
+    """Stream the serialized items in chunks, as a JSON document or as NDJSON.
+
+    The items of a JSON document are written between its head and its tail
+    (a `data` array by default). The body size is unknown until the last item, so the first chunks are held
+    back until `compression.min_size` bytes are buffered: the response is then
+    compressed, while a smaller body is sent as is once the items run out.
+    """
+    ndjson = is_ndjson_requested(request)
+
+    response = StreamResponse(status=200, headers={REQUEST_TIME_HEADER: str(time())})
+    response.content_type = "application/x-ndjson" if ndjson else "application/json"
+    compressed = compression is not None and compression.is_enabled()
+    min_size = compression.get_min_size() if compressed else 0
+    # Chunks held back until the compression is decided (None once the response is prepared)
+    held: List[bytes] | None = []
+    held_size = 0
+
+    # The pieces are written one by one, never joined, so that a large item is not copied again
+    async def write(pieces: List[bytes], last: bool = False) -> None:
+        nonlocal held, held_size
+        if held is not None:
+            held.extend(pieces)
+            held_size += sum(len(piece) for piece in pieces)
+            if not last and held_size < min_size:
+                return
+            if compressed and held_size >= min_size:
+                response.enable_compression()
+            await response.prepare(request)
+            pieces = held
+            held = None
+        for piece in pieces:
+            await response.write(piece)
+
+    chunk: List[bytes] = []
+    if not ndjson:
+        chunk.append(head)
+    count = 0
+    chunk_items = 0
+
+    for item in items:
+        if ndjson:
+            chunk.append(encode(serializer(item)))
+            chunk.append(b"\n")
+        else:
+            if count:
+                chunk.append(b",")
+            chunk.append(encode(serializer(item)))
+        count += 1
+        chunk_items += 1
+
+        if chunk_items >= chunk_size:
+            await write(chunk)
+            chunk = []
+            chunk_items = 0
+
+    if not ndjson:
+        chunk.append(tail)
+    await write(chunk, last=True)
+
+    await response.write_eof()
+    return response
+
+
+# Returns TRUE if the request asks for a streamed response (`?stream=1` or an NDJSON Accept header)
+def is_stream_requested(request: Request) -> bool:
+    """Return TRUE if the request asks for a streamed response."""
+    return (
+        request.query.get("stream", "").lower() in ("1", "true", "yes")
+        or is_ndjson_requested(request)
+    )
+
+
+# Returns TRUE if the request accepts NDJSON (`Accept: application/x-ndjson`)
+def is_ndjson_requested(request: Request) -> bool:
+    """Return TRUE if the request accepts NDJSON."""
+    return "application/x-ndjson" in request.headers.get(hdrs.ACCEPT, "")
+
+
+# Returns TRUE if the request asks for indented output (`?pretty=1`)
+def is_pretty_requested(request: Request) -> bool:
+    """Return TRUE if the request asks for indented output."""
+    return request.query.get("pretty", "").lower() in ("1", "true", "yes")
+
+
+# Encodes the response body and resolves the response status
+def _encode_response(
+    data: Any, none_is_error: bool, pretty: bool = False
+) -> Tuple[bytes, int]:
+    """Encode the response body and resolve the response status."""
     if data is None and none_is_error:
-        data = ERROR_NOT_FOUND.as_http_json()
+        data = ERROR_NOT_FOUND
+    if isinstance(data, Error):
+        data = data.as_http_json()
 
     response_data = _generate_response_text(data)
-    response_data["request_time"] = time()
 
     if "error" in response_data:
-        return Response(
-            body=dumps(response_data, indent=4),
-            status=response_data["error"]["code"],
-            content_type="application/json",
-        )
+        status = response_data["error"]["code"]
     else:
-        return Response(
-            body=dumps(response_data, indent=4),
-            status=200,
-            content_type="application/json",
-        )
+        status = 200
+
+    return encode(response_data, pretty), status
+
+
+# Encodes the response body into a cache entry (None for error responses, which are not cached),
+# along with its variant compressed with the content coding if one is given and the body is large enough
+def _build_entry(
+    data: Any,
+    none_is_error: bool,
+    pretty: bool,
+    revision: int,
+    compression: CompressionConfiguration | None = None,
+    encoding: str | None = None,
+) -> Tuple[CachedResponse | None, bytes, int]:
+    """Encode the response body into a cache entry, along with its compressed variant."""
+    body, status = _encode_response(data, none_is_error, pretty)
+    if status != 200:
+        return None, body, status
+
+    entry = CachedResponse(revision, body)
+    if encoding is not None and compression is not None and compression.should_compress(len(body)):
+        entry.set_variant(encoding, compress(body, encoding))
+    return entry, body, status
+
+
+# Builds the cache key of the request (path and sorted query string)
+def _build_cache_key(request: Request) -> str:
+    """Build the cache key of the request."""
+    return request.path + "?" + urlencode(sorted(request.query.items()))
+
+
+# Checks whether the If-None-Match header matches the entity tag
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Check whether the If-None-Match header matches the entity tag."""
+    if not if_none_match:
+        return False
+
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+
+    return False
 
 
 # Generates the response text from the data
 def _generate_response_text(data: Any) -> Dict[str, Any]:
     """Generate the response text from the data."""
-    if hasattr(data, "as_dict") and callable(getattr(data, "as_dict")):
+    if hasattr(data, "as_response_dict") and callable(getattr(data, "as_response_dict")):
+        return data.as_response_dict()
+    elif hasattr(data, "as_dict") and callable(getattr(data, "as_dict")):
         return {"data": data.as_dict()}
     elif isinstance(data, (dict, list)):
         return {"data": data}
@@ -0,0 +1,599 @@
+"""Registry indexes for the Devices API component."""
+
+from __future__ import annotations
+from bisect import bisect_left, bisect_right, insort
+from time import time
+from typing import Callable, Dict, FrozenSet, Iterable, List, Set, Tuple
+from homeassistant.core import HomeAssistant, Event, CALLBACK_TYPE, callback
+from homeassistant.helpers.area_registry import EVENT_AREA_REGISTRY_UPDATED
+from homeassistant.helpers.device_registry import (
+    EVENT_DEVICE_REGISTRY_UPDATED,
+    DeviceRegistry,
+    DeviceEntry,
+    async_get as async_get_device_registry,
+)
+from homeassistant.helpers.entity_registry import (
+    EVENT_ENTITY_REGISTRY_UPDATED,
+    EntityRegistry,
+    RegistryEntry,
+    async_get as async_get_entity_registry,
+)
+from .changes import (
+    CHANGE_TYPE_AREA,
+    CHANGE_TYPE_DEVICE,
+    CHANGE_TYPE_ENTITY,
+    RegistryChange,
+)
+from .configuration import Configuration, IgnoredDomainsConfiguration
+from .constants import NO_AREA_ID
+from .filters import (
+    DEVICE_FILTERS,
+    ENTITY_FILTERS,
+    DISABLED_FILTER,
+    Filters,
+    get_device_terms,
+    get_entity_terms,
+    normalize_value,
+)
+
+
+# Class: PostingIndex
+class PostingIndex:
+    """Inverted index of (attribute, value) terms to the IDs of the objects having them."""
+
+    # (Attribute, value) -> Object IDs
+    _postings: Dict[Tuple[str, str], Set[str]]
+    # Object ID -> Indexed terms (to remove the object without its previous entry)
+    _terms: Dict[str, List[Tuple[str, str]]]
+
+    # Constructor
+    def __init__(self) -> None:
+        """Constructor."""
+        self._postings = {}
+        self._terms = {}
+
+    # Indexes the object under the terms
+    def add(self, object_id: str, terms: List[Tuple[str, str]]) -> None:
+        """Index the object under the terms."""
+        self._terms[object_id] = terms
+        for term in terms:
+            self._postings.setdefault(term, set()).add(object_id)
+
+    # Removes the object from the index
+    def discard(self, object_id: str) -> None:
+        """Remove the object from the index."""
+        for term in self._terms.pop(object_id, []):
+            object_ids = self._postings[term]
+            object_ids.discard(object_id)
+            if not object_ids:
+                del self._postings[term]
+
+    # Returns the IDs of the objects having any of the values of the attribute
+    # (the posting set itself for a single value, it must not be modified)
+    def find(self, attribute: str, values: FrozenSet[str]) -> Set[str]:
+        """Return the IDs of the objects having any of the values of the attribute."""
+        if len(values) == 1:
+            return self._postings.get((attribute, next(iter(values))), set())
+
+        object_ids: Set[str] = set()
+        for value in values:
+            object_ids |= self._postings.get((attribute, value), set())
+        return object_ids
+
+    # Returns the IDs of all indexed objects
+    def get_ids(self) -> Iterable[str]:
+        """Return the IDs of all indexed objects."""
+        return self._terms.keys()
+
+    # Removes all objects from the index
+    def clear(self) -> None:
+        """Remove all objects from the index."""
+        self._postings.clear()
+        self._terms.clear()
+
+
+# Class: RegistryIndex
+class RegistryIndex:
+    """Indexes over the registries, kept current from registry update events."""
+
+    # HomeAssistant instance
+    _hass: HomeAssistant
+    # Device Registry instance
+    _device_registry: DeviceRegistry
+    # Entity Registry instance
+    _entity_registry: EntityRegistry
+    # Device ID -> (Entity ID -> Entity entry)
+    _device_entities: Dict[str, Dict[str, RegistryEntry]]
+    # Entity ID -> Device ID
+    _entity_devices: Dict[str, str]
+    # Area ID (or NO_AREA_ID) -> Sorted device IDs
+    _area_devices: Dict[str, List[str]]
+    # Device ID -> Area ID (or NO_AREA_ID)
+    _device_areas: Dict[str, str]
+    # Sorted IDs of all devices
+    _device_ids: List[str]
+    # IDs of the disabled devices
+    _disabled_device_ids: Set[str]
+    # Inverted index of the device attributes
+    _device_postings: PostingIndex
+    # Inverted index of the entity attributes (of all entities, with or without a device)
+    _entity_postings: PostingIndex
+    # Ignored domains configuration
+    _ignored_domains: IgnoredDomainsConfiguration
+    # IDs of the entities in an ignored domain, left out of every entity listing
+    _ignored_entity_ids: Set[str]
+    # Version of the ignored domains configuration the ignored entity IDs were computed for
+    _ignored_version: int
+    # Revision, bumped on every registry update event
+    _revision: int
+    # Registry change listeners
+    _listeners: List[Callable[[RegistryChange], None]]
+    # Event listeners removal callbacks
+    _unsubscribers: List[CALLBACK_TYPE]
+
+    # Constructor
+    def __init__(self, hass: HomeAssistant, config: Configuration) -> None:
+        """Initialize the registry index."""
+        self._hass = hass
+        self._device_registry = async_get_device_registry(hass)
+        self._entity_registry = async_get_entity_registry(hass)
+        self._device_entities = {}
+        self._entity_devices = {}
+        self._area_devices = {}
+        self._device_areas = {}
+        self._device_ids = []
+        self._disabled_device_ids = set()
+        self._device_postings = PostingIndex()
+        self._entity_postings = PostingIndex()
+        self._ignored_domains = config.get_ignored_domains()
+        self._ignored_entity_ids = set()
+        self._ignored_version = self._ignored_domains.get_version()
+        # Seeded from the clock so revisions keep increasing across restarts
+        self._revision = int(time() * 1000)
+        self._listeners = []
+        self._unsubscribers = []
+
+    # Builds the index and subscribes to the registry update events
+    @callback
+    def async_setup(self) -> None:
+        """Build the index and subscribe to the registry update events."""
+        self._build()
+        self._unsubscribers.extend(
+            [
+                self._hass.bus.async_listen(
+                    EVENT_AREA_REGISTRY_UPDATED,
+                    self._async_area_registry_updated,
+                ),
+                self._hass.bus.async_listen(
+                    EVENT_DEVICE_REGISTRY_UPDATED,
+                    self._async_device_registry_updated,
+                ),
+                self._hass.bus.async_listen(
+                    EVENT_ENTITY_REGISTRY_UPDATED,
+                    self._async_entity_registry_updated,
+                ),
+            ]
+        )
+
+    # Unsubscribes from the registry update events
+    @callback
+    def async_shutdown(self) -> None:
+        """Unsubscribe from the registry update events."""
+        while self._unsubscribers:
+            self._unsubscribers.pop()()
+
+    # Adds a listener called with every registry change, after the index is updated
+    @callback
+    def async_add_listener(
+        self, listener: Callable[[RegistryChange], None]
+    ) -> CALLBACK_TYPE:
+        """Add a listener called with every registry change, returning its removal callback."""
+        self._listeners.append(listener)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(listener)
+
+        return remove_listener
+
+    # Returns the registry revision (bumped as well for the entities an ignored domains change hides or shows)
+    def get_revision(self) -> int:
+        """Return the registry revision."""
+        if self._ignored_version != self._ignored_domains.get_version():
+            self._refresh_ignored_entities()
+        return self._revision
+
+    # Returns the entity entries of the device (except the ignored ones)
+    def get_device_entities(self, device_id: str) -> List[RegistryEntry]:
+        """Return the entity entries of the device."""
+        entities = self._device_entities.get(device_id)
+        if entities is None:
+            return []
+
+        ignored = self._get_ignored_entity_ids()
+        if not ignored:
+            return list(entities.values())
+        return [
+            entity_entry
+            for entity_id, entity_entry in entities.items()
+            if entity_id not in ignored
+        ]
+
+    # Returns TRUE if the entity is in an ignored domain
+    def is_ignored_entity(self, entity_id: str) -> bool:
+        """Return TRUE if the entity is in an ignored domain."""
+        return entity_id in self._get_ignored_entity_ids()
+
+    # Returns the IDs of the devices in the area (NO_AREA_ID for devices without an area), ordered by ID
+    def get_area_device_ids(self, area_id: str) -> List[str]:
+        """Return the IDs of the devices in the area, ordered by ID."""
+        return self._area_devices.get(area_id, [])
+
+    # Returns the device entries in the area (NO_AREA_ID for devices without an area), ordered by ID
+    def get_area_devices(self, area_id: str) -> List[DeviceEntry]:
+        """Return the device entries in the area, ordered by ID."""
+        devices: List[DeviceEntry] = []
+
+        for device_id in self.get_area_device_ids(area_id):
+            device_entry = self._device_registry.devices.get(device_id)
+            if device_entry is not None:
+                devices.append(device_entry)
+
+        return devices
+
+    # Returns the area ID of the device (NO_AREA_ID for devices without an area, None for unknown devices)
+    def get_device_area(self, device_id: str) -> str | None:
+        """Return the area ID of the device."""
+        return self._device_areas.get(device_id)
+
+    # Returns whether the device is disabled
+    def is_disabled_device(self, device_id: str) -> bool:
+        """Return whether the device is disabled."""
+        return device_id in self._disabled_device_ids
+
+    # Returns the number of enabled devices, in the area if one is given
+    def count_enabled_devices(self, area_id: str | None = None) -> int:
+        """Return the number of enabled devices, in the area if one is given."""
+        if area_id is None:
+            return len(self._device_ids) - len(self._disabled_device_ids)
+        return sum(
+            1
+            for device_id in self.get_area_device_ids(area_id)
+            if device_id not in self._disabled_device_ids
+        )
+
+    # Returns up to `limit` enabled device IDs ordered by ID and following `after`, and whether more remain
+    def get_enabled_device_ids_page(
+        self,
+        after: str | None,
+        limit: int,
+        area_id: str | None = None,
+    ) -> Tuple[List[str], bool]:
+        """Return a page of enabled device IDs ordered by ID, and whether more remain.
+
+        The device IDs are kept sorted (per area too), so the page starts with a
+        binary search for the cursor.
+        """
+        if area_id is None:
+            device_ids = self._device_ids
+        else:
+            device_ids = self.get_area_device_ids(area_id)
+
+        page: List[str] = []
+        start = 0 if after is None else bisect_right(device_ids, after)
+
+        for position in range(start, len(device_ids)):
+            device_id = device_ids[position]
+            if device_id in self._disabled_device_ids:
+                continue
+            if len(page) == limit:
+                return page, True
+            page.append(device_id)
+
+        return page, False
+
+    # Returns the IDs of the devices passing the filters, in the area if one is given, ordered by ID
+    # (enabled devices only, unless the disabled status is filtered on)
+    def find_device_ids(
+        self, filters: Filters | None = None, area_id: str | None = None
+    ) -> List[str]:
+        """Return the IDs of the devices passing the filters, ordered by ID.
+
+        The posting sets of the filtered attributes are intersected, smallest
+        first; entity attribute filters select the devices of the matching
+        entities. The registries themselves are never scanned.
+        """
+        candidates: List[Set[str]] = []
+        if area_id is not None:
+            candidates.append(set(self.get_area_device_ids(area_id)))
+
+        if filters is not None:
+            for attribute in DEVICE_FILTERS:
+                values = filters.get_values(attribute)
+                if values:
+                    candidates.append(self._device_postings.find(attribute, values))
+
+            if filters.has_any(ENTITY_FILTERS):
+                device_ids: Set[str] = set()
+                ignored = self._get_ignored_entity_ids()
+                for entity_id in self._find_entity_postings(filters):
+                    if entity_id in ignored:
+                        continue
+                    device_id = self._entity_devices.get(entity_id)
+                    if device_id is not None:
+                        device_ids.add(device_id)
+                candidates.append(device_ids)
+
+        device_ids = _intersect(candidates)
+        if device_ids is None:
+            device_ids = set(self._device_ids)
+
+        if filters is not None and filters.get_disabled():
+            device_ids &= self._disabled_device_ids
+        else:
+            device_ids -= self._disabled_device_ids
+
+        return sorted(device_ids)
+
+    # Returns the IDs of the entities passing the filters, ordered by ID
+    def find_entity_ids(self, filters: Filters | None = None) -> List[str]:
+        """Return the IDs of the entities passing the filters, ordered by ID.
+
+        Device attribute filters select the entities of the matching devices.
+        """
+        candidates: List[Set[str]] = []
+
+        if filters is not None:
+            if filters.has_any(ENTITY_FILTERS) or filters.get_disabled() is not None:
+                candidates.append(
+                    self._find_entity_postings(filters, True)
+                )
+
+            if filters.has_any(DEVICE_FILTERS):
+                entity_ids: Set[str] = set()
+                device_ids = _intersect(
+                    [
+                        self._device_postings.find(attribute, filters.get_values(attribute))
+                        for attribute in DEVICE_FILTERS
+                        if filters.get_values(attribute)
+                    ]
+                )
+                for device_id in device_ids:
+                    entity_ids.update(self._device_entities.get(device_id, {}))
+                candidates.append(entity_ids)
+
+        entity_ids = _intersect(candidates)
+        if entity_ids is None:
+            entity_ids = set(self._entity_postings.get_ids())
+        return sorted(entity_ids - self._get_ignored_entity_ids())
+
+    # Returns the IDs of the entities passing the entity attribute filters (and the disabled one if asked)
+    def _find_entity_postings(
+        self, filters: Filters, disabled: bool = False
+    ) -> Set[str]:
+        """Return the IDs of the entities passing the entity attribute filters."""
+        postings: List[Set[str]] = []
+
+        for attribute in ENTITY_FILTERS:
+            values = filters.get_values(attribute)
+            if values:
+                postings.append(self._entity_postings.find(attribute, values))
+
+        if disabled and filters.get_disabled() is not None:
+            postings.append(
+                self._entity_postings.find(
+                    DISABLED_FILTER,
+                    frozenset([normalize_value(filters.get_disabled())]),
+                )
+            )
+
+        entity_ids = _intersect(postings)
+        if entity_ids is None:
+            return set(self._entity_postings.get_ids())
+        return entity_ids
+
+    # Returns the IDs of the entities in an ignored domain (recomputed once after the configuration changes)
+    def _get_ignored_entity_ids(self) -> Set[str]:
+        """Return the IDs of the entities in an ignored domain."""
+        if self._ignored_version != self._ignored_domains.get_version():
+            self._refresh_ignored_entities()
+        return self._ignored_entity_ids
+
+    # Recomputes the ignored entity IDs for the current configuration, publishing the entities it hides or shows
+    def _refresh_ignored_entities(self) -> None:
+        """Recompute the ignored entity IDs for the current configuration.
+
+        The entities the change hides are published as removed and the ones it
+        shows again as created, so the change log holds every revision (and the
+        responses built before the change are no longer valid).
+        """
+        self._ignored_version = self._ignored_domains.get_version()
+        previous = self._ignored_entity_ids
+        self._ignored_entity_ids = {
+            entity_id
+            for entity_id in self._entity_postings.get_ids()
+            if self._ignored_domains.is_ignored_entity(entity_id)
+        }
+
+        for entity_id in sorted(self._ignored_entity_ids - previous):
+            self._publish_change(RegistryChange(self._revision + 1, CHANGE_TYPE_ENTITY, "remove", entity_id))
+        for entity_id in sorted(previous - self._ignored_entity_ids):
+            self._publish_change(RegistryChange(self._revision + 1, CHANGE_TYPE_ENTITY, "create", entity_id))
+
+    # Builds the index from a full scan of the registries
+    def _build(self) -> None:
+        """Build the index from a full scan of the registries."""
+        self._device_entities.clear()
+        self._entity_devices.clear()
+        self._area_devices.clear()
+        self._device_areas.clear()
+        self._device_ids.clear()
+        self._disabled_device_ids.clear()
+        self._device_postings.clear()
+        self._entity_postings.clear()
+        self._ignored_entity_ids.clear()
+
+        for device_entry in self._device_registry.devices.values():
+            self._add_device(device_entry)
+
+        for entity_entry in self._entity_registry.entities.values():
+            self._add_entity(entity_entry)
+
+    # Adds the device entry to the index
+    def _add_device(self, device_entry: DeviceEntry) -> None:
+        """Add the device entry to the index."""
+        area_id = device_entry.area_id or NO_AREA_ID
+
+        insort(self._area_devices.setdefault(area_id, []), device_entry.id)
+        self._device_areas[device_entry.id] = area_id
+        insort(self._device_ids, device_entry.id)
+        self._device_postings.add(device_entry.id, get_device_terms(device_entry))
+
+        if device_entry.disabled_by is not None:
+            self._disabled_device_ids.add(device_entry.id)
+
+    # Removes the device from the index
+    def _discard_device(self, device_id: str) -> None:
+        """Remove the device from the index."""
+        area_id = self._device_areas.pop(device_id, None)
+        if area_id is None:
+            return
+
+        devices = self._area_devices[area_id]
+        del devices[bisect_left(devices, device_id)]
+        if not devices:
+            del self._area_devices[area_id]
+
+        del self._device_ids[bisect_left(self._device_ids, device_id)]
+        self._device_postings.discard(device_id)
+        self._disabled_device_ids.discard(device_id)
+
+    # Re-reads the device entry from the registry and updates the index
+    def _refresh_device(self, device_id: str) -> None:
+        """Re-read the device entry from the registry and update the index."""
+        self._discard_device(device_id)
+
+        device_entry = self._device_registry.async_get(device_id)
+        if device_entry is not None:
+            self._add_device(device_entry)
+
+    # Adds the entity entry to the index
+    def _add_entity(self, entity_entry: RegistryEntry) -> None:
+        """Add the entity entry to the index."""
+        self._entity_postings.add(entity_entry.entity_id, get_entity_terms(entity_entry))
+        if self._ignored_domains.is_ignored_entity(entity_entry.entity_id):
+            self._ignored_entity_ids.add(entity_entry.entity_id)
+
+        if entity_entry.device_id is None:
+            return
+
+        self._device_entities.setdefault(entity_entry.device_id, {})[
+            entity_entry.entity_id
+        ] = entity_entry
+        self._entity_devices[entity_entry.entity_id] = entity_entry.device_id
+
+    # Removes the entity from the index
+    def _discard_entity(self, entity_id: str) -> None:
+        """Remove the entity from the index."""
+        self._entity_postings.discard(entity_id)
+        self._ignored_entity_ids.discard(entity_id)
+
+        device_id = self._entity_devices.pop(entity_id, None)
+        if device_id is None:
+            return
+
+        entities = self._device_entities[device_id]
+        del entities[entity_id]
+        if not entities:
+            del self._device_entities[device_id]
+
+    # Bumps the revision and notifies the listeners of the registry change
+    def _publish(
+        self,
+        change_type: str,
+        action: str,
+        object_id: str,
+        event: Event,
+        old_id: str | None = None,
+    ) -> None:
+        """Bump the revision and notify the listeners of the registry change."""
+        self._publish_change(
+            RegistryChange(
+                self._revision + 1,
+                change_type,
+                action,
+                object_id,
+                old_id,
+                sorted(event.data.get("changes", {})),
+            )
+        )
+
+    # Bumps the revision to the one of the change and notifies the listeners
+    def _publish_change(self, change: RegistryChange) -> None:
+        """Bump the revision to the one of the change and notify the listeners."""
+        self._revision = change.get_revision()
+
+        for listener in list(self._listeners):
+            listener(change)
+
+    # Handles the area registry update event
+    @callback
+    def _async_area_registry_updated(self, event: Event) -> None:
+        """Handle the area registry update event."""
+        area_id = event.data["area_id"]
+
+        if event.data["action"] == "remove":
+            # Devices are normally moved out by their own update events, this only catches stragglers
+            for device_id in list(self.get_area_device_ids(area_id)):
+                self._refresh_device(device_id)
+
+        self._publish(CHANGE_TYPE_AREA, event.data["action"], area_id, event)
+
+    # Handles the device registry update event
+    @callback
+    def _async_device_registry_updated(self, event: Event) -> None:
+        """Handle the device registry update event."""
+        device_id = event.data["device_id"]
+
+        if event.data["action"] == "remove":
+            self._discard_device(device_id)
+        else:
+            self._refresh_device(device_id)
+
+        self._publish(CHANGE_TYPE_DEVICE, event.data["action"], device_id, event)
+
+    # Handles the entity registry update event
+    @callback
+    def _async_entity_registry_updated(self, event: Event) -> None:
+        """Handle the entity registry update event."""
+        entity_id = event.data["entity_id"]
+        old_entity_id = event.data.get("old_entity_id")
+
+        if old_entity_id is not None:
+            self._discard_entity(old_entity_id)
+        self._discard_entity(entity_id)
+
+        if event.data["action"] != "remove":
+            entity_entry = self._entity_registry.async_get(entity_id)
+            if entity_entry is not None:
+                self._add_entity(entity_entry)
+
+        self._publish(
+            CHANGE_TYPE_ENTITY, event.data["action"], entity_id, event, old_entity_id
+        )
+
+
+# Intersects the sets, smallest first (None when there is no set to intersect)
+def _intersect(sets: List[Set[str]]) -> Set[str] | None:
+    """Intersect the sets, smallest first."""
+    if not sets:
+        return None
+
+    sets = sorted(sets, key=len)
+    result = set(sets[0])
+    for other in sets[1:]:
+        if not result:
+            break
+        result &= other
+
+    return result
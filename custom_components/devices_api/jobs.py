@@ -0,0 +1,292 @@
+"""Background automation generation jobs for the Devices API component."""
+
+from __future__ import annotations
+from asyncio import CancelledError, Queue, Task
+from collections import OrderedDict
+from time import time
+from typing import Any, Dict, List, Tuple
+from uuid import uuid4
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant, callback
+from .chatgpt import ChatGPTClient
+from .configuration import Configuration
+from .errors import (
+    Error,
+    ERROR_INTERNAL_SERVER_ERROR,
+    ERROR_JOB_QUEUE_FULL,
+    ERROR_NOT_FOUND,
+)
+from .manager import DeviceManager
+from .prompt import PromptContextEncoder
+
+# Job waiting for its first device to be processed.
+JOB_STATUS_QUEUED = "queued"
+# Job with devices being processed.
+JOB_STATUS_RUNNING = "running"
+# Job with every device processed.
+JOB_STATUS_FINISHED = "finished"
+# Device whose automation was generated.
+RESULT_STATUS_COMPLETED = "completed"
+# Device whose automation could not be generated.
+RESULT_STATUS_FAILED = "failed"
+
+# Work item: (device ID, prompt)
+WorkItem = Tuple[str, str]
+
+
+# Class: Job
+class Job:
+    """Automation generation for a set of devices, with its progress and results."""
+
+    # Job ID
+    _id: str
+    # Instruction sent with the context of every device
+    _prompt: str
+    # IDs of the devices of the job
+    _device_ids: List[str]
+    # Job status
+    _status: str
+    # Device ID -> Result
+    _results: Dict[str, Dict[str, Any]]
+    # Number of failed devices
+    _failed: int
+    # Creation time (UNIX timestamp)
+    _created: float
+    # Time the last device was processed (UNIX timestamp)
+    _finished: float | None
+
+    # Constructor
+    def __init__(self, prompt: str, device_ids: List[str]) -> None:
+        """Constructor."""
+        self._id = uuid4().hex
+        self._prompt = prompt
+        self._device_ids = device_ids
+        self._status = JOB_STATUS_QUEUED if device_ids else JOB_STATUS_FINISHED
+        self._results = {}
+        self._failed = 0
+        self._created = time()
+        self._finished = None if device_ids else self._created
+
+    # Returns the job ID
+    def get_id(self) -> str:
+        """Return the job ID."""
+        return self._id
+
+    # Returns the job status
+    def get_status(self) -> str:
+        """Return the job status."""
+        return self._status
+
+    # Returns TRUE once every device is processed
+    def is_finished(self) -> bool:
+        """Return TRUE once every device is processed."""
+        return self._status == JOB_STATUS_FINISHED
+
+    # Marks the job as running
+    def set_running(self) -> None:
+        """Mark the job as running."""
+        if self._status == JOB_STATUS_QUEUED:
+            self._status = JOB_STATUS_RUNNING
+
+    # Records the generated automation of the device
+    def set_completed(self, device_id: str, response: str) -> None:
+        """Record the generated automation of the device."""
+        self._results[device_id] = {
+            "status": RESULT_STATUS_COMPLETED,
+            "response": response,
+        }
+        self._update_status()
+
+    # Records the failure of the device
+    def set_failed(self, device_id: str, error: Error) -> None:
+        """Record the failure of the device."""
+        self._results[device_id] = {
+            "status": RESULT_STATUS_FAILED,
+            "error": error.as_dict(),
+        }
+        self._failed += 1
+        self._update_status()
+
+    # Returns the job as a dictionary
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the job as a dictionary."""
+        return {
+            "id": self._id,
+            "status": self._status,
+            "prompt": self._prompt,
+            "created": self._created,
+            "finished": self._finished,
+            "progress": {
+                "total": len(self._device_ids),
+                "completed": len(self._results) - self._failed,
+                "failed": self._failed,
+            },
+            "results": self._results,
+        }
+
+    # Finishes the job once every device is processed
+    def _update_status(self) -> None:
+        """Finish the job once every device is processed."""
+        if len(self._results) == len(self._device_ids):
+            self._status = JOB_STATUS_FINISHED
+            self._finished = time()
+
+
+# Class: JobQueue
+class JobQueue:
+    """Queue of automation generation jobs, processed by a fixed pool of workers.
+
+    Jobs are split into (device, prompt) work items. An item that is already
+    queued or being processed for another job is not queued again, its result
+    is shared by every job waiting for it. Finished jobs are kept up to the
+    configured number, the oldest ones are dropped first. A submission is
+    rejected while that many jobs are unfinished, or when it would queue more
+    work items than configured.
+    """
+
+    # HomeAssistant instance
+    _hass: HomeAssistant
+    # Configuration instance
+    _config: Configuration
+    # ChatGPT client
+    _client: ChatGPTClient
+    # Work items waiting for a worker
+    _queue: Queue
+    # Work item -> Jobs waiting for its result (while it is queued or processed)
+    _waiting: Dict[WorkItem, List[Job]]
+    # Job ID -> Job, oldest first
+    _jobs: OrderedDict[str, Job]
+    # Worker tasks (started with the first job)
+    _workers: List[Task]
+    # Number of work items shared with an already queued one
+    _deduplicated: int
+
+    # Constructor
+    def __init__(
+        self, hass: HomeAssistant, config: Configuration, client: ChatGPTClient
+    ) -> None:
+        """Constructor."""
+        self._hass = hass
+        self._config = config
+        self._client = client
+        self._queue = Queue()
+        self._waiting = {}
+        self._jobs = OrderedDict()
+        self._workers = []
+        self._deduplicated = 0
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, self._async_stop)
+
+    # Creates a job generating the automations of the devices and queues its work items
+    @callback
+    def async_submit(self, prompt: str, device_ids: List[str]) -> Job:
+        """Create a job generating the automations of the devices and queue its work items.
+
+        Raises ERROR_JOB_QUEUE_FULL when the pending jobs or work items are at their limits.
+        """
+        device_ids = list(dict.fromkeys(device_ids))
+        items = [(device_id, prompt) for device_id in device_ids]
+        new_items = [item for item in items if item not in self._waiting]
+        jobs_config = self._config.get_jobs()
+        if (
+            self._count_unfinished_jobs() >= jobs_config.get_max_jobs()
+            or self._queue.qsize() + len(new_items) > jobs_config.get_max_queued()
+        ):
+            raise ERROR_JOB_QUEUE_FULL.copy()
+
+        job = Job(prompt, device_ids)
+        self._jobs[job.get_id()] = job
+        self._drop_finished_jobs()
+
+        for item in items:
+            jobs = self._waiting.get(item)
+            if jobs is not None:
+                jobs.append(job)
+                self._deduplicated += 1
+                continue
+            self._waiting[item] = [job]
+            self._queue.put_nowait(item)
+
+        if device_ids and not self._workers:
+            self._workers = [
+                self._hass.loop.create_task(self._async_work())
+                for _ in range(self._config.get_jobs().get_concurrency())
+            ]
+
+        return job
+
+    # Returns the job by ID
+    def get_job(self, job_id: str) -> Job | None:
+        """Return the job by ID."""
+        return self._jobs.get(job_id)
+
+    # Returns the counters as a dictionary
+    def as_dict(self) -> Dict[str, int]:
+        """Return the counters as a dictionary."""
+        return {
+            "jobs": len(self._jobs),
+            "queued": self._queue.qsize(),
+            "deduplicated": self._deduplicated,
+        }
+
+    # Processes the work items until Home Assistant stops
+    async def _async_work(self) -> None:
+        """Process the work items until Home Assistant stops."""
+        while True:
+            item = await self._queue.get()
+            device_id, prompt = item
+            for job in self._waiting[item]:
+                job.set_running()
+
+            try:
+                response = await self._async_generate(device_id, prompt)
+            except CancelledError:
+                raise
+            except Error as error:
+                for job in self._waiting.pop(item):
+                    job.set_failed(device_id, error)
+            except Exception:  # pylint: disable=broad-except
+                # A failed item must not stop the worker
+                for job in self._waiting.pop(item):
+                    job.set_failed(device_id, ERROR_INTERNAL_SERVER_ERROR)
+            else:
+                for job in self._waiting.pop(item):
+                    job.set_completed(device_id, response)
+            finally:
+                self._queue.task_done()
+
+    # Generates the automation of the device from its current prompt context
+    async def _async_generate(self, device_id: str, prompt: str) -> str:
+        """Generate the automation of the device from its current prompt context."""
+        device = DeviceManager(self._hass, self._config).get_device(device_id)
+        if device is None:
+            raise ERROR_NOT_FOUND.copy()
+
+        chatgpt = self._config.get_chatgpt()
+        context = PromptContextEncoder(chatgpt.get_token_budget()).encode_device(
+            device.with_entities()
+        )
+        return await self._client.async_complete(f"{prompt}\n\n{context.get_text()}")
+
+    # Returns the number of jobs with devices still queued or being processed
+    def _count_unfinished_jobs(self) -> int:
+        """Return the number of jobs with devices still queued or being processed."""
+        return sum(1 for job in self._jobs.values() if not job.is_finished())
+
+    # Drops the oldest finished jobs above the retention limit
+    def _drop_finished_jobs(self) -> None:
+        """Drop the oldest finished jobs above the retention limit."""
+        excess = len(self._jobs) - self._config.get_jobs().get_max_jobs()
+        if excess <= 0:
+            return
+
+        finished = [job_id for job_id, job in self._jobs.items() if job.is_finished()]
+        for job_id in finished[:excess]:
+            del self._jobs[job_id]
+
+    # Cancels the workers when Home Assistant stops
+    @callback
+    def _async_stop(self, event: Event) -> None:
+        """Cancel the workers when Home Assistant stops."""
+        for worker in self._workers:
+            worker.cancel()
+        self._workers = []
@@ -1,8 +1,8 @@
 """Device Manager for the Devices API component."""
 
 from __future__ import annotations
-from typing import List, Dict, Any
-from json import dumps
+from bisect import bisect_right
+from typing import Callable, Iterator, List, Dict, Any, Tuple
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.area_registry import (
     AreaRegistry,
@@ -19,7 +19,22 @@ from homeassistant.helpers.entity_registry import (
     RegistryEntry,
     async_get as async_get_entity_registry,
 )
+from .changes import (
+    CHANGE_TYPE_AREA,
+    CHANGE_TYPE_DEVICE,
+    CHANGE_TYPE_ENTITY,
+    ChangeLog,
+    RegistryChange,
+)
 from .configuration import Configuration
+from .encoder import encode_text
+from .filters import Filters
+from .constants import DOMAIN, INDEX, NO_AREA_ID, CHANGE_LOG, SEARCH_INDEX
+from .index import RegistryIndex
+from .pagination import Page, Pagination, encode_cursor
+from .projection import Projection, Schema
+from .search import SearchIndex
+from .state import EntityStates
 
 
 # Class: Manager
@@ -36,6 +51,8 @@ class Manager:
     _device_registry: DeviceRegistry = None
     # Entity Registry instance
     _entity_registry: EntityRegistry = None
+    # Registry index instance
+    _registry_index: RegistryIndex = None
 
     # Constructor
     def __init__(self, hass: HomeAssistant, config: Configuration) -> None:
@@ -45,6 +62,7 @@ class Manager:
         self._area_registry = async_get_area_registry(hass)
         self._device_registry = async_get_device_registry(hass)
         self._entity_registry = async_get_entity_registry(hass)
+        self._registry_index = hass.data[DOMAIN][INDEX]
 
     # Returns the area registry
     def get_area_registry(self) -> AreaRegistry:
@@ -61,6 +79,11 @@ class Manager:
         """Return the entity registry."""
         return self._entity_registry
 
+    # Returns the registry index
+    def get_registry_index(self) -> RegistryIndex:
+        """Return the registry index."""
+        return self._registry_index
+
     # Returns the HomeAssistant instance
     def get_hass(self) -> HomeAssistant:
         """Return the HomeAssistant instance."""
@@ -71,6 +94,31 @@ class Manager:
         """Return the configuration."""
         return self._config
 
+    # Returns the wrapper of the area, device or entity by type and ID (None when it does not exist or is ignored)
+    def get_object(self, object_type: str, object_id: str) -> Area | Device | Entity | None:
+        """Return the wrapper of the area, device or entity by type and ID."""
+        if object_type == CHANGE_TYPE_AREA:
+            area = self.get_area_registry().async_get_area(object_id)
+            if area is None:
+                return None
+            return Area(
+                area,
+                self.get_device_registry(),
+                self.get_entity_registry(),
+                self.get_registry_index(),
+            )
+
+        if object_type == CHANGE_TYPE_DEVICE:
+            device = self.get_device_registry().async_get(object_id)
+            if device is None:
+                return None
+            return Device(device, self.get_entity_registry(), self.get_registry_index())
+
+        entity = self.get_entity_registry().async_get(object_id)
+        if entity is None or self.get_registry_index().is_ignored_entity(object_id):
+            return None
+        return Entity(entity)
+
 
 # Class: DeviceManager
 class DeviceManager(Manager):
@@ -86,17 +134,185 @@ class DeviceManager(Manager):
                 Device(
                     device,
                     self.get_entity_registry(),
+                    self.get_registry_index(),
                 )
             )
 
         return devices
 
+    # Returns the devices passing the filters, in the area if one is given, ordered by ID
+    def find_devices(
+        self, filters: Filters | None = None, area_id: str | None = None
+    ) -> List[Device]:
+        """Return the devices passing the filters, ordered by ID."""
+        return list(self.iter_devices(filters, area_id))
+
+    # Yields the devices passing the filters one by one, in the area if one is given (for streamed responses)
+    def iter_devices(
+        self, filters: Filters | None = None, area_id: str | None = None
+    ) -> Iterator[Device]:
+        """Yield the devices passing the filters one by one, ordered by ID.
+
+        Only the device IDs are resolved upfront, so the registry can change while
+        the iteration is suspended; devices removed in the meantime are skipped.
+        """
+        for device_id in self.get_registry_index().find_device_ids(filters, area_id):
+            device = self._device_registry.devices.get(device_id)
+            if device is None:
+                continue
+            yield Device(
+                device,
+                self.get_entity_registry(),
+                self.get_registry_index(),
+            )
+
     # Returns the device by ID
-    def get_device(self, device_id: str) -> Device:
+    def get_device(self, device_id: str) -> Device | None:
         """Return the device by ID."""
+        device = self._device_registry.async_get(device_id)
+        if device is None:
+            return None
         return Device(
-            self._device_registry.async_get(device_id),
+            device,
             self.get_entity_registry(),
+            self.get_registry_index(),
+        )
+
+    # Returns the entity by ID
+    def get_entity(self, entity_id: str) -> Entity | None:
+        """Return the entity by ID."""
+        entity = self._entity_registry.async_get(entity_id)
+        if entity is None:
+            return None
+        return Entity(entity)
+
+    # Returns the entities passing the filters, ordered by ID
+    def find_entities(self, filters: Filters | None = None) -> List[Entity]:
+        """Return the entities passing the filters, ordered by ID."""
+        return list(self.iter_entities(filters))
+
+    # Yields the entities passing the filters one by one (for streamed responses)
+    def iter_entities(self, filters: Filters | None = None) -> Iterator[Entity]:
+        """Yield the entities passing the filters one by one, ordered by ID."""
+        for entity_id in self.get_registry_index().find_entity_ids(filters):
+            entity = self._entity_registry.entities.get(entity_id)
+            if entity is not None:
+                yield Entity(entity)
+
+    # Returns the devices in the area (NO_AREA_ID for devices without an area)
+    def get_area_devices(self, area_id: str) -> List[Device]:
+        """Return the devices in the area."""
+        devices: List[Device] = []
+
+        for device in self.get_registry_index().get_area_devices(area_id):
+            devices.append(
+                Device(
+                    device,
+                    self.get_entity_registry(),
+                    self.get_registry_index(),
+                )
+            )
+
+        return devices
+
+    # Resolves the IDs of the devices and of the enabled devices of the areas from the index,
+    # returning them with the IDs of the missing devices and areas
+    def resolve_device_ids(
+        self, device_ids: List[str], area_ids: List[str]
+    ) -> Tuple[List[str], List[str], List[str]]:
+        """Resolve the IDs of the devices and of the enabled devices of the areas from the index."""
+        index = self.get_registry_index()
+        resolved: Dict[str, None] = {}
+        missing_devices: List[str] = []
+        missing_areas: List[str] = []
+
+        for device_id in device_ids:
+            if index.get_device_area(device_id) is None:
+                missing_devices.append(device_id)
+            else:
+                resolved[device_id] = None
+
+        for area_id in area_ids:
+            if area_id != NO_AREA_ID and self._area_registry.async_get_area(area_id) is None:
+                missing_areas.append(area_id)
+                continue
+            for device_id in index.get_area_device_ids(area_id):
+                if not index.is_disabled_device(device_id):
+                    resolved.setdefault(device_id)
+
+        return list(resolved), missing_devices, missing_areas
+
+    # Resolves the devices by ID and the enabled devices of the areas in one pass,
+    # returning the devices with their entities loaded and the IDs of the missing devices and areas
+    def get_devices_batch(
+        self, device_ids: List[str], area_ids: List[str]
+    ) -> Tuple[List[Device], List[str], List[str]]:
+        """Resolve the devices and the devices of the areas in one pass."""
+        index = self.get_registry_index()
+        resolved, missing_devices, missing_areas = self.resolve_device_ids(
+            device_ids, area_ids
+        )
+
+        devices: List[Device] = []
+        for device_id in resolved:
+            device = self._device_registry.devices.get(device_id)
+            if device is None:
+                continue
+            devices.append(
+                Device(
+                    device,
+                    self.get_entity_registry(),
+                    index,
+                ).with_entities()
+            )
+
+        return devices, missing_devices, missing_areas
+
+    # Returns a page of enabled devices (of the devices passing the filters if any) ordered by ID,
+    # in the area if one is given
+    def get_devices_page(
+        self,
+        pagination: Pagination,
+        area_id: str | None = None,
+        filters: Filters | None = None,
+    ) -> Page:
+        """Return a page of devices ordered by ID."""
+        index = self.get_registry_index()
+        if filters is None:
+            device_ids, has_more = index.get_enabled_device_ids_page(
+                pagination.get_after(),
+                pagination.get_limit(),
+                area_id,
+            )
+            total = index.count_enabled_devices(area_id)
+        else:
+            matching_ids = index.find_device_ids(filters, area_id)
+            start = 0
+            if pagination.get_after() is not None:
+                start = bisect_right(matching_ids, pagination.get_after())
+            device_ids = matching_ids[start:start + pagination.get_limit()]
+            has_more = start + pagination.get_limit() < len(matching_ids)
+            total = len(matching_ids)
+        devices: List[Device] = []
+
+        for device_id in device_ids:
+            # The index is updated after the registry, so a device removed just before may still be listed
+            device_entry = self._device_registry.devices.get(device_id)
+            if device_entry is None:
+                continue
+            devices.append(
+                Device(
+                    device_entry,
+                    self.get_entity_registry(),
+                    index,
+                )
+            )
+
+        return Page(
+            devices,
+            pagination.get_limit(),
+            encode_cursor(device_ids[-1]) if has_more else None,
+            total,
         )
 
 
@@ -104,22 +320,29 @@ class DeviceManager(Manager):
 class Device:
     """Device class."""
 
+    # Fixed attribute layout (no per-instance __dict__, a wrapper is created per device per request)
+    __slots__ = ("_entry", "_entity_registry", "_registry_index", "_entities")
+
     # Device entry
     _entry: DeviceEntry
     # Entity registry
     _entity_registry: EntityRegistry
-    # Entities list
-    _entities: List[Entity] = []
+    # Registry index
+    _registry_index: RegistryIndex
+    # Entities list (loaded by with_entities)
+    _entities: List[Entity]
 
     # Constructor
     def __init__(
         self,
         device_entry: DeviceEntry,
         entity_registry: EntityRegistry,
+        registry_index: RegistryIndex,
     ) -> None:
         """Constructor."""
         self._entry = device_entry
         self._entity_registry = entity_registry
+        self._registry_index = registry_index
         self._entities = []
 
     # Returns the device ID
@@ -174,17 +397,23 @@ class Device:
         """Return the entity registry."""
         return self._entity_registry
 
+    # Returns the registry index
+    def get_registry_index(self) -> RegistryIndex:
+        """Return the registry index."""
+        return self._registry_index
+
     # Loads list of entities for the device
     def with_entities(self) -> Device:
         """Load list of entities for the device."""
 
-        for entity_entry in self.get_entity_registry().entities.values():
-            if entity_entry.device_id == self.get_id():
-                self._entities.append(
-                    Entity(
-                        entity_entry,
-                    )
+        for entity_entry in self.get_registry_index().get_device_entities(
+            self.get_id()
+        ):
+            self._entities.append(
+                Entity(
+                    entity_entry,
                 )
+            )
 
         return self
 
@@ -193,9 +422,15 @@ class Device:
         """Return list of entities for the device."""
         return self._entities
 
-    # Returns the device as a dictionary
-    def as_dict(self) -> dict:
+    # Returns the device as a dictionary, with only the projected fields if a projection is given
+    # (and the live data of the entities if requested)
+    def as_dict(
+        self, projection: Projection | None = None, states: EntityStates | None = None
+    ) -> dict:
         """Return the device as a dictionary."""
+        if projection is not None:
+            return self._as_projected_dict(projection, states)
+
         dictionary: Dict[str, Any] = {
             "id": self.get_id(),
             "name": self.get_name(),
@@ -210,15 +445,35 @@ class Device:
 
         if len(self._entities) > 0:
             dictionary["entities"] = [
-                entity.as_dict() for entity in self.get_entities()
+                entity.as_dict(states=states) for entity in self.get_entities()
             ]
 
         return dictionary
 
+    # Returns the projected fields of the device as a dictionary
+    def _as_projected_dict(
+        self, projection: Projection, states: EntityStates | None = None
+    ) -> dict:
+        """Return the projected fields of the device as a dictionary."""
+        dictionary: Dict[str, Any] = {}
+
+        for field in projection.get_fields():
+            if field == "entities":
+                if len(self._entities) == 0:
+                    self.with_entities()
+                dictionary[field] = [
+                    entity.as_dict(projection.get_nested(field), states)
+                    for entity in self.get_entities()
+                ]
+            else:
+                dictionary[field] = DEVICE_GETTERS[field](self)
+
+        return dictionary
+
     # Returns the device as a JSON string
     def as_json(self) -> str:
         """Return the device as a JSON string."""
-        return dumps(self.as_dict(), indent=4)
+        return encode_text(self.as_dict(), pretty=True)
 
     # Returns the device as a string
     def __str__(self) -> str:
@@ -230,6 +485,9 @@ class Device:
 class Entity:
     """Entity class."""
 
+    # Fixed attribute layout (no per-instance __dict__)
+    __slots__ = ("_entry",)
+
     # Entity entry
     _entry: RegistryEntry
 
@@ -303,9 +561,21 @@ class Entity:
             return []
         return self._entry.capabilities
 
-    # Converts the entity to a dictionary
-    def as_dict(self) -> dict:
+    # Converts the entity to a dictionary, with only the projected fields if a projection is given
+    # (and its live data if requested)
+    def as_dict(
+        self, projection: Projection | None = None, states: EntityStates | None = None
+    ) -> dict:
         """Convert the entity to a dictionary."""
+        if projection is not None:
+            dictionary = {
+                field: ENTITY_GETTERS[field](self)
+                for field in projection.get_fields()
+            }
+            if states is not None:
+                dictionary.update(states.get_fields(self.get_id()))
+            return dictionary
+
         dictionary: Dict[str, Any] = {
             "id": self.get_id(),
             "unique_id": self.get_unique_id(),
@@ -319,12 +589,15 @@ class Entity:
             "capabilities": self.get_capabilities(),
         }
 
+        if states is not None:
+            dictionary.update(states.get_fields(self.get_id()))
+
         return dictionary
 
     # Converts the entity to a JSON string
     def as_json(self) -> str:
         """Convert the entity to a JSON string."""
-        return dumps(self.as_dict(), indent=4)
+        return encode_text(self.as_dict(), pretty=True)
 
     # Converts the entity to a string
     def __str__(self) -> str:
@@ -347,6 +620,7 @@ class AreaManager(Manager):
                     area,
                     self.get_device_registry(),
                     self.get_entity_registry(),
+                    self.get_registry_index(),
                 )
             )
 
@@ -362,6 +636,7 @@ class AreaManager(Manager):
             area,
             self.get_device_registry(),
             self.get_entity_registry(),
+            self.get_registry_index(),
         )
 
 
@@ -369,12 +644,17 @@ class AreaManager(Manager):
 class Area:
     """Area class."""
 
+    # Fixed attribute layout (no per-instance __dict__)
+    __slots__ = ("_entry", "_device_registry", "_entity_registry", "_registry_index")
+
     # Area entry
     _entry: AreaEntry
     # Device registry
     _device_registry: DeviceRegistry
     # Entity registry
     _entity_registry: EntityRegistry
+    # Registry index
+    _registry_index: RegistryIndex
 
     # Constructor
     def __init__(
@@ -382,11 +662,13 @@ class Area:
         area_entry: AreaEntry,
         device_registry: DeviceRegistry,
         entity_registry: EntityRegistry,
+        registry_index: RegistryIndex,
     ) -> None:
         """Constructor."""
         self._entry = area_entry
         self._device_registry = device_registry
         self._entity_registry = entity_registry
+        self._registry_index = registry_index
 
     # Returns the area ID
     def get_id(self) -> str:
@@ -413,20 +695,25 @@ class Area:
         """Return the list of devices in the area."""
         devices: List[Device] = []
 
-        for device in self._device_registry.devices.values():
-            if device.area_id == self.get_id():
-                devices.append(
-                    Device(
-                        device,
-                        self._entity_registry,
-                    )
+        for device in self._registry_index.get_area_devices(self.get_id()):
+            devices.append(
+                Device(
+                    device,
+                    self._entity_registry,
+                    self._registry_index,
                 )
+            )
 
         return devices
 
-    # Converts the area to a dictionary
-    def as_dict(self) -> dict:
+    # Converts the area to a dictionary, with only the projected fields if a projection is given
+    def as_dict(self, projection: Projection | None = None) -> dict:
         """Convert the area to a dictionary."""
+        if projection is not None:
+            return {
+                field: AREA_GETTERS[field](self) for field in projection.get_fields()
+            }
+
         dictionary: Dict[str, Any] = {
             "id": self.get_id(),
             "name": self.get_name(),
@@ -439,9 +726,220 @@ class Area:
     # Converts the area to a JSON string
     def as_json(self) -> str:
         """Convert the area to a JSON string."""
-        return dumps(self.as_dict(), indent=4)
+        return encode_text(self.as_dict(), pretty=True)
 
     # Converts the area to a string
     def __str__(self) -> str:
         """Convert the area to a string."""
         return self.as_json()
+
+
+# Class: SnapshotManager
+class SnapshotManager(Manager):
+    """Snapshot Manager class."""
+
+    # Returns the whole area -> device -> entity tree, grouped by area
+    def get_snapshot(
+        self, projection: Projection | None = None, states: EntityStates | None = None
+    ) -> Dict[str, Any]:
+        """Return the whole area -> device -> entity tree, grouped by area.
+
+        Every area, device and entity is visited once, through the registry index,
+        so the build is O(A + D + E) and its peak memory is the whole response tree
+        (about 400 bytes per entity), plus its encoded body. The registries are never
+        copied. Streamed snapshots (see iter_areas) hold one area at a time: their
+        peak memory is about the largest area subtree and its encoded body.
+        """
+        return {
+            "revision": self.get_registry_index().get_revision(),
+            "areas": list(self.iter_areas(projection, states)),
+        }
+
+    # Yields the areas of the tree one by one, each with its devices (for streamed snapshots)
+    def iter_areas(
+        self, projection: Projection | None = None, states: EntityStates | None = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield the areas of the tree one by one, each with its devices.
+
+        Only the area IDs are resolved upfront, so the registries can change while
+        the iteration is suspended; areas removed in the meantime are skipped.
+        Devices without an area come last, under the NO_AREA_ID pseudo area.
+        """
+        if projection is None:
+            projection = Projection.from_schema(DEVICE_SCHEMA)
+
+        area_registry = self.get_area_registry()
+        for area_id in list(area_registry.areas):
+            area_entry = area_registry.async_get_area(area_id)
+            if area_entry is None:
+                continue
+            area = Area(
+                area_entry,
+                self.get_device_registry(),
+                self.get_entity_registry(),
+                self.get_registry_index(),
+            ).as_dict()
+            area["devices"] = self._get_area_devices(area_id, projection, states)
+            yield area
+
+        yield {
+            "id": NO_AREA_ID,
+            "name": None,
+            "normalized_name": None,
+            "picture": None,
+            "devices": self._get_area_devices(NO_AREA_ID, projection, states),
+        }
+
+    # Returns the projected devices of the area
+    def _get_area_devices(
+        self, area_id: str, projection: Projection, states: EntityStates | None
+    ) -> List[Dict[str, Any]]:
+        """Return the projected devices of the area."""
+        devices: List[Dict[str, Any]] = []
+
+        for device in self.get_registry_index().get_area_devices(area_id):
+            devices.append(
+                Device(
+                    device,
+                    self.get_entity_registry(),
+                    self.get_registry_index(),
+                ).as_dict(projection, states)
+            )
+
+        return devices
+
+
+# Class: ChangesManager
+class ChangesManager(Manager):
+    """Changes Manager class."""
+
+    # Returns the change log
+    def get_change_log(self) -> ChangeLog:
+        """Return the change log."""
+        return self._hass.data[DOMAIN][CHANGE_LOG]
+
+    # Returns the changes made after the revision, with the current state of every changed object
+    def get_changes_since(self, revision: int) -> Dict[str, Any]:
+        """Return the changes made after the revision."""
+        current_revision = self.get_registry_index().get_revision()
+        changes = self.get_change_log().get_since(revision, current_revision)
+
+        if changes is None:
+            return {
+                "revision": current_revision,
+                "resync_required": True,
+                "changes": [],
+            }
+
+        return {
+            "revision": current_revision,
+            "resync_required": False,
+            "changes": [self.serialize_change(change) for change in changes],
+        }
+
+    # Returns the change as a dictionary, with the current state of the changed object under "data"
+    def serialize_change(
+        self, change: RegistryChange, projection: Projection | None = None
+    ) -> Dict[str, Any]:
+        """Return the change as a dictionary, with the current state of the changed object."""
+        dictionary = change.as_dict()
+        dictionary["data"] = None
+
+        if change.get_action() == "remove":
+            return dictionary
+
+        changed = self.get_changed_object(change)
+        if changed is not None:
+            dictionary["data"] = changed.as_dict(projection)
+
+        return dictionary
+
+    # Returns the current wrapper of the changed object (None once it is removed)
+    def get_changed_object(self, change: RegistryChange) -> Area | Device | Entity | None:
+        """Return the current wrapper of the changed object."""
+        return self.get_object(change.get_type(), change.get_id())
+
+
+# Class: SearchManager
+class SearchManager(Manager):
+    """Search Manager class."""
+
+    # Returns the search index
+    def get_search_index(self) -> SearchIndex:
+        """Return the search index."""
+        return self._hass.data[DOMAIN][SEARCH_INDEX]
+
+    # Returns up to `limit` areas, devices and entities whose names match the query, best first
+    def search(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        """Return the areas, devices and entities whose names match the query, best first."""
+        index = self.get_registry_index()
+        results: List[Dict[str, Any]] = []
+
+        # Ignored entities are skipped inside the search, so they do not take the place of other matches
+        def accept(document: Tuple[str, str]) -> bool:
+            return document[0] != CHANGE_TYPE_ENTITY or not index.is_ignored_entity(document[1])
+
+        for object_type, object_id, score in self.get_search_index().search(
+            query, limit, accept
+        ):
+            found = self.get_object(object_type, object_id)
+            if found is None:
+                continue
+            results.append(
+                {
+                    "type": object_type,
+                    "id": object_id,
+                    "name": found.get_name(),
+                    "score": score,
+                }
+            )
+
+        return results
+
+
+# Getters of the serialized entity fields, in output order
+ENTITY_GETTERS: Dict[str, Callable[[Entity], Any]] = {
+    "id": Entity.get_id,
+    "unique_id": Entity.get_unique_id,
+    "name": Entity.get_name,
+    "category": Entity.get_category,
+    "icon": Entity.get_icon,
+    "device_id": Entity.get_device_id,
+    "device_class": Entity.get_device_class,
+    "platform": Entity.get_platform,
+    "unit_of_measurement": Entity.get_unit_of_measurement,
+    "capabilities": Entity.get_capabilities,
+}
+
+# Getters of the serialized device fields, in output order ("entities" is handled by the device)
+DEVICE_GETTERS: Dict[str, Callable[[Device], Any]] = {
+    "id": Device.get_id,
+    "name": Device.get_name,
+    "manufacturer": Device.get_manufacturer,
+    "model": Device.get_model,
+    "area": Device.get_area,
+    "hw_version": Device.get_hw_version,
+    "sw_version": Device.get_sw_version,
+    "disabled": Device.is_disabled,
+    "type": Device.get_type,
+}
+
+# Getters of the serialized area fields, in output order
+AREA_GETTERS: Dict[str, Callable[[Area], Any]] = {
+    "id": Area.get_id,
+    "name": Area.get_name,
+    "normalized_name": Area.get_normalized_name,
+    "picture": Area.get_picture,
+}
+
+# Selectable entity fields
+ENTITY_SCHEMA = Schema(tuple(ENTITY_GETTERS))
+
+# Selectable device fields
+DEVICE_SCHEMA = Schema(
+    tuple(DEVICE_GETTERS) + ("entities",),
+    {"entities": ENTITY_SCHEMA},
+)
+
+# Selectable area fields
+AREA_SCHEMA = Schema(tuple(AREA_GETTERS))
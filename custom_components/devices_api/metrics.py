@@ -0,0 +1,274 @@
+"""Request metrics for the Devices API component."""
+
+from __future__ import annotations
+from asyncio import CancelledError
+from bisect import bisect_left
+from functools import wraps
+from time import perf_counter
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+from aiohttp.web import HTTPException, Request, StreamResponse
+from .cache import ResponseCache
+from .coalescing import RequestCoalescer
+
+# Request key of the per-request phase timings.
+REQUEST_TIMINGS = "devices_api_timings"
+# Request latency buckets, in seconds.
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+# Response size buckets, in bytes.
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+# Phases reported in the Server-Timing header.
+PHASE_LOOKUP = "lookup"
+PHASE_SERIALIZE = "serialize"
+PHASE_ENCODE = "encode"
+# Status recorded for the requests the client cancelled before the response was sent.
+STATUS_CLIENT_CLOSED = 499
+# Status recorded for the requests whose handler raised.
+STATUS_SERVER_ERROR = 500
+
+
+# Class: Histogram
+class Histogram:
+    """Prometheus histogram with fixed buckets."""
+
+    # Upper bounds of the buckets
+    _buckets: Tuple[float, ...]
+    # Observations per bucket (the last one is +Inf), not cumulative
+    _counts: List[int]
+    # Sum of the observations
+    _sum: float
+    # Number of observations
+    _count: int
+
+    # Constructor
+    def __init__(self, buckets: Tuple[float, ...]) -> None:
+        """Constructor."""
+        self._buckets = buckets
+        self._counts = [0] * (len(buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+
+    # Records an observation
+    def observe(self, value: float) -> None:
+        """Record an observation."""
+        self._counts[bisect_left(self._buckets, value)] += 1
+        self._sum += value
+        self._count += 1
+
+    # Returns the histogram samples in the Prometheus text format
+    def render(self, name: str, labels: str) -> List[str]:
+        """Return the histogram samples in the Prometheus text format."""
+        lines: List[str] = []
+        cumulative = 0
+
+        for bound, count in zip(self._buckets, self._counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {self._count}')
+        lines.append(f"{name}_sum{{{labels}}} {self._sum}")
+        lines.append(f"{name}_count{{{labels}}} {self._count}")
+
+        return lines
+
+
+# Class: EndpointMetrics
+class EndpointMetrics:
+    """Counters and histograms of a single view."""
+
+    # Status code -> Number of responses
+    _responses: Dict[int, int]
+    # Request latency histogram
+    _latency: Histogram
+    # Response body size histogram
+    _size: Histogram
+    # Serialize (registry lookups and object serialization) phase histogram
+    _serialize: Histogram
+    # Encode phase histogram
+    _encode: Histogram
+
+    # Constructor
+    def __init__(self) -> None:
+        """Constructor."""
+        self._responses = {}
+        self._latency = Histogram(LATENCY_BUCKETS)
+        self._size = Histogram(SIZE_BUCKETS)
+        self._serialize = Histogram(LATENCY_BUCKETS)
+        self._encode = Histogram(LATENCY_BUCKETS)
+
+    # Records a handled request (without latency for the long-lived streams)
+    def observe(
+        self,
+        status: int,
+        latency: float | None,
+        size: int | None,
+        timings: RequestTimings,
+    ) -> None:
+        """Record a handled request."""
+        self._responses[status] = self._responses.get(status, 0) + 1
+        if latency is not None:
+            self._latency.observe(latency)
+        if size is not None:
+            self._size.observe(size)
+
+        serialize = timings.get(PHASE_SERIALIZE)
+        if serialize is not None:
+            self._serialize.observe(serialize)
+        encode = timings.get(PHASE_ENCODE)
+        if encode is not None:
+            self._encode.observe(encode)
+
+    # Returns the samples in the Prometheus text format, grouped by metric name
+    def render(self, labels: str) -> Dict[str, List[str]]:
+        """Return the samples in the Prometheus text format, grouped by metric name."""
+        return {
+            "devices_api_requests_total": [
+                f'devices_api_requests_total{{{labels},status="{status}"}} {count}'
+                for status, count in sorted(self._responses.items())
+            ],
+            "devices_api_request_duration_seconds": self._latency.render(
+                "devices_api_request_duration_seconds", labels
+            ),
+            "devices_api_response_size_bytes": self._size.render(
+                "devices_api_response_size_bytes", labels
+            ),
+            "devices_api_serialize_duration_seconds": self._serialize.render(
+                "devices_api_serialize_duration_seconds", labels
+            ),
+            "devices_api_encode_duration_seconds": self._encode.render(
+                "devices_api_encode_duration_seconds", labels
+            ),
+        }
+
+
+# Class: RequestTimings
+class RequestTimings:
+    """Durations of the phases of a single request, reported in the Server-Timing header."""
+
+    # Phase -> Duration in seconds
+    _phases: Dict[str, float]
+
+    # Constructor
+    def __init__(self) -> None:
+        """Constructor."""
+        self._phases = {}
+
+    # Adds the duration to the phase
+    def add(self, phase: str, duration: float) -> None:
+        """Add the duration to the phase."""
+        self._phases[phase] = self._phases.get(phase, 0.0) + duration
+
+    # Returns the duration of the phase (None when the request did not go through it)
+    def get(self, phase: str) -> float | None:
+        """Return the duration of the phase."""
+        return self._phases.get(phase)
+
+    # Returns the Server-Timing header value, with the total duration
+    def as_header(self, total: float) -> str:
+        """Return the Server-Timing header value."""
+        entries = [
+            f"{phase};dur={duration * 1000:.3f}"
+            for phase, duration in self._phases.items()
+        ]
+        entries.append(f"total;dur={total * 1000:.3f}")
+        return ", ".join(entries)
+
+
+# Class: Metrics
+class Metrics:
+    """Per-view request metrics, rendered in the Prometheus text format."""
+
+    # View name -> Metrics (allocated when the view is instrumented)
+    _endpoints: Dict[str, EndpointMetrics]
+
+    # Constructor
+    def __init__(self) -> None:
+        """Constructor."""
+        self._endpoints = {}
+
+    # Wraps the request handlers of the view to record its metrics and add the Server-Timing header
+    # (the requests of long-lived views are counted but left out of the latency histogram)
+    def instrument(self, view: Any) -> None:
+        """Wrap the request handlers of the view to record its metrics."""
+        endpoint = self._endpoints.setdefault(view.name, EndpointMetrics())
+        long_lived = getattr(view, "long_lived", False)
+
+        for method in ("get", "post"):
+            handler = getattr(view, method, None)
+            if handler is not None:
+                setattr(view, method, _wrap_handler(handler, endpoint, long_lived))
+
+    # Returns the metrics in the Prometheus text format
+    def render(self, cache: ResponseCache, coalescer: RequestCoalescer) -> str:
+        """Return the metrics in the Prometheus text format."""
+        samples: Dict[str, List[str]] = {}
+        for name, endpoint in sorted(self._endpoints.items()):
+            for metric, lines in endpoint.render(f'endpoint="{name}"').items():
+                samples.setdefault(metric, []).extend(lines)
+
+        lines: List[str] = []
+        for metric, metric_lines in samples.items():
+            kind = "counter" if metric.endswith("_total") else "histogram"
+            lines.append(f"# TYPE {metric} {kind}")
+            lines.extend(metric_lines)
+
+        cache_stats = cache.as_dict()
+        lines.append("# TYPE devices_api_response_cache_hits_total counter")
+        lines.append(f"devices_api_response_cache_hits_total {cache_stats['hits']}")
+        lines.append("# TYPE devices_api_response_cache_misses_total counter")
+        lines.append(f"devices_api_response_cache_misses_total {cache_stats['misses']}")
+        lines.append("# TYPE devices_api_response_cache_entries gauge")
+        lines.append(f"devices_api_response_cache_entries {cache_stats['entries']}")
+        lines.append("# TYPE devices_api_response_cache_bytes gauge")
+        lines.append(f"devices_api_response_cache_bytes {cache_stats['size']}")
+        lines.append("# TYPE devices_api_responses_computed_total counter")
+        lines.append(f"devices_api_responses_computed_total {coalescer.get_computed()}")
+        lines.append("# TYPE devices_api_requests_coalesced_total counter")
+        lines.append(f"devices_api_requests_coalesced_total {coalescer.get_coalesced()}")
+
+        return "\n".join(lines) + "\n"
+
+
+# Returns the phase timings of the request (None when the metrics are disabled)
+def get_request_timings(request: Request) -> RequestTimings | None:
+    """Return the phase timings of the request."""
+    return request.get(REQUEST_TIMINGS)
+
+
+# Wraps the request handler to record the metrics of its requests
+# (raised HTTP errors with their status, cancelled requests as 499 and other exceptions as 500)
+def _wrap_handler(
+    handler: Callable[..., Awaitable[StreamResponse]],
+    endpoint: EndpointMetrics,
+    long_lived: bool = False,
+) -> Callable[..., Awaitable[StreamResponse]]:
+    """Wrap the request handler to record the metrics of its requests."""
+
+    @wraps(handler)
+    async def instrumented(request: Request, *args: Any, **kwargs: Any) -> StreamResponse:
+        timings = RequestTimings()
+        request[REQUEST_TIMINGS] = timings
+        started = perf_counter()
+        response: StreamResponse | None = None
+        status = STATUS_SERVER_ERROR
+
+        try:
+            response = await handler(request, *args, **kwargs)
+            status = response.status
+        except HTTPException as error:
+            status = error.status
+            raise
+        except CancelledError:
+            status = STATUS_CLIENT_CLOSED
+            raise
+        finally:
+            total = perf_counter() - started
+            body = getattr(response, "body", None)
+            size = len(body) if isinstance(body, bytes) else None
+            endpoint.observe(status, None if long_lived else total, size, timings)
+
+        # Streamed responses have already sent their headers
+        if not response.prepared:
+            response.headers["Server-Timing"] = timings.as_header(total)
+
+        return response
+
+    return instrumented
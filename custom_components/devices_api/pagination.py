@@ -0,0 +1,154 @@
+"""Pagination for the Devices API component."""
+
+from __future__ import annotations
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from typing import Any, Dict, List
+from aiohttp.web import Request
+from .errors import ERROR_INVALID_CURSOR, ERROR_INVALID_LIMIT
+
+# Page size used when only a cursor is given.
+DEFAULT_PAGE_LIMIT = 100
+# Largest accepted page size.
+MAX_PAGE_LIMIT = 1000
+
+
+# Class: Pagination
+class Pagination:
+    """Requested page: its size and the ID the page starts after."""
+
+    # Maximum number of items in the page
+    _limit: int
+    # ID of the last item of the previous page
+    _after: str | None
+
+    # Constructor
+    def __init__(self, limit: int = DEFAULT_PAGE_LIMIT, after: str | None = None) -> None:
+        """Constructor."""
+        self._limit = limit
+        self._after = after
+
+    # Returns the maximum number of items in the page
+    def get_limit(self) -> int:
+        """Return the maximum number of items in the page."""
+        return self._limit
+
+    # Returns the ID of the last item of the previous page
+    def get_after(self) -> str | None:
+        """Return the ID of the last item of the previous page."""
+        return self._after
+
+    # Creates the pagination from the `limit` and `cursor` query parameters (None when neither is given)
+    @staticmethod
+    def from_request(request: Request) -> Pagination | None:
+        """Create the pagination from the request, raising an Error on invalid parameters."""
+        limit = request.query.get("limit")
+        cursor = request.query.get("cursor")
+
+        if limit is None and cursor is None:
+            return None
+
+        return Pagination(
+            limit=_parse_limit(limit),
+            after=decode_cursor(cursor) if cursor else None,
+        )
+
+
+# Class: Page
+class Page:
+    """Page of items, with the cursor of the next page."""
+
+    # Items of the page
+    _items: List[Any]
+    # Maximum number of items in the page
+    _limit: int
+    # Cursor of the next page (None on the last page)
+    _next_cursor: str | None
+    # Total number of items across all pages
+    _total: int
+
+    # Constructor
+    def __init__(
+        self,
+        items: List[Any],
+        limit: int,
+        next_cursor: str | None,
+        total: int,
+    ) -> None:
+        """Constructor."""
+        self._items = items
+        self._limit = limit
+        self._next_cursor = next_cursor
+        self._total = total
+
+    # Returns the items of the page
+    def get_items(self) -> List[Any]:
+        """Return the items of the page."""
+        return self._items
+
+    # Returns the cursor of the next page
+    def get_next_cursor(self) -> str | None:
+        """Return the cursor of the next page."""
+        return self._next_cursor
+
+    # Returns the total number of items across all pages
+    def get_total(self) -> int:
+        """Return the total number of items across all pages."""
+        return self._total
+
+    # Returns a copy of the page holding the given items (e.g. the serialized ones)
+    def with_items(self, items: List[Any]) -> Page:
+        """Return a copy of the page holding the given items."""
+        return Page(items, self._limit, self._next_cursor, self._total)
+
+    # Returns the pagination metadata as a dictionary
+    def pagination_as_dict(self) -> Dict[str, Any]:
+        """Return the pagination metadata as a dictionary."""
+        return {
+            "limit": self._limit,
+            "next_cursor": self._next_cursor,
+            "total": self._total,
+        }
+
+    # Returns the page as a response dictionary
+    def as_response_dict(self) -> Dict[str, Any]:
+        """Return the page as a response dictionary."""
+        return {
+            "data": [
+                item.as_dict() if hasattr(item, "as_dict") else item
+                for item in self._items
+            ],
+            "pagination": self.pagination_as_dict(),
+        }
+
+
+# Encodes the ID of the last item of a page into an opaque cursor
+def encode_cursor(after: str) -> str:
+    """Encode the ID of the last item of a page into an opaque cursor."""
+    return urlsafe_b64encode(after.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+# Decodes an opaque cursor into the ID of the last item of a page
+def decode_cursor(cursor: str) -> str:
+    """Decode an opaque cursor into the ID of the last item of a page."""
+    try:
+        return urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+    except (BinasciiError, ValueError):
+        raise ERROR_INVALID_CURSOR.copy()
+
+
+# Parses the page size
+def _parse_limit(limit: str | None) -> int:
+    """Parse the page size."""
+    if limit is None:
+        return DEFAULT_PAGE_LIMIT
+
+    try:
+        value = int(limit)
+    except ValueError:
+        raise ERROR_INVALID_LIMIT.copy()
+
+    if value < 1 or value > MAX_PAGE_LIMIT:
+        raise ERROR_INVALID_LIMIT.copy()
+
+    return value
@@ -0,0 +1,276 @@
+"""On-demand request profiling for the Devices API component."""
+
+from __future__ import annotations
+import tracemalloc
+from asyncio import Lock
+from cProfile import Profile
+from functools import wraps
+from os.path import basename
+from pstats import Stats
+from time import perf_counter
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+from aiohttp.web import Request, Response, StreamResponse
+from homeassistant.components.http.const import KEY_HASS_USER
+from .errors import ERROR_FORBIDDEN, ERROR_INVALID_PROFILE, ERROR_PROFILER_BUSY
+from .http import is_pretty_requested, is_stream_requested, respond
+
+# Request key of the profiling mode of a profiled request.
+REQUEST_PROFILE = "devices_api_profile"
+# Query parameter selecting the profiling mode.
+PROFILE_PARAMETER = "profile"
+# Query parameter selecting the report format.
+PROFILE_FORMAT_PARAMETER = "profile_format"
+# CPU profiling mode (cProfile).
+PROFILE_CPU = "cpu"
+# Memory profiling mode (tracemalloc).
+PROFILE_MEMORY = "mem"
+# JSON report format.
+FORMAT_JSON = "json"
+# Collapsed stacks report format (one `frame;frame;frame value` line per stack, for flame graphs).
+FORMAT_COLLAPSED = "collapsed"
+# Number of frames kept per allocation traceback.
+MEMORY_TRACEBACK_FRAMES = 32
+# Largest number of callers followed when rebuilding a CPU stack.
+MAX_STACK_DEPTH = 64
+
+# Function key in the cProfile statistics: (file, line, function name)
+FunctionKey = Tuple[str, int, str]
+
+
+# Class: Profiler
+class Profiler:
+    """Runs single requests under cProfile or tracemalloc and responds with the report."""
+
+    # Serializes the profiled requests (the profilers are process-wide)
+    _lock: Lock
+    # Largest number of functions or allocation sites in a report
+    _max_entries: int
+
+    # Constructor
+    def __init__(self, max_entries: int = 50) -> None:
+        """Constructor."""
+        self._lock = Lock()
+        self._max_entries = max_entries
+
+    # Wraps the request handlers of the view to profile the requests asking for it
+    def instrument(self, view: Any) -> None:
+        """Wrap the request handlers of the view to profile the requests asking for it."""
+        for method in ("get", "post"):
+            handler = getattr(view, method, None)
+            if handler is not None:
+                setattr(view, method, self._wrap_handler(handler))
+
+    # Returns the handler wrapped to profile the requests asking for it
+    def _wrap_handler(
+        self, handler: Callable[..., Awaitable[StreamResponse]]
+    ) -> Callable[..., Awaitable[StreamResponse]]:
+        """Return the handler wrapped to profile the requests asking for it."""
+
+        @wraps(handler)
+        async def profiled(request: Request, *args: Any, **kwargs: Any) -> StreamResponse:
+            mode = request.query.get(PROFILE_PARAMETER)
+            if mode is None:
+                return await handler(request, *args, **kwargs)
+
+            user = request.get(KEY_HASS_USER)
+            if user is None or not user.is_admin:
+                return ERROR_FORBIDDEN.as_http_response()
+
+            report_format = request.query.get(PROFILE_FORMAT_PARAMETER, FORMAT_JSON)
+            if (
+                mode not in (PROFILE_CPU, PROFILE_MEMORY)
+                or report_format not in (FORMAT_JSON, FORMAT_COLLAPSED)
+                or is_stream_requested(request)
+            ):
+                return ERROR_INVALID_PROFILE.as_http_response()
+
+            if self._lock.locked():
+                return ERROR_PROFILER_BUSY.as_http_response()
+
+            async with self._lock:
+                request[REQUEST_PROFILE] = mode
+                if mode == PROFILE_CPU:
+                    return await self._profile_cpu(
+                        request, report_format, handler, *args, **kwargs
+                    )
+                return await self._profile_memory(
+                    request, report_format, handler, *args, **kwargs
+                )
+
+        return profiled
+
+    # Runs the request under cProfile and responds with the slowest functions
+    async def _profile_cpu(
+        self,
+        request: Request,
+        report_format: str,
+        handler: Callable[..., Awaitable[StreamResponse]],
+        *args: Any,
+        **kwargs: Any,
+    ) -> StreamResponse:
+        """Run the request under cProfile and respond with the slowest functions."""
+        profile = Profile()
+        started = perf_counter()
+        profile.enable()
+        try:
+            response = await handler(request, *args, **kwargs)
+        finally:
+            profile.disable()
+        duration = perf_counter() - started
+
+        if response.status != 200:
+            return response
+
+        stats = Stats(profile).stats
+        if report_format == FORMAT_COLLAPSED:
+            return _respond_collapsed(_collapse_cpu_stacks(stats), PROFILE_CPU)
+
+        functions = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)
+        return respond(
+            {
+                "profile": PROFILE_CPU,
+                "duration": round(duration, 6),
+                "functions": [
+                    {
+                        "function": function,
+                        "file": file,
+                        "line": line,
+                        "calls": calls,
+                        "primitive_calls": primitive_calls,
+                        "total_time": round(total_time, 6),
+                        "cumulative_time": round(cumulative_time, 6),
+                    }
+                    for (file, line, function), (
+                        primitive_calls,
+                        calls,
+                        total_time,
+                        cumulative_time,
+                        _,
+                    ) in functions[: self._max_entries]
+                ],
+            },
+            pretty=is_pretty_requested(request),
+        )
+
+    # Runs the request under tracemalloc and responds with the largest allocation sites
+    async def _profile_memory(
+        self,
+        request: Request,
+        report_format: str,
+        handler: Callable[..., Awaitable[StreamResponse]],
+        *args: Any,
+        **kwargs: Any,
+    ) -> StreamResponse:
+        """Run the request under tracemalloc and respond with the largest allocation sites.
+
+        Only the blocks still allocated when the request ends are reported, along
+        with the peak of the traced memory.
+        """
+        # Leave a tracing started by someone else (e.g. PYTHONTRACEMALLOC) running
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start(MEMORY_TRACEBACK_FRAMES)
+        tracemalloc.reset_peak()
+        started = perf_counter()
+        try:
+            response = await handler(request, *args, **kwargs)
+            duration = perf_counter() - started
+            _, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot().filter_traces(
+                [tracemalloc.Filter(False, tracemalloc.__file__)]
+            )
+        finally:
+            if not was_tracing:
+                tracemalloc.stop()
+
+        if response.status != 200:
+            return response
+
+        if report_format == FORMAT_COLLAPSED:
+            return _respond_collapsed(
+                [
+                    (
+                        ";".join(
+                            f"{basename(frame.filename)}:{frame.lineno}"
+                            for frame in statistic.traceback
+                        ),
+                        statistic.size,
+                    )
+                    for statistic in snapshot.statistics("traceback")
+                ],
+                PROFILE_MEMORY,
+            )
+
+        return respond(
+            {
+                "profile": PROFILE_MEMORY,
+                "duration": round(duration, 6),
+                "peak": peak,
+                "allocations": [
+                    {
+                        "file": statistic.traceback[-1].filename,
+                        "line": statistic.traceback[-1].lineno,
+                        "size": statistic.size,
+                        "count": statistic.count,
+                    }
+                    for statistic in snapshot.statistics("lineno")[: self._max_entries]
+                ],
+            },
+            pretty=is_pretty_requested(request),
+        )
+
+
+# Returns the profiling mode of the request (None when it is not profiled)
+def get_request_profile(request: Request) -> str | None:
+    """Return the profiling mode of the request."""
+    return request.get(REQUEST_PROFILE)
+
+
+# Rebuilds the CPU stacks from the cProfile caller graph, following the heaviest caller of each function
+def _collapse_cpu_stacks(stats: Dict[FunctionKey, Tuple]) -> List[Tuple[str, int]]:
+    """Rebuild the CPU stacks from the cProfile caller graph.
+
+    cProfile only records caller -> callee edges, so the own time of every
+    function is attributed to the stack made of its heaviest callers.
+    """
+    stacks: List[Tuple[str, int]] = []
+
+    for function, (_, _, total_time, _, _) in stats.items():
+        microseconds = int(total_time * 1_000_000)
+        if microseconds == 0:
+            continue
+
+        frames = [function]
+        current = function
+        while len(frames) < MAX_STACK_DEPTH:
+            callers = stats.get(current, (0, 0, 0.0, 0.0, {}))[4]
+            if not callers:
+                break
+            current = max(callers.items(), key=lambda item: item[1][3])[0]
+            if current in frames:
+                break
+            frames.append(current)
+
+        stacks.append(
+            (
+                ";".join(
+                    f"{name} ({basename(file)}:{line})"
+                    for file, line, name in reversed(frames)
+                ),
+                microseconds,
+            )
+        )
+
+    return stacks
+
+
+# Responds with the collapsed stacks as a downloadable text file
+def _respond_collapsed(stacks: List[Tuple[str, int]], mode: str) -> Response:
+    """Respond with the collapsed stacks as a downloadable text file."""
+    return Response(
+        text="".join(f"{stack} {value}\n" for stack, value in stacks if value > 0),
+        content_type="text/plain",
+        headers={
+            "Content-Disposition": f'attachment; filename="devices_api-{mode}.folded"'
+        },
+    )
@@ -0,0 +1,120 @@
+"""Field projection for the Devices API component."""
+
+from __future__ import annotations
+from functools import lru_cache
+from typing import Dict, Tuple
+from .errors import ERROR_UNKNOWN_FIELD
+
+
+# Class: Schema
+class Schema:
+    """Selectable fields of a serialized object, in output order."""
+
+    # Field names
+    _fields: Tuple[str, ...]
+    # Schemas of the nested fields
+    _nested: Dict[str, Schema]
+
+    # Constructor
+    def __init__(self, fields: Tuple[str, ...], nested: Dict[str, Schema] = None) -> None:
+        """Constructor."""
+        self._fields = fields
+        self._nested = nested or {}
+
+    # Returns the field names
+    def get_fields(self) -> Tuple[str, ...]:
+        """Return the field names."""
+        return self._fields
+
+    # Returns the schema of the nested field (None for plain fields)
+    def get_nested(self, field: str) -> Schema | None:
+        """Return the schema of the nested field."""
+        return self._nested.get(field)
+
+
+# Class: Projection
+class Projection:
+    """Compiled field selection, applied while serializing."""
+
+    # Selected field names, in schema order
+    _fields: Tuple[str, ...]
+    # Projections of the selected nested fields
+    _nested: Dict[str, Projection]
+
+    # Constructor
+    def __init__(self, fields: Tuple[str, ...], nested: Dict[str, Projection] = None) -> None:
+        """Constructor."""
+        self._fields = fields
+        self._nested = nested or {}
+
+    # Returns the selected field names
+    def get_fields(self) -> Tuple[str, ...]:
+        """Return the selected field names."""
+        return self._fields
+
+    # Returns TRUE if the field is selected
+    def includes(self, field: str) -> bool:
+        """Return TRUE if the field is selected."""
+        return field in self._fields
+
+    # Returns the projection of the nested field
+    def get_nested(self, field: str) -> Projection | None:
+        """Return the projection of the nested field."""
+        return self._nested.get(field)
+
+    # Creates the projection selecting every field of the schema
+    @staticmethod
+    def from_schema(schema: Schema) -> Projection:
+        """Create the projection selecting every field of the schema."""
+        return Projection(
+            schema.get_fields(),
+            {
+                field: Projection.from_schema(schema.get_nested(field))
+                for field in schema.get_fields()
+                if schema.get_nested(field) is not None
+            },
+        )
+
+
+# Compiles the `fields` query parameter (e.g. "id,name,entities.id") against the schema
+def compile_fields(fields: str, schema: Schema) -> Projection:
+    """Compile the field selection against the schema, raising an Error on unknown fields."""
+    return _compile(
+        tuple(sorted({field.strip() for field in fields.split(",") if field.strip()})),
+        schema,
+    )
+
+
+# Compiles the normalized field selection, once per distinct selection
+@lru_cache(maxsize=128)
+def _compile(fields: Tuple[str, ...], schema: Schema) -> Projection:
+    """Compile the normalized field selection."""
+    selected = set()
+    nested_fields: Dict[str, list] = {}
+
+    for field in fields:
+        name, _, rest = field.partition(".")
+        if name not in schema.get_fields():
+            raise ERROR_UNKNOWN_FIELD.copy()
+
+        nested_schema = schema.get_nested(name)
+        if rest and nested_schema is None:
+            raise ERROR_UNKNOWN_FIELD.copy()
+
+        selected.add(name)
+        if nested_schema is not None:
+            nested_fields.setdefault(name, [])
+            if rest:
+                nested_fields[name].append(rest)
+
+    nested: Dict[str, Projection] = {}
+    for name, subfields in nested_fields.items():
+        if subfields:
+            nested[name] = _compile(tuple(subfields), schema.get_nested(name))
+        else:
+            nested[name] = Projection.from_schema(schema.get_nested(name))
+
+    return Projection(
+        tuple(field for field in schema.get_fields() if field in selected),
+        nested,
+    )
@@ -0,0 +1,204 @@
+"""Compact, token-budgeted device context for the ChatGPT prompts."""
+
+from __future__ import annotations
+from enum import Enum
+from math import ceil
+from re import compile as compile_regex
+from typing import Any, Dict, List, Tuple
+from .manager import Device, Entity
+
+# Entity categories from the most to the least relevant (uncategorized entities come first).
+CATEGORY_RANKS = {None: 0, "config": 1, "diagnostic": 2}
+# Entity table columns: (header, getter), the entity ID always comes first.
+ENTITY_COLUMNS: Tuple[Tuple[str, Any], ...] = (
+    ("name", Entity.get_name),
+    ("class", Entity.get_device_class),
+    ("unit", Entity.get_unit_of_measurement),
+    ("capabilities", Entity.get_capabilities),
+    ("category", Entity.get_category),
+)
+# Runs of letters, runs of digits and single symbols, as counted by the token estimator.
+_TOKEN_PIECES = compile_regex(r"[^\W\d_]+|\d+|[^\w\s]|_")
+
+
+# Class: PromptContext
+class PromptContext:
+    """Device context encoded for a prompt."""
+
+    # Encoded context
+    _text: str
+    # Estimated number of tokens of the context
+    _tokens: int
+    # Number of entities left out to fit the token budget
+    _omitted_entities: int
+
+    # Constructor
+    def __init__(self, text: str, tokens: int, omitted_entities: int) -> None:
+        """Constructor."""
+        self._text = text
+        self._tokens = tokens
+        self._omitted_entities = omitted_entities
+
+    # Returns the encoded context
+    def get_text(self) -> str:
+        """Return the encoded context."""
+        return self._text
+
+    # Returns the estimated number of tokens of the context
+    def get_tokens(self) -> int:
+        """Return the estimated number of tokens of the context."""
+        return self._tokens
+
+    # Returns the number of entities left out to fit the token budget
+    def get_omitted_entities(self) -> int:
+        """Return the number of entities left out to fit the token budget."""
+        return self._omitted_entities
+
+    # Returns the context as a dictionary
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the context as a dictionary."""
+        return {
+            "context": self._text,
+            "tokens": self._tokens,
+            "omitted_entities": self._omitted_entities,
+        }
+
+
+# Class: PromptContextEncoder
+class PromptContextEncoder:
+    """Encodes devices as compact prompt context within a token budget.
+
+    The device fields are written once as `key: value` lines, and the entities
+    as a `|`-separated table without the device ID, unique ID and icon. Null
+    fields and all-empty columns are left out, a platform shared by every
+    entity moves to the device lines, and the device name is stripped from the
+    entity names. Entities are kept most relevant first (uncategorized, then
+    configuration, then diagnostic) while they fit the budget; an entity that
+    does not fit is skipped, so the smaller ones ranked after it may still fit.
+    The device lines are always kept, even when they alone exceed the budget.
+    """
+
+    # Largest estimated number of tokens of a context
+    _token_budget: int
+
+    # Constructor
+    def __init__(self, token_budget: int) -> None:
+        """Constructor."""
+        self._token_budget = token_budget
+
+    # Returns the largest estimated number of tokens of a context
+    def get_token_budget(self) -> int:
+        """Return the largest estimated number of tokens of a context."""
+        return self._token_budget
+
+    # Encodes the device and its entities
+    def encode_device(self, device: Device) -> PromptContext:
+        """Encode the device and its entities."""
+        entities = device.get_entities()
+        platforms = {entity.get_platform() for entity in entities}
+        shared_platform = platforms.pop() if len(platforms) == 1 else None
+
+        lines = [
+            f"{key}: {_format_cell(value)}"
+            for key, value in (
+                ("device", device.get_name()),
+                ("id", device.get_id()),
+                ("manufacturer", device.get_manufacturer()),
+                ("model", device.get_model()),
+                ("area", device.get_area()),
+                ("hw_version", device.get_hw_version()),
+                ("sw_version", device.get_sw_version()),
+                ("type", device.get_type()),
+                ("platform", shared_platform),
+                ("disabled", "yes" if device.is_disabled() else None),
+            )
+            if value not in (None, "")
+        ]
+        if not entities:
+            text = "\n".join(lines)
+            return PromptContext(text, estimate_tokens(text), 0)
+
+        columns: List[Tuple[str, Any]] = [("id", Entity.get_id)]
+        if shared_platform is None:
+            columns.append(("platform", Entity.get_platform))
+        columns.extend(ENTITY_COLUMNS)
+
+        cells = [
+            [_format_cell(getter(entity)) for _, getter in columns]
+            for entity in entities
+        ]
+        name_column = len(columns) - len(ENTITY_COLUMNS)
+        name_prefix = (device.get_name() or "").casefold() + " "
+        for row in cells:
+            if row[name_column].casefold().startswith(name_prefix):
+                row[name_column] = row[name_column][len(name_prefix):]
+
+        # Columns that are empty for every entity are left out
+        kept_columns = [
+            position
+            for position in range(len(columns))
+            if any(row[position] for row in cells)
+        ]
+        lines.append("entities:")
+        lines.append("|".join(columns[position][0] for position in kept_columns))
+        rows = ["|".join(row[position] for position in kept_columns) for row in cells]
+
+        # Every row also costs its line break, and the device lines are always kept
+        costs = [estimate_tokens(row) + 1 for row in rows]
+        available = self._token_budget - estimate_tokens("\n".join(lines))
+        if sum(costs) > available:
+            available -= estimate_tokens(f"\n({len(rows)} more entities omitted)")
+
+        kept = [False] * len(rows)
+        ranked = sorted(
+            range(len(entities)),
+            key=lambda position: (
+                CATEGORY_RANKS.get(entities[position].get_category(), 1),
+                position,
+            ),
+        )
+        for position in ranked:
+            if costs[position] > available:
+                continue
+            available -= costs[position]
+            kept[position] = True
+
+        omitted = kept.count(False)
+        lines.extend(row for position, row in enumerate(rows) if kept[position])
+        if omitted:
+            lines.append(f"({omitted} more entities omitted)")
+
+        text = "\n".join(lines)
+        return PromptContext(text, estimate_tokens(text), omitted)
+
+
+# Estimates the number of tokens of the text for a BPE tokenizer (about 4 letters or 3 digits per token)
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens of the text."""
+    tokens = 0
+    for piece in _TOKEN_PIECES.findall(text):
+        if piece.isdigit():
+            tokens += ceil(len(piece) / 3)
+        elif len(piece) > 1:
+            tokens += ceil(len(piece) / 4)
+        else:
+            tokens += 1
+    return tokens
+
+
+# Formats the value as a table cell (empty for nulls, without the table and line separators)
+def _format_cell(value: Any) -> str:
+    """Format the value as a table cell."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "yes" if value else "no"
+    if isinstance(value, dict):
+        return ";".join(
+            f"{key}={_format_cell(item)}" for key, item in value.items() if item is not None
+        )
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return ",".join(_format_cell(item) for item in value)
+    if isinstance(value, Enum):
+        value = value.value
+    return str(value).replace("|", "/").replace("\n", " ")
@@ -1,24 +1,77 @@
 """Router for the Devices API component."""
 
 from __future__ import annotations
-from typing import List
-from aiohttp.web import Request, Response
+from asyncio import TimeoutError, wait_for
+from typing import Any, Callable, Iterable, List, Set, Tuple
+from aiohttp import hdrs
+from aiohttp.web import Request, Response, StreamResponse
 from homeassistant.core import HomeAssistant
 from homeassistant.components.http import HomeAssistantView
 from .helpers import (
     build_view_name,
     build_url,
     get_hass_from_request,
+    get_job_queue_from_request,
+    get_metrics_from_request,
     get_config_from_request,
     get_area_manager_from_request,
+    get_chatgpt_client_from_request,
+    get_changes_manager_from_request,
+    get_event_broker_from_request,
     get_device_manager_from_request,
+    get_snapshot_manager_from_request,
+    get_state_cache_from_request,
+    get_search_manager_from_request,
+    get_registry_index_from_request,
+    get_request_coalescer_from_request,
+    get_response_cache_from_request,
+    is_client_allowed,
     is_component_enabled,
 )
-from .http import respond
-from .manager import AreaManager, DeviceManager
+from .http import (
+    respond,
+    respond_cached,
+    respond_stream,
+    is_pretty_requested,
+    is_stream_requested,
+)
+from .manager import (
+    AreaManager,
+    ChangesManager,
+    Device,
+    DeviceManager,
+    SearchManager,
+    SnapshotManager,
+    AREA_SCHEMA,
+    DEVICE_SCHEMA,
+    ENTITY_SCHEMA,
+)
 from .configuration import Configuration
-from .errors import ERROR_METHOD_NOT_ALLOWED_DISABLED, ERROR_NOT_FOUND
-from .helpers import dictionary_with
+from .encoder import encode
+from .errors import (
+    Error,
+    ERROR_BAD_REQUEST,
+    ERROR_BATCH_TOO_LARGE,
+    ERROR_CHATGPT_NOT_CONFIGURED,
+    ERROR_INVALID_BUDGET,
+    ERROR_FORBIDDEN,
+    ERROR_INVALID_LIMIT,
+    ERROR_INVALID_PROMPT,
+    ERROR_INVALID_QUERY,
+    ERROR_INVALID_REVISION,
+    ERROR_METHOD_NOT_ALLOWED_DISABLED,
+    ERROR_METRICS_DISABLED,
+    ERROR_NOT_FOUND,
+)
+from .filters import Filters
+from .pagination import Pagination
+from .projection import Projection, Schema, compile_fields
+from .constants import DOMAIN, METRICS, NO_AREA_ID, PROFILER
+from .events import KEEPALIVE_PAYLOAD
+from .metrics import get_request_timings
+from .profiling import get_request_profile
+from .prompt import PromptContextEncoder
+from .state import EntityStates
 
 
 # Class: Router
@@ -47,9 +100,16 @@ class Router:
             self.add_route(route)
 
     # Registers the routes in the HomeAssistant instance
+    # (instrumented only when the profiling or the metrics are enabled)
     def register(self):
         """Register the routes in the HomeAssistant instance."""
+        profiler = self._hass.data[DOMAIN].get(PROFILER)
+        metrics = self._hass.data[DOMAIN].get(METRICS)
         for route in self._routes:
+            if profiler is not None and route.profilable:
+                profiler.instrument(route)
+            if metrics is not None:
+                metrics.instrument(route)
             self._hass.http.register_view(route)
 
 
@@ -57,6 +117,12 @@ class Router:
 class DevicesAPIRouter(HomeAssistantView):
     """Base class for the Devices API component routes."""
 
+    # Whether the requests can be profiled (`?profile=cpu|mem`) when the profiling is enabled
+    profilable = True
+
+    # Whether the requests last as long as the client stays connected (left out of the latency metrics)
+    long_lived = False
+
     # Returns the configuration of the component
     @staticmethod
     def _get_configuration(request: Request) -> Configuration:
@@ -77,11 +143,103 @@ class DevicesAPIRouter(HomeAssistantView):
     def _get_area_manager(request: Request) -> AreaManager:
         return get_area_manager_from_request(request)
 
+    # Returns the SnapshotManager instance from the Request object
+    @staticmethod
+    def _get_snapshot_manager(request: Request) -> SnapshotManager:
+        return get_snapshot_manager_from_request(request)
+
+    # Returns the ChangesManager instance from the Request object
+    @staticmethod
+    def _get_changes_manager(request: Request) -> ChangesManager:
+        return get_changes_manager_from_request(request)
+
+    # Returns the SearchManager instance from the Request object
+    @staticmethod
+    def _get_search_manager(request: Request) -> SearchManager:
+        return get_search_manager_from_request(request)
+
     # Returns TRUE if component is enabled in the configuration (from the Request object)
     @staticmethod
     def _is_component_enabled(request: Request) -> bool:
         return is_component_enabled(request)
 
+    # Returns TRUE if the client address is allowed by the configuration (from the Request object)
+    @staticmethod
+    def _is_client_allowed(request: Request) -> bool:
+        return is_client_allowed(request)
+
+    # Returns the error response when the component is disabled or the client is not allowed
+    # (checked before any manager is built)
+    @staticmethod
+    def _check_access(request: Request) -> Response | None:
+        if not is_component_enabled(request):
+            return ERROR_METHOD_NOT_ALLOWED_DISABLED.as_http_response()
+        if not is_client_allowed(request):
+            return ERROR_FORBIDDEN.as_http_response()
+        return None
+
+    # Returns the projection compiled from the `fields` query parameter (the default one when it is missing)
+    @staticmethod
+    def _get_projection(
+        request: Request, schema: Schema, default: Projection | None = None
+    ) -> Projection | None:
+        fields = request.query.get("fields")
+        if not fields:
+            return default
+        return compile_fields(fields, schema)
+
+    # Responds with the cached body for the current registry revision, calling the builder on a cache miss
+    # (profiled requests always build and encode on the event loop, so that the profile covers them)
+    @staticmethod
+    async def _respond_cached(request: Request, builder: Callable[[], Any]) -> Response:
+        if get_request_profile(request) is not None:
+            return respond(builder(), pretty=is_pretty_requested(request))
+
+        return await respond_cached(
+            request,
+            get_response_cache_from_request(request),
+            get_registry_index_from_request(request).get_revision(),
+            builder,
+            compression=get_config_from_request(request).get_compression(),
+            coalescer=get_request_coalescer_from_request(request),
+            timings=get_request_timings(request),
+        )
+
+    # Responds with freshly built data (bypassing the response cache, for responses holding live entity states)
+    @staticmethod
+    def _respond_live(request: Request, builder: Callable[[], Any]) -> Response:
+        return respond(builder(), pretty=is_pretty_requested(request))
+
+    # Returns the live entity data selected by the `include` query parameter (None when it is missing)
+    @staticmethod
+    def _get_entity_states(request: Request) -> EntityStates | None:
+        return EntityStates.from_request(request, get_state_cache_from_request(request))
+
+    # Returns the device as a dictionary, with its entities loaded when their live data is included
+    @staticmethod
+    def _device_as_dict(
+        device: Device, projection: Projection | None, states: EntityStates | None
+    ) -> dict:
+        if states is not None:
+            device.with_entities()
+        return device.as_dict(projection, states)
+
+    # Streams the serialized items in chunks (bypassing the response cache)
+    @staticmethod
+    async def _respond_stream(
+        request: Request,
+        items: Iterable[Any],
+        serializer: Callable[[Any], Any],
+        **kwargs: Any,
+    ) -> StreamResponse:
+        return await respond_stream(
+            request,
+            items,
+            serializer,
+            compression=get_config_from_request(request).get_compression(),
+            **kwargs,
+        )
+
 
 # Class: DevicesAPIDevicesListView
 class DevicesAPIDevicesListView(DevicesAPIRouter, HomeAssistantView):
@@ -97,17 +255,135 @@ class DevicesAPIDevicesListView(DevicesAPIRouter, HomeAssistantView):
     async def get(self, request: Request) -> Response:
         """Return the list of devices."""
 
-        if not self._is_component_enabled(request):
-            return ERROR_METHOD_NOT_ALLOWED_DISABLED.as_http_response()
+        rejection = self._check_access(request)
+        if rejection is not None:
+            return rejection
+
+        try:
+            pagination = Pagination.from_request(request)
+            projection = self._get_projection(request, DEVICE_SCHEMA)
+            filters = Filters.from_request(request)
+            states = self._get_entity_states(request)
+        except Error as error:
+            return error.as_http_response()
+
+        if pagination is None and is_stream_requested(request):
+            return await self._respond_stream(
+                request,
+                self._get_device_manager(request).iter_devices(filters),
+                lambda device: self._device_as_dict(device, projection, states),
+            )
+
+        if states is not None:
+            return self._respond_live(
+                request,
+                lambda: self._build(request, pagination, projection, filters, states),
+            )
 
+        return await self._respond_cached(
+            request, lambda: self._build(request, pagination, projection, filters)
+        )
+
+    # Builds the list of devices (a page of it when pagination is requested)
+    def _build(
+        self,
+        request: Request,
+        pagination: Pagination | None,
+        projection: Projection | None,
+        filters: Filters | None,
+        states: EntityStates | None = None,
+    ) -> Any:
+        """Build the list of devices."""
         device_manager = self._get_device_manager(request)
+        if pagination is not None:
+            page = device_manager.get_devices_page(pagination, None, filters)
+            return page.with_items(
+                [
+                    self._device_as_dict(device, projection, states)
+                    for device in page.get_items()
+                ]
+            )
+
+        if filters is not None:
+            return [
+                self._device_as_dict(device, projection, states)
+                for device in device_manager.find_devices(filters)
+            ]
+
         devices = []
 
         for device in device_manager.get_devices():
             if not device.is_disabled():
-                devices.append(device.as_dict())
+                devices.append(self._device_as_dict(device, projection, states))
+
+        return devices
+
+
+# Class: DevicesAPIDevicesBatchView
+class DevicesAPIDevicesBatchView(DevicesAPIRouter, HomeAssistantView):
+    """View to handle the Devices API component batch device information."""
+
+    # URL path
+    url = build_url("devices/batch")
+
+    # Name of the view
+    name = build_view_name("devices:batch")
+
+    # Largest number of device and area IDs accepted in one request
+    _max_ids = 1000
+
+    # Returns the information of the requested devices and of the devices in the requested areas
+    async def post(self, request: Request) -> Response:
+        """Return the information of the requested devices and of the devices in the requested areas."""
+
+        rejection = self._check_access(request)
+        if rejection is not None:
+            return rejection
+
+        try:
+            projection = self._get_projection(request, DEVICE_SCHEMA)
+            device_ids, area_ids = await self._parse_body(request)
+        except Error as error:
+            return error.as_http_response()
+
+        device_manager = self._get_device_manager(request)
+        devices, missing_devices, missing_areas = device_manager.get_devices_batch(
+            device_ids, area_ids
+        )
+
+        return respond(
+            {
+                "devices": [device.as_dict(projection) for device in devices],
+                "missing": {
+                    "devices": missing_devices,
+                    "areas": missing_areas,
+                },
+            },
+            pretty=is_pretty_requested(request),
+        )
+
+    # Parses the device and area IDs from the request body
+    async def _parse_body(self, request: Request) -> Tuple[List[str], List[str]]:
+        """Parse the device and area IDs from the request body."""
+        try:
+            body = await request.json()
+        except ValueError:
+            raise ERROR_BAD_REQUEST.copy()
+
+        if not isinstance(body, dict):
+            raise ERROR_BAD_REQUEST.copy()
+
+        device_ids = body.get("devices", [])
+        area_ids = body.get("areas", [])
 
-        return respond(devices)
+        for ids in (device_ids, area_ids):
+            if not isinstance(ids, list) or not all(isinstance(i, str) for i in ids):
+                raise ERROR_BAD_REQUEST.copy()
+
+        if len(device_ids) + len(area_ids) > self._max_ids:
+            raise ERROR_BATCH_TOO_LARGE.copy()
+
+        return device_ids, area_ids
 
 
 # Class: DevicesAPIDeviceInformationView
@@ -124,12 +400,130 @@ class DevicesAPIDeviceInformationView(DevicesAPIRouter, HomeAssistantView):
     async def get(self, request: Request, device_id: str) -> Response:
         """Return the device information."""
 
-        if not self._is_component_enabled(request):
-            return ERROR_METHOD_NOT_ALLOWED_DISABLED.as_http_response()
+        rejection = self._check_access(request)
+        if rejection is not None:
+            return rejection
 
-        device_manager = self._get_device_manager(request)
+        try:
+            projection = self._get_projection(request, DEVICE_SCHEMA)
+            states = self._get_entity_states(request)
+        except Error as error:
+            return error.as_http_response()
+
+        if states is not None:
+            return self._respond_live(
+                request, lambda: self._build(request, device_id, projection, states)
+            )
+
+        return await self._respond_cached(
+            request, lambda: self._build(request, device_id, projection)
+        )
+
+    # Builds the device information
+    def _build(
+        self,
+        request: Request,
+        device_id: str,
+        projection: Projection | None,
+        states: EntityStates | None = None,
+    ) -> dict | None:
+        """Build the device information."""
+        device = self._get_device_manager(request).get_device(device_id)
+        if device is None:
+            return None
+        return device.with_entities().as_dict(projection, states)
+
+
+# Class: DevicesAPIDevicePromptView
+class DevicesAPIDevicePromptView(DevicesAPIRouter, HomeAssistantView):
+    """View to handle the Devices API component device prompt context."""
+
+    # URL path
+    url = build_url("devices/{device_id}/prompt", True)
+
+    # Name of the view
+    name = build_view_name("devices:device:prompt")
+
+    # Returns the compact prompt context of the device, within the token budget
+    async def get(self, request: Request, device_id: str) -> Response:
+        """Return the compact prompt context of the device, within the token budget."""
+
+        rejection = self._check_access(request)
+        if rejection is not None:
+            return rejection
+
+        budget = self._get_configuration(request).get_chatgpt().get_token_budget()
+        try:
+            budget = int(request.query.get("budget", budget))
+        except ValueError:
+            return ERROR_INVALID_BUDGET.as_http_response()
+        if budget < 1:
+            return ERROR_INVALID_BUDGET.as_http_response()
+
+        return await self._respond_cached(
+            request, lambda: self._build(request, device_id, budget)
+        )
+
+    # Builds the prompt context of the device
+    def _build(self, request: Request, device_id: str, budget: int) -> dict | None:
+        """Build the prompt context of the device."""
+        device = self._get_device_manager(request).get_device(device_id)
+        if device is None:
+            return None
+
+        device.with_entities()
+        dictionary = PromptContextEncoder(budget).encode_device(device).as_dict()
+        dictionary["budget"] = budget
+        return dictionary
+
+
+# Class: DevicesAPIEntitiesListView
+class DevicesAPIEntitiesListView(DevicesAPIRouter, HomeAssistantView):
+    """View to handle the Devices API component entities list."""
+
+    # URL path
+    url = build_url("entities")
+
+    # Name of the view
+    name = build_view_name("entities:list")
+
+    # Returns the list of entities
+    async def get(self, request: Request) -> Response:
+        """Return the list of entities."""
+
+        rejection = self._check_access(request)
+        if rejection is not None:
+            return rejection
 
-        return respond(device_manager.get_device(device_id).with_entities())
+        try:
+            projection = self._get_projection(request, ENTITY_SCHEMA)
+            filters = Filters.from_request(request)
+        except Error as error:
+            return error.as_http_response()
+
+        if is_stream_requested(request):
+            return await self._respond_stream(
+                request,
+                self._get_device_manager(request).iter_entities(filters),
+                lambda entity: entity.as_dict(projection),
+            )
+
+        return await self._respond_cached(
+            request, lambda: self._build(request, projection, filters)
+        )
+
+    # Builds the list of entities
+    def _build(
+        self,
+        request: Request,
+        projection: Projection | None,
+        filters: Filters | None,
+    ) -> List[dict]:
+        """Build the list of entities."""
+        return [
+            entity.as_dict(projection)
+            for entity in self._get_device_manager(request).find_entities(filters)
+        ]
 
 
 # Class: DevicesAPIAreasListView
@@ -142,28 +536,36 @@ class DevicesAPIAreasListView(DevicesAPIRouter, HomeAssistantView):
     # Name of the view
     name = build_view_name("areas:list")
 
+    # Fields returned when no field selection is given
+    _default_projection = compile_fields("id,name", AREA_SCHEMA)
+
     # Returns the list of areas
     async def get(self, request: Request) -> Response:
         """Return the list of areas."""
 
-        if not self._is_component_enabled(request):
-            return ERROR_METHOD_NOT_ALLOWED_DISABLED.as_http_response()
+        rejection = self._check_access(request)
+        if rejection is not None:
+            return rejection
+
+        try:
+            projection = self._get_projection(
+                request, AREA_SCHEMA, self._default_projection
+            )
+        except Error as error:
+            return error.as_http_response()
+
+        return await self._respond_cached(request, lambda: self._build(request, projection))
 
+    # Builds the list of areas
+    def _build(self, request: Request, projection: Projection) -> List[dict]:
+        """Build the list of areas."""
         area_manager = self._get_area_manager(request)
         areas = []
 
         for area in area_manager.get_areas():
-            areas.append(
-                dictionary_with(
-                    area.as_dict(),
-                    [
-                        "id",
-                        "name",
-                    ],
-                )
-            )
+            areas.append(area.as_dict(projection))
 
-        return respond(areas)
+        return areas
 
 
 # Class: DevicesAPIAreaInformationView
@@ -180,12 +582,28 @@ class DevicesAPIAreaInformationView(DevicesAPIRouter, HomeAssistantView):
     async def get(self, request: Request, area_id: str) -> Response:
         """Return the area information."""
 
-        if not self._is_component_enabled(request):
-            return ERROR_METHOD_NOT_ALLOWED_DISABLED.as_http_response()
+        rejection = self._check_access(request)
+        if rejection is not None:
+            return rejection
 
-        area_manager = self._get_area_manager(request)
+        try:
+            projection = self._get_projection(request, AREA_SCHEMA)
+        except Error as error:
+            return error.as_http_response()
 
-        return respond(area_manager.get_area(area_id))
+        return await self._respond_cached(
+            request, lambda: self._build(request, area_id, projection)
+        )
+
+    # Builds the area information
+    def _build(
+        self, request: Request, area_id: str, projection: Projection | None
+    ) -> dict | None:
+        """Build the area information."""
+        area = self._get_area_manager(request).get_area(area_id)
+        if area is None:
+            return None
+        return area.as_dict(projection)
 
 
 # Class: DevicesAPIAreaDevicesListView
@@ -202,18 +620,444 @@ class DevicesAPIAreaDevicesListView(DevicesAPIRouter, HomeAssistantView):
     async def get(self, request: Request, area_id: str) -> Response:
         """Return the list of devices in the area."""
 
-        if not self._is_component_enabled(request):
-            return ERROR_METHOD_NOT_ALLOWED_DISABLED.as_http_response()
+        rejection = self._check_access(request)
+        if rejection is not None:
+            return rejection
 
-        area_manager = self._get_area_manager(request)
-        area = area_manager.get_area(area_id)
-        if area is None:
-            return respond(ERROR_NOT_FOUND)
+        try:
+            pagination = Pagination.from_request(request)
+            projection = self._get_projection(request, DEVICE_SCHEMA)
+            filters = Filters.from_request(request)
+            states = self._get_entity_states(request)
+        except Error as error:
+            return error.as_http_response()
+
+        if pagination is None and is_stream_requested(request):
+            if area_id != NO_AREA_ID:
+                if self._get_area_manager(request).get_area(area_id) is None:
+                    return ERROR_NOT_FOUND.as_http_response()
+            return await self._respond_stream(
+                request,
+                self._get_device_manager(request).iter_devices(filters, area_id),
+                lambda device: self._device_as_dict(device, projection, states),
+            )
+
+        if states is not None:
+            return self._respond_live(
+                request,
+                lambda: self._build(
+                    request, area_id, pagination, projection, filters, states
+                ),
+            )
+
+        return await self._respond_cached(
+            request,
+            lambda: self._build(request, area_id, pagination, projection, filters),
+        )
+
+    # Builds the list of devices in the area (a page of it when pagination is requested)
+    def _build(
+        self,
+        request: Request,
+        area_id: str,
+        pagination: Pagination | None,
+        projection: Projection | None,
+        filters: Filters | None,
+        states: EntityStates | None = None,
+    ) -> Any:
+        """Build the list of devices in the area."""
+        if area_id != NO_AREA_ID:
+            area_manager = self._get_area_manager(request)
+            if area_manager.get_area(area_id) is None:
+                return ERROR_NOT_FOUND
+
+        device_manager = self._get_device_manager(request)
+        if pagination is not None:
+            page = device_manager.get_devices_page(pagination, area_id, filters)
+            return page.with_items(
+                [
+                    self._device_as_dict(device, projection, states)
+                    for device in page.get_items()
+                ]
+            )
+
+        if filters is not None:
+            return [
+                self._device_as_dict(device, projection, states)
+                for device in device_manager.find_devices(filters, area_id)
+            ]
 
         devices = []
 
-        for device in area.get_devices():
-            if device.get_area() == area_id and not device.is_disabled():
-                devices.append(device.as_dict())
+        for device in device_manager.get_area_devices(area_id):
+            if not device.is_disabled():
+                devices.append(self._device_as_dict(device, projection, states))
+
+        return devices
+
+
+# Class: DevicesAPISnapshotView
+class DevicesAPISnapshotView(DevicesAPIRouter, HomeAssistantView):
+    """View to handle the Devices API component topology snapshot."""
+
+    # URL path
+    url = build_url("snapshot")
+
+    # Name of the view
+    name = build_view_name("snapshot")
+
+    # Returns the whole area -> device -> entity tree (streamed one area at a time if requested)
+    async def get(self, request: Request) -> Response:
+        """Return the whole area -> device -> entity tree."""
+
+        rejection = self._check_access(request)
+        if rejection is not None:
+            return rejection
+
+        try:
+            projection = self._get_projection(request, DEVICE_SCHEMA)
+            states = self._get_entity_states(request)
+        except Error as error:
+            return error.as_http_response()
+
+        if is_stream_requested(request):
+            snapshot_manager = self._get_snapshot_manager(request)
+            revision = snapshot_manager.get_registry_index().get_revision()
+            return await self._respond_stream(
+                request,
+                snapshot_manager.iter_areas(projection, states),
+                lambda area: area,
+                chunk_size=1,
+                head=b'{"data":{"revision":' + encode(revision) + b',"areas":[',
+                tail=b"]}}",
+            )
+
+        if states is not None:
+            return self._respond_live(
+                request,
+                lambda: self._get_snapshot_manager(request).get_snapshot(
+                    projection, states
+                ),
+            )
+
+        return await self._respond_cached(
+            request,
+            lambda: self._get_snapshot_manager(request).get_snapshot(projection),
+        )
+
+
+# Class: DevicesAPIChangesView
+class DevicesAPIChangesView(DevicesAPIRouter, HomeAssistantView):
+    """View to handle the Devices API component registry change feed."""
+
+    # URL path
+    url = build_url("changes")
+
+    # Name of the view
+    name = build_view_name("changes")
+
+    # Returns the registry changes made after the `since` revision
+    async def get(self, request: Request) -> Response:
+        """Return the registry changes made after the `since` revision."""
+
+        rejection = self._check_access(request)
+        if rejection is not None:
+            return rejection
+
+        try:
+            since = int(request.query["since"])
+        except (KeyError, ValueError):
+            return ERROR_INVALID_REVISION.as_http_response()
+
+        return await self._respond_cached(
+            request,
+            lambda: self._get_changes_manager(request).get_changes_since(since),
+        )
+
+
+# Class: DevicesAPISearchView
+class DevicesAPISearchView(DevicesAPIRouter, HomeAssistantView):
+    """View to handle the Devices API component name search."""
+
+    # URL path
+    url = build_url("search")
+
+    # Name of the view
+    name = build_view_name("search")
+
+    # Default number of results
+    _default_limit: int = 20
+
+    # Maximum number of results
+    _max_limit: int = 100
+
+    # Returns the areas, devices and entities whose names match the `q` query
+    async def get(self, request: Request) -> Response:
+        """Return the areas, devices and entities whose names match the `q` query."""
+
+        rejection = self._check_access(request)
+        if rejection is not None:
+            return rejection
+
+        query = request.query.get("q", "").strip()
+        if not query:
+            return ERROR_INVALID_QUERY.as_http_response()
+
+        try:
+            limit = int(request.query.get("limit", self._default_limit))
+        except ValueError:
+            return ERROR_INVALID_LIMIT.as_http_response()
+        if limit < 1 or limit > self._max_limit:
+            return ERROR_INVALID_LIMIT.as_http_response()
+
+        return await self._respond_cached(
+            request,
+            lambda: self._get_search_manager(request).search(query, limit),
+        )
+
+
+# Class: DevicesAPIJobsView
+class DevicesAPIJobsView(DevicesAPIRouter, HomeAssistantView):
+    """View to handle the Devices API component automation generation job submission."""
+
+    # URL path
+    url = build_url("jobs")
+
+    # Name of the view
+    name = build_view_name("jobs")
+
+    # Queues a job generating the automations of the requested devices and of the devices in the requested areas
+    async def post(self, request: Request) -> Response:
+        """Queue a job generating the automations of the requested devices and areas."""
+
+        rejection = self._check_access(request)
+        if rejection is not None:
+            return rejection
+
+        if not self._get_configuration(request).get_chatgpt().get_api_key():
+            return ERROR_CHATGPT_NOT_CONFIGURED.as_http_response()
+
+        try:
+            prompt, device_ids, area_ids = await self._parse_body(request)
+        except Error as error:
+            return error.as_http_response()
+
+        resolved, missing_devices, missing_areas = self._get_device_manager(
+            request
+        ).resolve_device_ids(device_ids, area_ids)
+        if len(resolved) > self._get_configuration(request).get_jobs().get_max_devices():
+            return ERROR_BATCH_TOO_LARGE.as_http_response()
+
+        try:
+            job = get_job_queue_from_request(request).async_submit(prompt, resolved)
+        except Error as error:
+            return error.as_http_response()
+
+        dictionary = job.as_dict()
+        dictionary["missing"] = {
+            "devices": missing_devices,
+            "areas": missing_areas,
+        }
+        return respond(dictionary, pretty=is_pretty_requested(request))
 
-        return respond(devices)
+    # Parses the prompt and the device and area IDs from the request body
+    async def _parse_body(self, request: Request) -> Tuple[str, List[str], List[str]]:
+        """Parse the prompt and the device and area IDs from the request body."""
+        try:
+            body = await request.json()
+        except ValueError:
+            raise ERROR_BAD_REQUEST.copy()
+
+        if not isinstance(body, dict):
+            raise ERROR_BAD_REQUEST.copy()
+
+        prompt = body.get("prompt")
+        if not isinstance(prompt, str) or not prompt.strip():
+            raise ERROR_INVALID_PROMPT.copy()
+
+        device_ids = body.get("devices", [])
+        area_ids = body.get("areas", [])
+
+        for ids in (device_ids, area_ids):
+            if not isinstance(ids, list) or not all(isinstance(i, str) for i in ids):
+                raise ERROR_BAD_REQUEST.copy()
+
+        return prompt.strip(), device_ids, area_ids
+
+
+# Class: DevicesAPIJobView
+class DevicesAPIJobView(DevicesAPIRouter, HomeAssistantView):
+    """View to handle the Devices API component automation generation job status."""
+
+    # URL path
+    url = build_url("jobs/{job_id}", True)
+
+    # Name of the view
+    name = build_view_name("jobs:job")
+
+    # Returns the progress and results of the job
+    async def get(self, request: Request, job_id: str) -> Response:
+        """Return the progress and results of the job."""
+
+        rejection = self._check_access(request)
+        if rejection is not None:
+            return rejection
+
+        job = get_job_queue_from_request(request).get_job(job_id)
+        if job is None:
+            return ERROR_NOT_FOUND.as_http_response()
+
+        return respond(job.as_dict(), pretty=is_pretty_requested(request))
+
+
+# Class: DevicesAPIStatsView
+class DevicesAPIStatsView(DevicesAPIRouter, HomeAssistantView):
+    """View to handle the Devices API component response statistics."""
+
+    # URL path
+    url = build_url("stats")
+
+    # Name of the view
+    name = build_view_name("stats")
+
+    # Returns the response cache, request coalescing, ChatGPT client, job queue and state cache counters
+    async def get(self, request: Request) -> Response:
+        """Return the component counters."""
+
+        rejection = self._check_access(request)
+        if rejection is not None:
+            return rejection
+
+        return respond(
+            {
+                "revision": get_registry_index_from_request(request).get_revision(),
+                "response_cache": get_response_cache_from_request(request).as_dict(),
+                "requests": get_request_coalescer_from_request(request).as_dict(),
+                "chatgpt": get_chatgpt_client_from_request(request).as_dict(),
+                "jobs": get_job_queue_from_request(request).as_dict(),
+                "states": get_state_cache_from_request(request).as_dict(),
+            },
+            pretty=is_pretty_requested(request),
+        )
+
+
+# Class: DevicesAPIMetricsView
+class DevicesAPIMetricsView(DevicesAPIRouter, HomeAssistantView):
+    """View to handle the Devices API component request metrics."""
+
+    # URL path
+    url = build_url("metrics")
+
+    # Name of the view
+    name = build_view_name("metrics")
+
+    # Returns the request metrics in the Prometheus text format
+    async def get(self, request: Request) -> Response:
+        """Return the request metrics in the Prometheus text format."""
+
+        rejection = self._check_access(request)
+        if rejection is not None:
+            return rejection
+
+        metrics = get_metrics_from_request(request)
+        if metrics is None:
+            return ERROR_METRICS_DISABLED.as_http_response()
+
+        return Response(
+            text=metrics.render(
+                get_response_cache_from_request(request),
+                get_request_coalescer_from_request(request),
+            ),
+            content_type="text/plain",
+            headers={"X-Content-Type-Options": "nosniff"},
+        )
+
+
+# Class: DevicesAPIEventsView
+class DevicesAPIEventsView(DevicesAPIRouter, HomeAssistantView):
+    """View to handle the Devices API component registry change stream."""
+
+    # URL path
+    url = build_url("events")
+
+    # Name of the view
+    name = build_view_name("events")
+
+    # The stream lasts as long as the client stays connected
+    profilable = False
+    long_lived = True
+
+    # Seconds of inactivity after which a keepalive comment is sent
+    _keepalive_interval = 30
+
+    # Streams the registry changes as Server-Sent Events
+    async def get(self, request: Request) -> StreamResponse:
+        """Stream the registry changes as Server-Sent Events."""
+
+        rejection = self._check_access(request)
+        if rejection is not None:
+            return rejection
+
+        try:
+            projection = self._get_projection(request, DEVICE_SCHEMA)
+            last_event_id = self._parse_last_event_id(request)
+        except Error as error:
+            return error.as_http_response()
+
+        # Subscribed before the response is prepared (which yields to the event loop),
+        # so that no change published in the meantime is missed
+        event_broker = get_event_broker_from_request(request)
+        subscriber = event_broker.async_subscribe(
+            projection,
+            self._parse_ids(request, "areas"),
+            self._parse_ids(request, "devices"),
+            last_event_id,
+        )
+
+        response = StreamResponse(
+            headers={
+                hdrs.CONTENT_TYPE: "text/event-stream",
+                hdrs.CACHE_CONTROL: "no-cache",
+            }
+        )
+
+        try:
+            await response.prepare(request)
+            while True:
+                try:
+                    payload = await wait_for(
+                        subscriber.get(), self._keepalive_interval
+                    )
+                except TimeoutError:
+                    payload = KEEPALIVE_PAYLOAD
+
+                if payload is None:
+                    break
+                await response.write(payload)
+        except ConnectionResetError:
+            pass
+        finally:
+            event_broker.async_unsubscribe(subscriber)
+
+        return response
+
+    # Parses the comma separated IDs of the query parameter (None when it is missing)
+    @staticmethod
+    def _parse_ids(request: Request, parameter: str) -> Set[str] | None:
+        """Parse the comma separated IDs of the query parameter."""
+        value = request.query.get(parameter)
+        if not value:
+            return None
+        return {item.strip() for item in value.split(",") if item.strip()}
+
+    # Parses the revision to resume from (Last-Event-ID header)
+    @staticmethod
+    def _parse_last_event_id(request: Request) -> int | None:
+        """Parse the revision to resume from."""
+        last_event_id = request.headers.get(hdrs.LAST_EVENT_ID)
+        if not last_event_id:
+            return None
+        try:
+            return int(last_event_id)
+        except ValueError:
+            raise ERROR_INVALID_REVISION.copy()
@@ -0,0 +1,294 @@
+"""Fuzzy name search index for the Devices API component."""
+
+from __future__ import annotations
+from bisect import bisect_left, insort
+from heapq import heappush, heapreplace, nlargest
+from itertools import islice
+from math import ceil
+from re import compile as compile_regex
+from typing import Callable, Dict, FrozenSet, List, Set, Tuple
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.area_registry import (
+    AreaRegistry,
+    async_get as async_get_area_registry,
+)
+from homeassistant.helpers.device_registry import (
+    DeviceRegistry,
+    async_get as async_get_device_registry,
+)
+from homeassistant.helpers.entity_registry import (
+    EntityRegistry,
+    async_get as async_get_entity_registry,
+)
+from .changes import (
+    CHANGE_TYPE_AREA,
+    CHANGE_TYPE_DEVICE,
+    CHANGE_TYPE_ENTITY,
+    RegistryChange,
+)
+
+# Lowest similarity for a vocabulary token to match a query token.
+MIN_SIMILARITY = 0.3
+# Largest number of vocabulary tokens a query token is expanded to.
+MAX_SIMILAR_TOKENS = 64
+# Largest number of vocabulary tokens scanned for prefix matches.
+MAX_PREFIX_TOKENS = 256
+# Separators between tokens (anything but letters and digits).
+_TOKEN_SEPARATOR = compile_regex(r"[\W_]+")
+
+
+# Class: SearchIndex
+class SearchIndex:
+    """Token index over the area, device and entity names, with a trigram index over its vocabulary.
+
+    Query tokens are matched fuzzily against the vocabulary (through the
+    trigrams), so the cost of a query depends on the size of the vocabulary
+    and of the postings of its most selective token, not on the number of
+    indexed objects.
+    """
+
+    # HomeAssistant instance
+    _hass: HomeAssistant
+    # Area Registry instance
+    _area_registry: AreaRegistry
+    # Device Registry instance
+    _device_registry: DeviceRegistry
+    # Entity Registry instance
+    _entity_registry: EntityRegistry
+    # Document (type, ID) -> Tokens of its searchable texts
+    _documents: Dict[Tuple[str, str], FrozenSet[str]]
+    # Token -> Documents having it
+    _token_documents: Dict[str, Set[Tuple[str, str]]]
+    # Trigram -> Vocabulary tokens having it
+    _trigram_tokens: Dict[str, Set[str]]
+    # Sorted vocabulary tokens (for the prefix matches)
+    _vocabulary: List[str]
+
+    # Constructor
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Constructor."""
+        self._hass = hass
+        self._area_registry = async_get_area_registry(hass)
+        self._device_registry = async_get_device_registry(hass)
+        self._entity_registry = async_get_entity_registry(hass)
+        self._documents = {}
+        self._token_documents = {}
+        self._trigram_tokens = {}
+        self._vocabulary = []
+
+    # Builds the index from a full scan of the registries
+    @callback
+    def async_setup(self) -> None:
+        """Build the index from a full scan of the registries."""
+        self._documents.clear()
+        self._token_documents.clear()
+        self._trigram_tokens.clear()
+        self._vocabulary.clear()
+
+        for area_id in self._area_registry.areas:
+            self._refresh(CHANGE_TYPE_AREA, area_id)
+        for device_id in self._device_registry.devices:
+            self._refresh(CHANGE_TYPE_DEVICE, device_id)
+        for entity_id in self._entity_registry.entities:
+            self._refresh(CHANGE_TYPE_ENTITY, entity_id)
+
+    # Updates the index for the registry change (registry index listener)
+    @callback
+    def async_apply_change(self, change: RegistryChange) -> None:
+        """Update the index for the registry change."""
+        if change.get_old_id() is not None:
+            self._discard((change.get_type(), change.get_old_id()))
+        self._refresh(change.get_type(), change.get_id())
+
+    # Returns up to `limit` documents matching the query (and accepted, when a predicate is given),
+    # as (type, ID, score) ordered by score
+    def search(
+        self,
+        query: str,
+        limit: int,
+        accept: Callable[[Tuple[str, str]], bool] | None = None,
+    ) -> List[Tuple[str, str, float]]:
+        """Return the best documents matching the query, as (type, ID, score).
+
+        Every query token has to match one of the document tokens. Documents are
+        taken from the postings of the most selective query token, its closest
+        vocabulary tokens first, and the scan stops once no remaining document
+        can beat the current results. Documents the `accept` predicate rejects
+        are skipped before scoring, so they never take a place in the results.
+        """
+        query_tokens = sorted(set(tokenize(query)))
+        if not query_tokens:
+            return []
+
+        # Query token -> (vocabulary token -> similarity)
+        matches: List[Dict[str, float]] = []
+        for query_token in query_tokens:
+            similar = self._find_similar_tokens(query_token)
+            if not similar:
+                return []
+            matches.append(similar)
+
+        matches.sort(
+            key=lambda similar: sum(
+                len(self._token_documents[token]) for token in similar
+            )
+        )
+        first, others = matches[0], matches[1:]
+        others_bound = sum(max(similar.values()) for similar in others)
+
+        # Min-heap of the best (score, -token count, document) found so far
+        best: List[Tuple[float, int, Tuple[str, str]]] = []
+        seen: Set[Tuple[str, str]] = set()
+
+        for token, similarity in sorted(first.items(), key=lambda item: -item[1]):
+            if len(best) == limit and best[0][0] >= similarity + others_bound:
+                break
+
+            for document in self._token_documents[token]:
+                if document in seen:
+                    continue
+                seen.add(document)
+                if accept is not None and not accept(document):
+                    continue
+
+                score = similarity
+                tokens = self._documents[document]
+                for similar in others:
+                    matched = max(similar.get(other, 0.0) for other in tokens)
+                    if matched == 0.0:
+                        break
+                    score += matched
+                else:
+                    item = (score, -len(tokens), document)
+                    if len(best) < limit:
+                        heappush(best, item)
+                    elif item > best[0]:
+                        heapreplace(best, item)
+                    else:
+                        continue
+                    if len(best) == limit and best[0][0] >= similarity + others_bound:
+                        break
+
+        best.sort(reverse=True)
+        return [
+            (document[0], document[1], round(score / len(query_tokens), 4))
+            for score, _, document in best
+        ]
+
+    # Returns the vocabulary tokens most similar to the query token, with their similarity
+    def _find_similar_tokens(self, query_token: str) -> Dict[str, float]:
+        """Return the vocabulary tokens most similar to the query token, with their similarity."""
+        similar: Dict[str, float] = {}
+
+        # Tokens the query token is a prefix of rank right after the exact match, closest lengths first
+        position = bisect_left(self._vocabulary, query_token)
+        for token in islice(self._vocabulary, position, position + MAX_PREFIX_TOKENS):
+            if not token.startswith(query_token):
+                break
+            if token == query_token:
+                similar[token] = 1.0
+            else:
+                similar[token] = 0.8 + 0.2 * len(query_token) / len(token)
+
+        # Other tokens are matched on their trigrams: a token with enough shared trigrams
+        # has to be in one of the rarest postings, the other postings only verify it
+        query_trigrams = sorted(
+            get_trigrams(query_token),
+            key=lambda trigram: len(self._trigram_tokens.get(trigram, ())),
+        )
+        min_shared = ceil(MIN_SIMILARITY * len(query_trigrams))
+        candidates: Set[str] = set()
+        for trigram in query_trigrams[: len(query_trigrams) - min_shared + 1]:
+            candidates.update(self._trigram_tokens.get(trigram, ()))
+
+        for token in candidates:
+            if token in similar:
+                continue
+            shared = 0
+            for trigram in query_trigrams:
+                if token in self._trigram_tokens.get(trigram, ()):
+                    shared += 1
+            # Jaccard similarity of the trigram sets (a token has len + 1 padded trigrams)
+            similarity = shared / (len(query_trigrams) + len(token) + 1 - shared)
+            if similarity >= MIN_SIMILARITY:
+                similar[token] = similarity
+
+        if len(similar) > MAX_SIMILAR_TOKENS:
+            similar = dict(
+                nlargest(MAX_SIMILAR_TOKENS, similar.items(), key=lambda item: item[1])
+            )
+        return similar
+
+    # Re-reads the object from its registry and re-indexes it (removing it once it is gone)
+    def _refresh(self, object_type: str, object_id: str) -> None:
+        """Re-read the object from its registry and re-index it."""
+        document = (object_type, object_id)
+        self._discard(document)
+
+        texts = self._get_texts(object_type, object_id)
+        if not texts:
+            return
+
+        tokens = frozenset(token for text in texts for token in tokenize(text))
+        if not tokens:
+            return
+
+        self._documents[document] = tokens
+        for token in tokens:
+            documents = self._token_documents.get(token)
+            if documents is None:
+                documents = self._token_documents[token] = set()
+                insort(self._vocabulary, token)
+                for trigram in get_trigrams(token):
+                    self._trigram_tokens.setdefault(trigram, set()).add(token)
+            documents.add(document)
+
+    # Removes the document from the index (and the tokens no other document has from the vocabulary)
+    def _discard(self, document: Tuple[str, str]) -> None:
+        """Remove the document from the index."""
+        for token in self._documents.pop(document, ()):
+            documents = self._token_documents[token]
+            documents.discard(document)
+            if documents:
+                continue
+
+            del self._token_documents[token]
+            del self._vocabulary[bisect_left(self._vocabulary, token)]
+            for trigram in get_trigrams(token):
+                tokens = self._trigram_tokens[trigram]
+                tokens.discard(token)
+                if not tokens:
+                    del self._trigram_tokens[trigram]
+
+    # Returns the searchable texts of the object (empty once it is removed)
+    def _get_texts(self, object_type: str, object_id: str) -> List[str]:
+        """Return the searchable texts of the object."""
+        if object_type == CHANGE_TYPE_AREA:
+            area = self._area_registry.async_get_area(object_id)
+            if area is None:
+                return []
+            return [area.normalized_name or area.name or ""]
+
+        if object_type == CHANGE_TYPE_DEVICE:
+            device = self._device_registry.async_get(object_id)
+            if device is None:
+                return []
+            return [device.name_by_user or device.name or ""]
+
+        entity = self._entity_registry.async_get(object_id)
+        if entity is None:
+            return []
+        return [entity.name or entity.original_name or "", entity.entity_id]
+
+
+# Splits the text into lower-case tokens
+def tokenize(text: str) -> List[str]:
+    """Split the text into lower-case tokens."""
+    return [token for token in _TOKEN_SEPARATOR.split(text.casefold()) if token]
+
+
+# Returns the trigrams of the token, padded so that short tokens and word starts have trigrams too
+def get_trigrams(token: str) -> Set[str]:
+    """Return the trigrams of the token."""
+    padded = "  " + token + " "
+    return {padded[position:position + 3] for position in range(len(padded) - 2)}
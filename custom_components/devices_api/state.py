@@ -0,0 +1,165 @@
+"""Live entity states for the Devices API component."""
+
+from __future__ import annotations
+from typing import Any, Dict
+from aiohttp.web import Request
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP, EVENT_STATE_CHANGED
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, State, callback
+from .encoder import Fragment, encode_fragment
+from .errors import ERROR_INVALID_INCLUDE
+
+# Query parameter selecting the live data included with the entities.
+INCLUDE_PARAMETER = "include"
+# Includes the entity state and its change times.
+INCLUDE_STATE = "state"
+# Includes the entity state attributes.
+INCLUDE_ATTRIBUTES = "attributes"
+
+
+# Class: StateCache
+class StateCache:
+    """Encoded state and attributes of the entities, dropped on their next state change.
+
+    A frequently changing sensor only invalidates its own fragments, the
+    fragments of the other entities are reused by the following responses,
+    which splice their encoded JSON as is.
+    """
+
+    # HomeAssistant instance
+    _hass: HomeAssistant
+    # Entity ID -> Encoded state fragment
+    _states: Dict[str, Fragment]
+    # Entity ID -> Encoded attributes fragment
+    _attributes: Dict[str, Fragment]
+    # State change listener removal callback (None until set up and after shutdown)
+    _unsubscribe: CALLBACK_TYPE | None
+
+    # Constructor
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Constructor."""
+        self._hass = hass
+        self._states = {}
+        self._attributes = {}
+        self._unsubscribe = None
+
+    # Starts dropping the fragments of the entities on their state changes
+    @callback
+    def async_setup(self) -> None:
+        """Start dropping the fragments of the entities on their state changes."""
+        self._unsubscribe = self._hass.bus.async_listen(
+            EVENT_STATE_CHANGED, self._async_invalidate
+        )
+        self._hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, self._async_stop)
+
+    # Stops listening to the state changes and drops every fragment
+    @callback
+    def async_shutdown(self) -> None:
+        """Stop listening to the state changes and drop every fragment."""
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+        self._states.clear()
+        self._attributes.clear()
+
+    # Returns the state fragment of the entity (None when it has no state)
+    def get_state(self, entity_id: str) -> Fragment | None:
+        """Return the state fragment of the entity."""
+        fragment = self._states.get(entity_id)
+        if fragment is None:
+            state = self._hass.states.get(entity_id)
+            if state is None:
+                return None
+            fragment = self._states[entity_id] = encode_fragment(_get_state_dict(state))
+        return fragment
+
+    # Returns the attributes fragment of the entity (None when it has no state)
+    def get_attributes(self, entity_id: str) -> Fragment | None:
+        """Return the attributes fragment of the entity."""
+        fragment = self._attributes.get(entity_id)
+        if fragment is None:
+            state = self._hass.states.get(entity_id)
+            if state is None:
+                return None
+            fragment = self._attributes[entity_id] = encode_fragment(dict(state.attributes))
+        return fragment
+
+    # Returns the number of cached fragments
+    def as_dict(self) -> Dict[str, int]:
+        """Return the number of cached fragments."""
+        return {
+            "states": len(self._states),
+            "attributes": len(self._attributes),
+        }
+
+    # Drops the fragments of the entity whose state changed
+    @callback
+    def _async_invalidate(self, event: Event) -> None:
+        """Drop the fragments of the entity whose state changed."""
+        entity_id = event.data.get("entity_id")
+        self._states.pop(entity_id, None)
+        self._attributes.pop(entity_id, None)
+
+    # Shuts the cache down when Home Assistant stops
+    @callback
+    def _async_stop(self, event: Event) -> None:
+        """Shut the cache down when Home Assistant stops."""
+        self.async_shutdown()
+
+
+# Class: EntityStates
+class EntityStates:
+    """Live data included with the entities of one response.
+
+    Responses are built synchronously on the event loop, so every state of a
+    response is read in the same pass and no state change can interleave.
+    """
+
+    # Fragment cache
+    _cache: StateCache
+    # Includes the entity state
+    _state: bool
+    # Includes the entity attributes
+    _attributes: bool
+
+    # Constructor
+    def __init__(self, cache: StateCache, state: bool, attributes: bool) -> None:
+        """Constructor."""
+        self._cache = cache
+        self._state = state
+        self._attributes = attributes
+
+    # Returns the live fields of the entity
+    def get_fields(self, entity_id: str) -> Dict[str, Any]:
+        """Return the live fields of the entity."""
+        fields: Dict[str, Any] = {}
+        if self._state:
+            fields[INCLUDE_STATE] = self._cache.get_state(entity_id)
+        if self._attributes:
+            fields[INCLUDE_ATTRIBUTES] = self._cache.get_attributes(entity_id)
+        return fields
+
+    # Creates the live data selection from the `include` query parameter (None when it is missing)
+    @staticmethod
+    def from_request(request: Request, cache: StateCache) -> EntityStates | None:
+        """Create the live data selection from the request, raising an Error on unknown values."""
+        include = request.query.get(INCLUDE_PARAMETER)
+        if not include:
+            return None
+
+        values = {value.strip() for value in include.split(",") if value.strip()}
+        if not values or not values <= {INCLUDE_STATE, INCLUDE_ATTRIBUTES}:
+            raise ERROR_INVALID_INCLUDE.copy()
+
+        return EntityStates(
+            cache, INCLUDE_STATE in values, INCLUDE_ATTRIBUTES in values
+        )
+
+
+# Returns the state and its change times as a dictionary
+def _get_state_dict(state: State) -> Dict[str, Any]:
+    """Return the state and its change times as a dictionary."""
+    return {
+        "state": state.state,
+        "last_changed": state.last_changed.isoformat(),
+        "last_updated": state.last_updated.isoformat(),
+    }
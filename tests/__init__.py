@@ -0,0 +1 @@
+"""Tests for the Devices API component."""
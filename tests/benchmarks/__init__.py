@@ -0,0 +1 @@
+"""Benchmarks for the Devices API component."""
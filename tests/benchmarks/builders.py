@@ -0,0 +1,23 @@
+"""Response builders shared by the Devices API benchmarks."""
+from typing import Any, Dict, List
+
+from custom_components.devices_api.constants import CONFIG, DOMAIN
+from custom_components.devices_api.manager import DeviceManager
+
+from .registry_generator import SyntheticHomeAssistant
+
+
+# Returns the device manager of the synthetic registries
+def get_device_manager(hass: SyntheticHomeAssistant) -> DeviceManager:
+    """Return the device manager of the synthetic registries."""
+    return DeviceManager(hass, hass.data[DOMAIN][CONFIG])
+
+
+# Returns the enabled devices with their entities, as dictionaries (the /devices response data)
+def build_devices_response(hass: SyntheticHomeAssistant) -> List[Dict[str, Any]]:
+    """Return the enabled devices with their entities, as dictionaries."""
+    return [
+        device.with_entities().as_dict()
+        for device in get_device_manager(hass).get_devices()
+        if not device.is_disabled()
+    ]
@@ -0,0 +1,68 @@
+"""Fixtures for the Devices API component benchmarks."""
+import asyncio
+import tracemalloc
+from typing import Any, Callable, Dict, Iterator
+
+import pytest
+
+from .registry_generator import SyntheticHomeAssistant, generate_registries, setup_component_data
+
+
+# Benchmarks run on synthetic registries, without a Home Assistant instance
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations():
+    """Override the custom integrations fixture, which needs a Home Assistant instance."""
+    yield
+
+
+# Returns a getter of synthetic registries (with the component data) by number of entities, built once per session
+@pytest.fixture(scope="session")
+def synthetic_registries() -> Callable[[int], SyntheticHomeAssistant]:
+    """Return a getter of synthetic registries by number of entities, built once per session."""
+    registries: Dict[int, SyntheticHomeAssistant] = {}
+
+    def get(entities: int) -> SyntheticHomeAssistant:
+        hass = registries.get(entities)
+        if hass is None:
+            hass = generate_registries(entities)
+            setup_component_data(hass)
+            registries[entities] = hass
+        return hass
+
+    return get
+
+
+# Returns the synthetic registries at the scale of the --registry-entities option
+@pytest.fixture(scope="module")
+def synthetic_hass(
+    request: pytest.FixtureRequest, synthetic_registries: Callable[[int], SyntheticHomeAssistant]
+) -> SyntheticHomeAssistant:
+    """Return the synthetic registries at the scale of the --registry-entities option."""
+    return synthetic_registries(request.config.getoption("--registry-entities"))
+
+
+# Returns a runner benchmarking the function, with the peak memory of one call in the extra info
+@pytest.fixture
+def measure(benchmark: Any) -> Callable[..., Any]:
+    """Return a runner benchmarking the function and reporting the peak memory of one call."""
+
+    def run(function: Callable[..., Any], *args: Any) -> Any:
+        tracemalloc.start()
+        try:
+            function(*args)
+            benchmark.extra_info["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        return benchmark(function, *args)
+
+    return run
+
+
+# Returns an event loop for the benchmarked coroutines (closed with its executor after the test)
+@pytest.fixture
+def benchmark_loop() -> Iterator[asyncio.AbstractEventLoop]:
+    """Return an event loop for the benchmarked coroutines."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.run_until_complete(loop.shutdown_default_executor())
+    loop.close()
@@ -0,0 +1,330 @@
+"""Seeded synthetic area, device and entity registries for the Devices API benchmarks.
+
+The registries are plain dictionaries of real registry entries, held by a Home
+Assistant stand-in without an event loop, an event bus or storage, so the
+benchmarks run without a Home Assistant instance.
+"""
+from random import Random
+from typing import Any, Callable, Dict, Tuple
+
+from homeassistant.helpers import area_registry as ar, device_registry as dr, entity_registry as er
+from homeassistant.helpers.area_registry import AreaEntry
+from homeassistant.helpers.device_registry import DeviceEntry, DeviceEntryDisabler
+from homeassistant.helpers.entity import EntityCategory
+from homeassistant.helpers.entity_registry import RegistryEntry
+
+from custom_components.devices_api.changes import ChangeLog
+from custom_components.devices_api.configuration import Configuration
+from custom_components.devices_api.constants import CHANGE_LOG, CONFIG, DOMAIN, INDEX, SEARCH_INDEX
+from custom_components.devices_api.index import RegistryIndex
+from custom_components.devices_api.search import SearchIndex
+
+# Room names the areas are made of.
+ROOMS = (
+    "Kitchen", "Living Room", "Bedroom", "Bathroom", "Office", "Hallway", "Garage",
+    "Garden", "Attic", "Basement", "Laundry", "Dining Room", "Nursery", "Guest Room",
+)
+# Device kinds: (name, manufacturers, models, entity templates).
+# Entity template: (domain, name, device class, unit, category, capabilities)
+DEVICE_KINDS: Tuple[Tuple[str, Tuple[str, ...], Tuple[str, ...], Tuple[Tuple[Any, ...], ...]], ...] = (
+    (
+        "Multisensor",
+        ("Aqara", "Xiaomi", "Philips"),
+        ("WSDCGQ11LM", "RTCGQ11LM", "SML001"),
+        (
+            ("sensor", "Temperature", "temperature", "°C", None, {"state_class": "measurement"}),
+            ("sensor", "Humidity", "humidity", "%", None, {"state_class": "measurement"}),
+            ("sensor", "Illuminance", "illuminance", "lx", None, {"state_class": "measurement"}),
+            ("binary_sensor", "Motion", "motion", None, None, None),
+            ("sensor", "Battery", "battery", "%", "diagnostic", {"state_class": "measurement"}),
+            ("sensor", "Signal strength", "signal_strength", "dBm", "diagnostic", {"state_class": "measurement"}),
+        ),
+    ),
+    (
+        "Light",
+        ("Philips", "IKEA", "LIFX"),
+        ("LCT015", "LED1545G12", "A19"),
+        (
+            (
+                "light", None, None, None, None,
+                {
+                    "min_color_temp_kelvin": 2000,
+                    "max_color_temp_kelvin": 6535,
+                    "min_mireds": 153,
+                    "max_mireds": 500,
+                    "supported_color_modes": ["color_temp", "hs", "xy"],
+                },
+            ),
+            ("select", "Power on behavior", None, None, "config", {"options": ["off", "on", "toggle", "previous"]}),
+            ("button", "Identify", "identify", None, "diagnostic", None),
+        ),
+    ),
+    (
+        "Smart Plug",
+        ("TP-Link", "Shelly", "Sonoff"),
+        ("HS110", "Plug S", "S26R2"),
+        (
+            ("switch", None, "outlet", None, None, None),
+            ("sensor", "Power", "power", "W", None, {"state_class": "measurement"}),
+            ("sensor", "Energy", "energy", "kWh", None, {"state_class": "total_increasing"}),
+            ("sensor", "Voltage", "voltage", "V", None, {"state_class": "measurement"}),
+            ("switch", "Child lock", None, None, "config", None),
+        ),
+    ),
+    (
+        "Thermostat",
+        ("Ecobee", "Honeywell", "tado"),
+        ("ecobee3", "T6 Pro", "Smart Thermostat V3+"),
+        (
+            (
+                "climate", None, None, None, None,
+                {
+                    "hvac_modes": ["off", "heat", "cool", "heat_cool", "auto"],
+                    "min_temp": 7,
+                    "max_temp": 35,
+                    "target_temp_step": 0.5,
+                    "fan_modes": ["auto", "low", "medium", "high"],
+                    "preset_modes": ["home", "away", "sleep"],
+                },
+            ),
+            ("sensor", "Current temperature", "temperature", "°C", None, {"state_class": "measurement"}),
+            ("number", "Temperature offset", None, "°C", "config", {"min": -5, "max": 5, "step": 0.1, "mode": "box"}),
+        ),
+    ),
+    (
+        "Blind",
+        ("Somfy", "IKEA", "Aqara"),
+        ("Sonesse 30", "FYRTUR", "ZNCLDJ12LM"),
+        (
+            ("cover", None, "blind", None, None, None),
+            ("sensor", "Battery", "battery", "%", "diagnostic", {"state_class": "measurement"}),
+        ),
+    ),
+    (
+        "Door Sensor",
+        ("Aqara", "Ring", "SimpliSafe"),
+        ("MCCGQ11LM", "Contact Sensor", "Entry Sensor"),
+        (
+            ("binary_sensor", "Contact", "door", None, None, None),
+            ("binary_sensor", "Tamper", "tamper", None, "diagnostic", None),
+            ("sensor", "Battery", "battery", "%", "diagnostic", {"state_class": "measurement"}),
+        ),
+    ),
+)
+
+
+# Class: SyntheticBus
+class SyntheticBus:
+    """Event bus stand-in: listeners are accepted and never called."""
+
+    # Registers the listener (it is never called)
+    def async_listen(self, event_type: str, listener: Callable[..., Any]) -> Callable[[], None]:
+        """Register the listener, returning its removal callback."""
+        return lambda: None
+
+    # Registers the one-time listener (it is never called)
+    def async_listen_once(self, event_type: str, listener: Callable[..., Any]) -> Callable[[], None]:
+        """Register the one-time listener, returning its removal callback."""
+        return lambda: None
+
+
+# Class: SyntheticStates
+class SyntheticStates:
+    """State machine stand-in without any state."""
+
+    # Returns the state of the entity (there is none)
+    def get(self, entity_id: str) -> None:
+        """Return the state of the entity."""
+        return None
+
+
+# Class: SyntheticAreaRegistry
+class SyntheticAreaRegistry:
+    """Area registry stand-in over a dictionary of area entries."""
+
+    # Constructor
+    def __init__(self, areas: Dict[str, AreaEntry]) -> None:
+        """Constructor."""
+        self.areas = areas
+
+    # Returns the area entry by ID
+    def async_get_area(self, area_id: str) -> AreaEntry | None:
+        """Return the area entry by ID."""
+        return self.areas.get(area_id)
+
+
+# Class: SyntheticDeviceRegistry
+class SyntheticDeviceRegistry:
+    """Device registry stand-in over a dictionary of device entries."""
+
+    # Constructor
+    def __init__(self, devices: Dict[str, DeviceEntry]) -> None:
+        """Constructor."""
+        self.devices = devices
+
+    # Returns the device entry by ID
+    def async_get(self, device_id: str) -> DeviceEntry | None:
+        """Return the device entry by ID."""
+        return self.devices.get(device_id)
+
+
+# Class: SyntheticEntityRegistry
+class SyntheticEntityRegistry:
+    """Entity registry stand-in over a dictionary of entity entries."""
+
+    # Constructor
+    def __init__(self, entities: Dict[str, RegistryEntry]) -> None:
+        """Constructor."""
+        self.entities = entities
+
+    # Returns the entity entry by ID
+    def async_get(self, entity_id: str) -> RegistryEntry | None:
+        """Return the entity entry by ID."""
+        return self.entities.get(entity_id)
+
+
+# Class: SyntheticHomeAssistant
+class SyntheticHomeAssistant:
+    """Home Assistant stand-in holding the synthetic registries."""
+
+    # Constructor
+    def __init__(
+        self,
+        areas: Dict[str, AreaEntry],
+        devices: Dict[str, DeviceEntry],
+        entities: Dict[str, RegistryEntry],
+    ) -> None:
+        """Constructor."""
+        self.bus = SyntheticBus()
+        self.states = SyntheticStates()
+        self.data: Dict[str, Any] = {
+            ar.DATA_REGISTRY: SyntheticAreaRegistry(areas),
+            dr.DATA_REGISTRY: SyntheticDeviceRegistry(devices),
+            er.DATA_REGISTRY: SyntheticEntityRegistry(entities),
+        }
+
+    # Returns the synthetic area registry
+    @property
+    def area_registry(self) -> SyntheticAreaRegistry:
+        """Return the synthetic area registry."""
+        return self.data[ar.DATA_REGISTRY]
+
+    # Returns the synthetic device registry
+    @property
+    def device_registry(self) -> SyntheticDeviceRegistry:
+        """Return the synthetic device registry."""
+        return self.data[dr.DATA_REGISTRY]
+
+    # Returns the synthetic entity registry
+    @property
+    def entity_registry(self) -> SyntheticEntityRegistry:
+        """Return the synthetic entity registry."""
+        return self.data[er.DATA_REGISTRY]
+
+
+# Generates registries holding `entities` entities (one device per `entities_per_device` entities, 25 per area)
+def generate_registries(
+    entities: int,
+    seed: int = 0,
+    entities_per_device: int = 10,
+    devices_per_area: int = 25,
+) -> SyntheticHomeAssistant:
+    """Generate seeded synthetic registries holding the given number of entities.
+
+    Devices are spread over the areas with a skewed distribution (a few busy
+    rooms, many quiet ones) and one device in ten has no area. A few devices are
+    disabled and one entity in twenty has no device.
+    """
+    random = Random(seed)
+    device_count = max(1, entities // entities_per_device)
+    # Entities of the devices, the others have no device
+    entity_budget = entities - entities // 20
+    average = entity_budget / device_count
+    area_count = max(1, device_count // devices_per_area)
+
+    areas: Dict[str, AreaEntry] = {}
+    for position in range(area_count):
+        name = f"{ROOMS[position % len(ROOMS)]} {position // len(ROOMS) + 1}"
+        area_id = f"area_{position:05d}"
+        areas[area_id] = AreaEntry(
+            name=name, normalized_name=name.casefold(), aliases=set(), id=area_id
+        )
+    area_ids = list(areas)
+    # Skewed weights: the first areas get most of the devices
+    area_weights = [1 / (position + 1) for position in range(area_count)]
+
+    devices: Dict[str, DeviceEntry] = {}
+    registry_entities: Dict[str, RegistryEntry] = {}
+
+    for position in range(device_count):
+        kind, manufacturers, models, templates = random.choice(DEVICE_KINDS)
+        device_id = f"{random.getrandbits(128):032x}"
+        area_id = None
+        if random.random() >= 0.1:
+            area_id = random.choices(area_ids, area_weights)[0]
+        room = areas[area_id].name if area_id is not None else "Home"
+        name = f"{room} {kind} {position}"
+        choice = random.randrange(len(manufacturers))
+
+        devices[device_id] = DeviceEntry(
+            id=device_id,
+            area_id=area_id,
+            config_entries={"synthetic"},
+            identifiers={("synthetic", device_id)},
+            manufacturer=manufacturers[choice],
+            model=models[choice],
+            name=name,
+            sw_version=f"{random.randint(1, 5)}.{random.randint(0, 20)}.{random.randint(0, 99)}",
+            hw_version=f"rev{random.randint(1, 4)}",
+            disabled_by=DeviceEntryDisabler.USER if random.random() < 0.03 else None,
+        )
+
+        # Devices repeat their entity templates (e.g. one sensor per channel) to reach the average count
+        count = max(1, min(entity_budget, random.randint(int(average / 2), int(average * 3 / 2))))
+        for number in range(count):
+            domain, entity_name, device_class, unit, category, capabilities = templates[number % len(templates)]
+            channel = number // len(templates)
+            object_id = f"{name} {entity_name or ''} {channel or ''}".strip().lower().replace(" ", "_")
+            entity_id = f"{domain}.{object_id}"
+            registry_entities[entity_id] = RegistryEntry(
+                entity_id=entity_id,
+                unique_id=f"{device_id}-{number}",
+                platform=manufacturers[choice].lower().replace(" ", "_"),
+                config_entry_id="synthetic",
+                device_id=device_id,
+                original_name=f"{name} {entity_name}" if entity_name else name,
+                original_device_class=device_class,
+                unit_of_measurement=unit,
+                entity_category=EntityCategory(category) if category else None,
+                capabilities=capabilities,
+            )
+        entity_budget -= count
+
+    # Entities without a device (helpers, templates, groups)
+    for number in range(max(0, entities - len(registry_entities))):
+        entity_id = f"input_boolean.helper_{number}"
+        registry_entities[entity_id] = RegistryEntry(
+            entity_id=entity_id,
+            unique_id=f"helper-{number}",
+            platform="input_boolean",
+            original_name=f"Helper {number}",
+        )
+
+    return SyntheticHomeAssistant(areas, devices, registry_entities)
+
+
+# Sets up the component data the managers read (configuration, registry index, change log and search index)
+def setup_component_data(hass: SyntheticHomeAssistant, config: Dict[str, Any] | None = None) -> None:
+    """Set up the component data the managers read."""
+    configuration = Configuration.from_any(config or {})
+    index = RegistryIndex(hass, configuration)
+    index.async_setup()
+    search_index = SearchIndex(hass)
+    search_index.async_setup()
+
+    hass.data[DOMAIN] = {
+        CONFIG: configuration,
+        INDEX: index,
+        CHANGE_LOG: ChangeLog(),
+        SEARCH_INDEX: search_index,
+    }
@@ -0,0 +1,51 @@
+"""Benchmarks of the JSON encoders on a 5000-device /devices response."""
+from json import dumps
+from typing import Any, Callable, Dict
+
+import pytest
+
+from custom_components.devices_api.encoder import encode
+
+from .builders import build_devices_response
+from .registry_generator import SyntheticHomeAssistant
+
+# Entities of the registries: 5000 devices with 10 entities each on average.
+REGISTRY_ENTITIES = 50000
+
+# Encoders to compare: the component encoder (orjson when installed), compact and pretty, and the standard library
+# with the compact separators of the fallback and with the indented output it replaced.
+ENCODERS: Dict[str, Callable[[Any], bytes]] = {
+    "compact": encode,
+    "pretty": lambda data: encode(data, pretty=True),
+    "stdlib_compact": lambda data: dumps(data, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8"),
+    "stdlib_indent_4": lambda data: dumps(data, indent=4, default=str).encode("utf-8"),
+}
+
+pytestmark = pytest.mark.timeout(120)
+
+
+# Returns the /devices response of 5000 devices
+@pytest.fixture(scope="module")
+def devices_response(synthetic_registries: Callable[[int], SyntheticHomeAssistant]) -> Dict[str, Any]:
+    """Return the /devices response of 5000 devices."""
+    return {"data": build_devices_response(synthetic_registries(REGISTRY_ENTITIES))}
+
+
+# Returns the size of the /devices response indented by the standard library (as before the compact output)
+@pytest.fixture(scope="module")
+def indented_size(devices_response: Dict[str, Any]) -> int:
+    """Return the size of the /devices response indented by the standard library."""
+    return len(ENCODERS["stdlib_indent_4"](devices_response))
+
+
+@pytest.mark.parametrize("encoder", list(ENCODERS))
+def test_encode_devices_response(
+    devices_response: Dict[str, Any], indented_size: int, benchmark: Any, encoder: str
+) -> None:
+    """Benchmark the encoding of the /devices response, reporting the payload size."""
+    body = benchmark(ENCODERS[encoder], devices_response)
+    benchmark.extra_info["payload_bytes"] = len(body)
+    benchmark.extra_info["payload_ratio"] = len(body) / indented_size
+
+    if encoder in ("compact", "stdlib_compact"):
+        assert benchmark.extra_info["payload_ratio"] < 0.8
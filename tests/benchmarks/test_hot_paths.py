@@ -0,0 +1,90 @@
+"""Benchmarks of the manager and serialization hot paths of the Devices API component."""
+import asyncio
+from typing import Any, Callable, List
+
+from aiohttp.test_utils import make_mocked_request
+
+from custom_components.devices_api.cache import ResponseCache
+from custom_components.devices_api.constants import CONFIG, DOMAIN, INDEX
+from custom_components.devices_api.http import respond, respond_cached
+from custom_components.devices_api.manager import AreaManager, Device
+
+from .builders import build_devices_response, get_device_manager
+from .registry_generator import SyntheticHomeAssistant
+
+
+def test_get_devices(synthetic_hass: SyntheticHomeAssistant, measure: Callable[..., Any]) -> None:
+    """Benchmark the wrapping of every device of the registry."""
+    devices = measure(get_device_manager(synthetic_hass).get_devices)
+
+    assert len(devices) == len(synthetic_hass.device_registry.devices)
+
+
+def test_device_with_entities(synthetic_hass: SyntheticHomeAssistant, measure: Callable[..., Any]) -> None:
+    """Benchmark the loading of the entities of every device."""
+    manager = get_device_manager(synthetic_hass)
+
+    def load_entities() -> List[Device]:
+        return [device.with_entities() for device in manager.get_devices()]
+
+    devices = measure(load_entities)
+
+    assert sum(len(device.get_entities()) for device in devices) == sum(
+        1 for entity in synthetic_hass.entity_registry.entities.values() if entity.device_id is not None
+    )
+
+
+def test_area_get_devices(synthetic_hass: SyntheticHomeAssistant, measure: Callable[..., Any]) -> None:
+    """Benchmark the listing of the devices of every area."""
+    areas = AreaManager(synthetic_hass, synthetic_hass.data[DOMAIN][CONFIG]).get_areas()
+
+    def list_area_devices() -> int:
+        return sum(len(area.get_devices()) for area in areas)
+
+    assert measure(list_area_devices) == sum(
+        1 for device in synthetic_hass.device_registry.devices.values() if device.area_id is not None
+    )
+
+
+def test_respond(synthetic_hass: SyntheticHomeAssistant, measure: Callable[..., Any]) -> None:
+    """Benchmark the encoding of the /devices response."""
+    data = build_devices_response(synthetic_hass)
+
+    assert measure(respond, data).status == 200
+
+
+def test_respond_cached_miss(
+    synthetic_hass: SyntheticHomeAssistant,
+    measure: Callable[..., Any],
+    benchmark_loop: asyncio.AbstractEventLoop,
+) -> None:
+    """Benchmark a /devices request missing the response cache (build, encode and store)."""
+    request = make_mocked_request("GET", "/api/devices_api/devices")
+    revision = synthetic_hass.data[DOMAIN][INDEX].get_revision()
+
+    def miss() -> Any:
+        return benchmark_loop.run_until_complete(
+            respond_cached(request, ResponseCache(), revision, lambda: build_devices_response(synthetic_hass))
+        )
+
+    assert measure(miss).status == 200
+
+
+def test_respond_cached_hit(
+    synthetic_hass: SyntheticHomeAssistant,
+    measure: Callable[..., Any],
+    benchmark_loop: asyncio.AbstractEventLoop,
+) -> None:
+    """Benchmark a /devices request served from the response cache."""
+    request = make_mocked_request("GET", "/api/devices_api/devices")
+    revision = synthetic_hass.data[DOMAIN][INDEX].get_revision()
+    cache = ResponseCache()
+
+    def hit() -> Any:
+        return benchmark_loop.run_until_complete(
+            respond_cached(request, cache, revision, lambda: build_devices_response(synthetic_hass))
+        )
+
+    hit()
+    assert measure(hit).status == 200
+    assert cache.as_dict()["misses"] == 1
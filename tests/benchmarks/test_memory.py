@@ -0,0 +1,82 @@
+"""Memory and allocation benchmarks of a 10000-device /devices response."""
+import tracemalloc
+from typing import Any, Callable, Tuple
+
+import pytest
+
+from custom_components.devices_api.manager import Device
+
+from .builders import build_devices_response, get_device_manager
+from .registry_generator import SyntheticHomeAssistant
+
+# Entities of the registries: 10000 devices with 10 entities each on average.
+REGISTRY_ENTITIES = 100000
+
+pytestmark = pytest.mark.timeout(120)
+
+
+# Returns the synthetic registries of 10000 devices
+@pytest.fixture(scope="module")
+def memory_hass(synthetic_registries: Callable[[int], SyntheticHomeAssistant]) -> SyntheticHomeAssistant:
+    """Return the synthetic registries of 10000 devices."""
+    return synthetic_registries(REGISTRY_ENTITIES)
+
+
+# Calls the function under tracemalloc, returning its result, its peak memory and the blocks its result holds
+def trace_allocations(function: Callable[..., Any], *args: Any) -> Tuple[Any, int, int]:
+    """Call the function under tracemalloc, returning its result, peak memory and allocated blocks."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        start = tracemalloc.get_traced_memory()[0]
+        result = function(*args)
+        peak = tracemalloc.get_traced_memory()[1] - start
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    blocks = sum(statistic.count_diff for statistic in after.compare_to(before, "filename"))
+    return result, peak, blocks
+
+
+# Returns a runner benchmarking the function, with its peak memory and allocated blocks (per device too)
+@pytest.fixture
+def measure_allocations(benchmark: Any, memory_hass: SyntheticHomeAssistant) -> Callable[..., Any]:
+    """Return a runner benchmarking the function and reporting its memory and allocations."""
+    devices = len(memory_hass.device_registry.devices)
+
+    def run(function: Callable[..., Any], *args: Any) -> Any:
+        _, peak, blocks = trace_allocations(function, *args)
+        benchmark.extra_info["peak_memory_bytes"] = peak
+        benchmark.extra_info["peak_memory_bytes_per_device"] = peak / devices
+        benchmark.extra_info["allocated_blocks"] = blocks
+        benchmark.extra_info["allocated_blocks_per_device"] = blocks / devices
+        return benchmark(function, *args)
+
+    return run
+
+
+def test_device_wrappers(memory_hass: SyntheticHomeAssistant, measure_allocations: Callable[..., Any]) -> None:
+    """Benchmark the memory and allocations of the device and entity wrappers of every device."""
+    manager = get_device_manager(memory_hass)
+
+    def wrap() -> Any:
+        return [device.with_entities() for device in manager.get_devices()]
+
+    devices = measure_allocations(wrap)
+
+    assert len(devices) == len(memory_hass.device_registry.devices)
+    # Slotted wrappers: no per-instance dictionary
+    assert not hasattr(devices[0], "__dict__")
+    assert not hasattr(devices[0].get_entities()[0], "__dict__")
+    assert isinstance(devices[0], Device)
+
+
+def test_devices_response(memory_hass: SyntheticHomeAssistant, measure_allocations: Callable[..., Any]) -> None:
+    """Benchmark the memory and allocations of the /devices response data."""
+    devices = measure_allocations(build_devices_response, memory_hass)
+
+    assert len(devices) == sum(
+        1 for device in memory_hass.device_registry.devices.values() if device.disabled_by is None
+    )
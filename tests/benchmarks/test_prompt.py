@@ -0,0 +1,35 @@
+"""Benchmarks of the prompt context of every device, compared with the device JSON output."""
+from typing import Any, Callable, List
+
+from custom_components.devices_api.encoder import encode_text
+from custom_components.devices_api.manager import Device
+from custom_components.devices_api.prompt import PromptContextEncoder, estimate_tokens
+
+from .builders import get_device_manager
+from .registry_generator import SyntheticHomeAssistant
+
+# Token budget large enough to keep every entity, so both outputs hold the same entities.
+TOKEN_BUDGET = 100000
+
+
+# Returns every device of the synthetic registries, with its entities
+def get_devices(hass: SyntheticHomeAssistant) -> List[Device]:
+    """Return every device of the synthetic registries, with its entities."""
+    return [device.with_entities() for device in get_device_manager(hass).get_devices()]
+
+
+def test_encode_devices(synthetic_hass: SyntheticHomeAssistant, measure: Callable[..., Any], benchmark: Any) -> None:
+    """Benchmark the prompt context of every device, reporting its tokens next to those of the indented JSON."""
+    devices = get_devices(synthetic_hass)
+    encoder = PromptContextEncoder(TOKEN_BUDGET)
+
+    def encode_devices() -> int:
+        return sum(encoder.encode_device(device).get_tokens() for device in devices)
+
+    prompt_tokens = measure(encode_devices)
+    json_tokens = sum(estimate_tokens(encode_text(device.as_dict(), pretty=True)) for device in devices)
+    benchmark.extra_info["prompt_tokens"] = prompt_tokens
+    benchmark.extra_info["json_tokens"] = json_tokens
+    benchmark.extra_info["token_ratio"] = prompt_tokens / json_tokens
+
+    assert prompt_tokens < json_tokens / 2
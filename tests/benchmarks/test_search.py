@@ -0,0 +1,33 @@
+"""Benchmarks of the fuzzy name search at 100000 entities."""
+from typing import Any, Callable
+
+import pytest
+
+from custom_components.devices_api.constants import CONFIG, DOMAIN
+from custom_components.devices_api.manager import SearchManager
+
+from .registry_generator import SyntheticHomeAssistant
+
+# Entities of the registries: 10000 devices with 10 entities each on average.
+REGISTRY_ENTITIES = 100000
+
+# Queries: exact words, several words, a typo and a partial word.
+QUERIES = ("thermostat", "kitchen temperature", "bedrom humidity", "living room pow")
+
+pytestmark = pytest.mark.timeout(120)
+
+
+# Returns the synthetic registries of 100000 entities
+@pytest.fixture(scope="module")
+def search_hass(synthetic_registries: Callable[[int], SyntheticHomeAssistant]) -> SyntheticHomeAssistant:
+    """Return the synthetic registries of 100000 entities."""
+    return synthetic_registries(REGISTRY_ENTITIES)
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_search(search_hass: SyntheticHomeAssistant, benchmark: Any, query: str) -> None:
+    """Benchmark a search query over the index of 100000 entities (the target is below a millisecond)."""
+    manager = SearchManager(search_hass, search_hass.data[DOMAIN][CONFIG])
+    results = benchmark(manager.search, query, 20)
+
+    assert len(results) == 20
@@ -0,0 +1,122 @@
+"""Benchmarks of the topology snapshot at 10000 devices and 100000 entities."""
+import asyncio
+import tracemalloc
+from typing import Any, Callable, Dict
+from unittest.mock import Mock
+
+from aiohttp.test_utils import make_mocked_request
+import pytest
+
+from custom_components.devices_api.constants import CONFIG, DOMAIN
+from custom_components.devices_api.encoder import encode
+from custom_components.devices_api.http import respond_stream
+from custom_components.devices_api.manager import SnapshotManager
+
+from .registry_generator import SyntheticHomeAssistant
+
+# Entities of the registries: 10000 devices with 10 entities each on average.
+REGISTRY_ENTITIES = 100000
+# Peak memory of a snapshot build per entity (about 400 bytes measured, the bound documented by get_snapshot).
+MAX_PEAK_BYTES_PER_ENTITY = 600
+# Peak memory of a streamed snapshot against a built and encoded one: about the largest area subtree and its
+# encoded body, the largest of the skewed areas holding 14% of the devices (0.19 measured).
+MAX_STREAM_PEAK_RATIO = 0.25
+
+pytestmark = pytest.mark.timeout(120)
+
+
+# Returns the synthetic registries of 10000 devices and 100000 entities
+@pytest.fixture(scope="module")
+def snapshot_hass(synthetic_registries: Callable[[int], SyntheticHomeAssistant]) -> SyntheticHomeAssistant:
+    """Return the synthetic registries of 10000 devices and 100000 entities."""
+    return synthetic_registries(REGISTRY_ENTITIES)
+
+
+# Returns the snapshot manager of the synthetic registries
+def get_snapshot_manager(hass: SyntheticHomeAssistant) -> SnapshotManager:
+    """Return the snapshot manager of the synthetic registries."""
+    return SnapshotManager(hass, hass.data[DOMAIN][CONFIG])
+
+
+# Returns the snapshot of the synthetic registries
+def get_snapshot(hass: SyntheticHomeAssistant) -> Dict[str, Any]:
+    """Return the snapshot of the synthetic registries."""
+    return get_snapshot_manager(hass).get_snapshot()
+
+
+# Returns the peak memory (in bytes) of one call of the function
+def get_peak_memory(function: Callable[..., Any], *args: Any) -> int:
+    """Return the peak memory of one call of the function."""
+    tracemalloc.start()
+    try:
+        function(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+# Returns a request whose response writer counts the written bytes instead of keeping them
+def build_stream_request(written: Dict[str, int]) -> Any:
+    """Return a request whose response writer counts the written bytes."""
+
+    async def write(data: bytes) -> None:
+        written["bytes"] += len(data)
+
+    async def noop(*args: Any) -> None:
+        return None
+
+    writer = Mock()
+    writer.write = write
+    writer.write_headers = noop
+    writer.write_eof = noop
+    writer.drain = noop
+    return make_mocked_request("GET", "/api/devices_api/snapshot?stream=1", writer=writer)
+
+
+def test_snapshot(snapshot_hass: SyntheticHomeAssistant, measure: Callable[..., Any], benchmark: Any) -> None:
+    """Benchmark the build of the snapshot, checking its peak memory against the documented bound."""
+    snapshot = measure(get_snapshot, snapshot_hass)
+    benchmark.extra_info["body_bytes"] = len(encode(snapshot))
+
+    devices = [device for area in snapshot["areas"] for device in area["devices"]]
+    assert len(devices) == len(snapshot_hass.device_registry.devices)
+    assert sum(len(device["entities"]) for device in devices) == sum(
+        1 for entity in snapshot_hass.entity_registry.entities.values() if entity.device_id is not None
+    )
+    assert benchmark.extra_info["peak_memory_bytes"] < MAX_PEAK_BYTES_PER_ENTITY * REGISTRY_ENTITIES
+
+
+def test_snapshot_encode(snapshot_hass: SyntheticHomeAssistant, measure: Callable[..., Any]) -> None:
+    """Benchmark the build and encoding of the snapshot response body."""
+    assert measure(lambda: encode({"data": get_snapshot(snapshot_hass)})).startswith(b'{"data":{"revision":')
+
+
+def test_snapshot_stream(
+    snapshot_hass: SyntheticHomeAssistant,
+    measure: Callable[..., Any],
+    benchmark: Any,
+    benchmark_loop: asyncio.AbstractEventLoop,
+) -> None:
+    """Benchmark the streamed snapshot, checking that it only holds about one area at a time."""
+    written = {"bytes": 0}
+
+    def stream() -> Any:
+        written["bytes"] = 0
+        manager = get_snapshot_manager(snapshot_hass)
+        return benchmark_loop.run_until_complete(
+            respond_stream(
+                build_stream_request(written),
+                manager.iter_areas(),
+                lambda area: area,
+                chunk_size=1,
+                head=b'{"data":{"revision":0,"areas":[',
+                tail=b"]}}",
+            )
+        )
+
+    assert measure(stream).status == 200
+    benchmark.extra_info["body_bytes"] = written["bytes"]
+
+    stream_peak = benchmark.extra_info["peak_memory_bytes"]
+    encoded_peak = get_peak_memory(lambda: encode({"data": get_snapshot(snapshot_hass)}))
+    assert stream_peak < encoded_peak * MAX_STREAM_PEAK_RATIO
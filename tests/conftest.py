@@ -0,0 +1,20 @@
+"""Fixtures for the Devices API component tests."""
+import pytest
+
+
+# Adds the scale option of the benchmarks
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add the scale option of the benchmarks."""
+    parser.addoption(
+        "--registry-entities",
+        type=int,
+        default=1000,
+        help="Number of entities of the synthetic registries the benchmarks run on",
+    )
+
+
+# Loads the component from custom_components in every test
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Enable the custom integrations in every test."""
+    yield
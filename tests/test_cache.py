@@ -0,0 +1,35 @@
+"""Tests for the response cache of the Devices API component."""
+from custom_components.devices_api.cache import CachedResponse, ResponseCache
+from custom_components.devices_api.changes import CHANGE_TYPE_DEVICE, RegistryChange
+
+
+def test_cache_is_bounded_by_size() -> None:
+    """Test that the least recently used responses are dropped above the size limit, variants included."""
+    cache = ResponseCache(max_entries=10, max_size=250)
+    cache.set("a", CachedResponse(1, b"a" * 100))
+    cache.set("b", CachedResponse(1, b"b" * 100))
+    assert cache.as_dict()["size"] == 200
+
+    # The compressed variant of "b" pushes the cache past its size: "a" is the least recently used
+    entry = cache.get("b", 1)
+    cache.set_variant("b", entry, "gzip", b"z" * 60)
+    assert cache.get("a", 1) is None
+    assert cache.get("b", 1) is entry
+    assert cache.as_dict()["size"] == 160
+
+    # A response larger than the whole cache is not stored
+    cache.set("c", CachedResponse(1, b"c" * 300))
+    assert cache.get("c", 1) is None
+    assert cache.as_dict()["entries"] == 1
+
+
+def test_registry_change_drops_stale_responses() -> None:
+    """Test that a registry change drops the responses of the older revisions right away."""
+    cache = ResponseCache()
+    cache.set("a", CachedResponse(1, b"a" * 100))
+    cache.set("b", CachedResponse(1, b"b" * 100))
+
+    cache.apply_change(RegistryChange(2, CHANGE_TYPE_DEVICE, "update", "device"))
+
+    assert len(cache) == 0
+    assert cache.as_dict()["size"] == 0
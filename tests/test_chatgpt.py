@@ -0,0 +1,176 @@
+"""Tests for the ChatGPT client of the Devices API component."""
+import asyncio
+from datetime import timedelta
+from typing import Any, AsyncIterator, Dict, List
+from unittest.mock import AsyncMock, patch
+
+from aiohttp import hdrs, web
+from aiohttp.test_utils import TestServer
+from homeassistant.core import HomeAssistant
+from homeassistant.util.dt import utcnow
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.devices_api.chatgpt import STORAGE_KEY, STORAGE_SAVE_DELAY, ChatGPTClient
+from custom_components.devices_api.configuration import ChatGPTConfiguration
+from custom_components.devices_api.errors import ERROR_CHATGPT_FAILED, Error
+
+
+# Class: FakeChatGPT
+class FakeChatGPT:
+    """OpenAI compatible test server answering with the queued statuses, then with completions."""
+
+    # Statuses of the next responses (200 once empty)
+    _statuses: List[int]
+    # Prompts of the received requests
+    _prompts: List[str]
+    # Held until set before answering
+    _release: asyncio.Event
+    # Base URL of the API, once served
+    _base_url: str
+
+    # Constructor
+    def __init__(self) -> None:
+        """Constructor."""
+        self._statuses = []
+        self._prompts = []
+        self._release = asyncio.Event()
+        self._release.set()
+        self._base_url = ""
+
+    # Returns the base URL of the API
+    def get_base_url(self) -> str:
+        """Return the base URL of the API."""
+        return self._base_url
+
+    # Sets the base URL of the API
+    def set_base_url(self, base_url: str) -> None:
+        """Set the base URL of the API."""
+        self._base_url = base_url
+
+    # Returns the prompts of the received requests
+    def get_prompts(self) -> List[str]:
+        """Return the prompts of the received requests."""
+        return self._prompts
+
+    # Returns the event answers wait for
+    def get_release(self) -> asyncio.Event:
+        """Return the event answers wait for."""
+        return self._release
+
+    # Queues the statuses of the next responses
+    def queue(self, *statuses: int) -> None:
+        """Queue the statuses of the next responses."""
+        self._statuses.extend(statuses)
+
+    # Answers a chat completion request
+    async def handle(self, request: web.Request) -> web.Response:
+        """Answer a chat completion request."""
+        body: Dict[str, Any] = await request.json()
+        prompt = body["messages"][0]["content"]
+        self._prompts.append(prompt)
+        await self._release.wait()
+
+        status = self._statuses.pop(0) if self._statuses else 200
+        if status != 200:
+            return web.Response(status=status, headers={hdrs.RETRY_AFTER: "2"} if status == 429 else None)
+        return web.json_response({"choices": [{"message": {"content": f"Answer to {prompt}"}}]})
+
+
+# Returns the fake ChatGPT API served on a local test server
+@pytest.fixture
+async def chatgpt_server(socket_enabled: None) -> AsyncIterator[FakeChatGPT]:
+    """Return the fake ChatGPT API served on a local test server."""
+    fake = FakeChatGPT()
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", fake.handle)
+    server = TestServer(app)
+    await server.start_server()
+    fake.set_base_url(str(server.make_url("/v1")))
+    yield fake
+    await server.close()
+
+
+# Returns a client of the fake ChatGPT API
+def build_client(hass: HomeAssistant, server: FakeChatGPT, max_retries: int = 3) -> ChatGPTClient:
+    """Return a client of the fake ChatGPT API."""
+    return ChatGPTClient(
+        hass,
+        ChatGPTConfiguration(api_key="test", base_url=server.get_base_url(), max_retries=max_retries),
+    )
+
+
+async def test_transient_failures_are_retried_with_backoff(hass: HomeAssistant, chatgpt_server: FakeChatGPT) -> None:
+    """Test that rate-limited and failed requests are retried after an increasing delay."""
+    client = build_client(hass, chatgpt_server)
+    chatgpt_server.queue(503, 500, 429)
+
+    with patch("custom_components.devices_api.chatgpt.sleep", new=AsyncMock()) as sleep:
+        assert await client.async_complete("Turn on the lights") == "Answer to Turn on the lights"
+
+    delays = [call.args[0] for call in sleep.await_args_list]
+    assert len(delays) == 3
+    assert 0.5 <= delays[0] <= 1 and 1 <= delays[1] <= 2
+    # The Retry-After header of the rate-limited response is followed
+    assert delays[2] == 2
+    assert client.as_dict()["requests"] == 4
+
+
+async def test_failures_past_the_retries_raise(hass: HomeAssistant, chatgpt_server: FakeChatGPT) -> None:
+    """Test that the client gives up after the retries, and on statuses not worth retrying."""
+    client = build_client(hass, chatgpt_server, max_retries=1)
+
+    chatgpt_server.queue(502, 502)
+    with patch("custom_components.devices_api.chatgpt.sleep", new=AsyncMock()):
+        with pytest.raises(Error) as failed:
+            await client.async_complete("Turn on the lights")
+    assert failed.value.as_dict() == ERROR_CHATGPT_FAILED.as_dict()
+    assert failed.value is not ERROR_CHATGPT_FAILED
+
+    chatgpt_server.queue(401)
+    with pytest.raises(Error):
+        await client.async_complete("Turn off the lights")
+    assert len(chatgpt_server.get_prompts()) == 3
+
+
+async def test_cached_responses_are_stored(
+    hass: HomeAssistant, hass_storage: Dict[str, Any], chatgpt_server: FakeChatGPT
+) -> None:
+    """Test that answered prompts are saved to the storage and answered from it by a new client."""
+    client = build_client(hass, chatgpt_server)
+    assert await client.async_complete("Turn on the lights") == "Answer to Turn on the lights"
+    # Formatting-only changes hit the cache
+    assert await client.async_complete("Turn on the lights  \r\n") == "Answer to Turn on the lights"
+    assert client.as_dict() == {"requests": 1, "cache_hits": 1, "cached": 1}
+
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=STORAGE_SAVE_DELAY + 1))
+    await hass.async_block_till_done()
+    assert list(hass_storage[STORAGE_KEY]["data"]["responses"].values()) == ["Answer to Turn on the lights"]
+
+    reloaded = build_client(hass, chatgpt_server)
+    await reloaded.async_load()
+    assert await reloaded.async_complete("Turn on the lights") == "Answer to Turn on the lights"
+    assert reloaded.as_dict()["requests"] == 0
+    assert len(chatgpt_server.get_prompts()) == 1
+
+
+async def test_identical_prompts_in_flight_share_a_request(hass: HomeAssistant, chatgpt_server: FakeChatGPT) -> None:
+    """Test that identical prompts sent at once are answered by one API request."""
+    client = build_client(hass, chatgpt_server)
+    chatgpt_server.get_release().clear()
+
+    completions = asyncio.gather(
+        client.async_complete("Turn on the lights"),
+        client.async_complete("Turn on the lights\n"),
+        client.async_complete("Turn off the lights"),
+    )
+    while len(chatgpt_server.get_prompts()) < 2:
+        await asyncio.sleep(0.01)
+    chatgpt_server.get_release().set()
+
+    assert await completions == [
+        "Answer to Turn on the lights",
+        "Answer to Turn on the lights",
+        "Answer to Turn off the lights",
+    ]
+    assert sorted(chatgpt_server.get_prompts()) == ["Turn off the lights", "Turn on the lights"]
@@ -0,0 +1,31 @@
+"""Tests for the configuration of the Devices API component."""
+import pytest
+
+from custom_components.devices_api.configuration import AllowedIPsConfiguration, Configuration
+
+
+@pytest.mark.parametrize(
+    "allowed_ips",
+    [
+        ["192.168.1.0/24"],
+        {"allowed_ips": ["192.168.1.0/24"], "trusted_proxies": ["172.30.32.2"]},
+        '{"allowed_ips": ["192.168.1.0/24"], "trusted_proxies": ["172.30.32.2"]}',
+    ],
+)
+def test_top_level_trusted_proxies_are_merged(allowed_ips: object) -> None:
+    """Test that the top-level trusted proxies apply to every form of the allowed IPs."""
+    config = Configuration.from_any(
+        {"allowed_ips": allowed_ips, "trusted_proxies": ["172.30.32.2", "10.0.0.1"]}
+    ).get_allowed_ips()
+
+    assert sorted(config.get_trusted_proxies()) == ["10.0.0.1", "172.30.32.2"]
+    assert config.is_allowed_client("10.0.0.1", "192.168.1.20")
+    assert not config.is_allowed_client("10.0.0.2", "192.168.1.20")
+
+
+def test_trusted_proxies_default_to_none() -> None:
+    """Test that forwarded addresses are ignored without trusted proxies."""
+    config = AllowedIPsConfiguration.from_any({"allowed_ips": ["192.168.1.0/24"]})
+
+    assert config.get_trusted_proxies() == []
+    assert not config.is_allowed_client("10.0.0.1", "192.168.1.20")
@@ -0,0 +1,46 @@
+"""Tests for the Server-Sent Events of the Devices API component."""
+import asyncio
+from typing import Any, List
+from unittest.mock import Mock
+
+from aiohttp import web
+from aiohttp.test_utils import make_mocked_request
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import area_registry as ar
+from homeassistant.setup import async_setup_component
+
+from custom_components.devices_api.changes import CHANGE_TYPE_AREA, RegistryChange
+from custom_components.devices_api.constants import DOMAIN, EVENT_BROKER
+from custom_components.devices_api.router import DevicesAPIEventsView
+
+
+async def test_changes_published_while_the_stream_starts_are_sent(hass: HomeAssistant) -> None:
+    """Test that a change published while the response is prepared reaches a client without Last-Event-ID."""
+    assert await async_setup_component(hass, DOMAIN, {DOMAIN: {}})
+    area = ar.async_get(hass).async_create("Office")
+    written: List[bytes] = []
+    sent = asyncio.Event()
+
+    # The change is published while the response headers are written
+    async def write_headers(*args: Any) -> None:
+        hass.data[DOMAIN][EVENT_BROKER].async_publish(RegistryChange(1, CHANGE_TYPE_AREA, "create", area.id))
+
+    async def write(data: bytes) -> None:
+        written.append(data)
+        sent.set()
+
+    async def noop(*args: Any) -> None:
+        return None
+
+    app = web.Application()
+    app["hass"] = hass
+    app.on_response_prepare.freeze()
+    writer = Mock(write_headers=write_headers, write=write, write_eof=noop, drain=noop)
+    request = make_mocked_request("GET", "/api/devices_api/events", app=app, writer=writer)
+
+    stream = asyncio.ensure_future(DevicesAPIEventsView().get(request))
+    await asyncio.wait_for(sent.wait(), 5)
+    stream.cancel()
+    await asyncio.gather(stream, return_exceptions=True)
+
+    assert b"Office" in b"".join(written)
@@ -0,0 +1,138 @@
+"""Tests for the http helpers of the Devices API component."""
+from json import loads
+from threading import current_thread, main_thread
+from typing import List
+from unittest.mock import Mock, patch
+
+from aiohttp import hdrs
+from aiohttp.test_utils import make_mocked_request
+from homeassistant.core import HomeAssistant
+
+from custom_components.devices_api.cache import ResponseCache
+from custom_components.devices_api.compression import compress
+from custom_components.devices_api.configuration import CompressionConfiguration
+from custom_components.devices_api.errors import ERROR_NOT_FOUND
+from custom_components.devices_api.http import REQUEST_TIME_HEADER, respond, respond_cached, respond_stream
+
+
+async def test_respond_cached_sends_the_request_time_in_a_header(hass: HomeAssistant) -> None:
+    """Test that cached bodies do not hold the request time, which is sent in a header."""
+    cache = ResponseCache()
+    request = make_mocked_request("GET", "/api/devices_api/areas")
+
+    built = await respond_cached(request, cache, 1, lambda: [{"id": "office"}])
+    hit = await respond_cached(request, cache, 1, lambda: [{"id": "office"}])
+    assert built.body == hit.body == b'{"data":[{"id":"office"}]}'
+    assert float(built.headers[REQUEST_TIME_HEADER]) <= float(hit.headers[REQUEST_TIME_HEADER])
+
+    # A body built again (in another cache) keeps its entity tag
+    rebuilt = await respond_cached(request, ResponseCache(), 1, lambda: [{"id": "office"}])
+    assert rebuilt.headers[hdrs.ETAG] == built.headers[hdrs.ETAG]
+
+    not_modified = await respond_cached(
+        make_mocked_request("GET", "/api/devices_api/areas", headers={hdrs.IF_NONE_MATCH: built.headers[hdrs.ETAG]}),
+        cache,
+        1,
+        lambda: [{"id": "office"}],
+    )
+    assert not_modified.status == 304
+    assert REQUEST_TIME_HEADER in not_modified.headers
+
+
+async def test_respond_stream_compresses_from_the_minimum_size(hass: HomeAssistant) -> None:
+    """Test that streamed responses are only compressed once they reach the minimum size."""
+    compression = CompressionConfiguration(min_size=1024)
+    headers = {hdrs.ACCEPT_ENCODING: "gzip"}
+
+    small = await respond_stream(
+        make_mocked_request("GET", "/api/devices_api/devices?stream=1", headers=headers),
+        range(10),
+        str,
+        compression=compression,
+        chunk_size=2,
+    )
+    assert hdrs.CONTENT_ENCODING not in small.headers
+
+    large = await respond_stream(
+        make_mocked_request("GET", "/api/devices_api/devices?stream=1", headers=headers),
+        range(1000),
+        str,
+        compression=compression,
+        chunk_size=2,
+    )
+    assert large.headers[hdrs.CONTENT_ENCODING] == "gzip"
+
+    disabled = await respond_stream(
+        make_mocked_request("GET", "/api/devices_api/devices?stream=1", headers=headers),
+        range(1000),
+        str,
+        compression=CompressionConfiguration(enabled=False),
+    )
+    assert hdrs.CONTENT_ENCODING not in disabled.headers
+
+
+async def test_every_response_sends_the_request_time_in_a_header(hass: HomeAssistant) -> None:
+    """Test that uncached, streamed and error responses have the body shape of the cached ones."""
+    live = respond([{"id": "office"}])
+    assert live.body == b'{"data":[{"id":"office"}]}'
+    assert REQUEST_TIME_HEADER in live.headers
+
+    error = ERROR_NOT_FOUND.as_http_response()
+    assert b"request_time" not in error.body
+    assert REQUEST_TIME_HEADER in error.headers
+
+    stream = await respond_stream(
+        make_mocked_request("GET", "/api/devices_api/devices?stream=1"), range(3), str
+    )
+    assert REQUEST_TIME_HEADER in stream.headers
+
+
+async def test_respond_cached_compresses_in_the_executor(hass: HomeAssistant) -> None:
+    """Test that compressed variants are built off the event loop, with the body or on their first request."""
+    threads: List[bool] = []
+
+    def tracked_compress(body: bytes, encoding: str) -> bytes:
+        threads.append(current_thread() is main_thread())
+        return compress(body, encoding)
+
+    cache = ResponseCache()
+    compression = CompressionConfiguration(min_size=16)
+    data = [{"id": f"device_{number}"} for number in range(100)]
+    identity = make_mocked_request("GET", "/api/devices_api/devices")
+    gzip = make_mocked_request("GET", "/api/devices_api/devices", headers={hdrs.ACCEPT_ENCODING: "gzip"})
+
+    with patch("custom_components.devices_api.http.compress", tracked_compress):
+        # Built with the body on a miss
+        built = await respond_cached(gzip, cache, 1, lambda: data, compression=compression)
+        # Built on its first request when the body was cached uncompressed
+        cold = ResponseCache()
+        await respond_cached(identity, cold, 1, lambda: data, compression=compression)
+        variant = await respond_cached(gzip, cold, 1, lambda: data, compression=compression)
+        hit = await respond_cached(gzip, cold, 1, lambda: data, compression=compression)
+
+    assert threads == [False, False]
+    assert built.headers[hdrs.CONTENT_ENCODING] == variant.headers[hdrs.CONTENT_ENCODING] == "gzip"
+    assert hit.body == variant.body
+
+
+async def test_respond_stream_writes_the_items_between_the_head_and_the_tail(hass: HomeAssistant) -> None:
+    """Test that streamed documents wrap their items in the given head and tail."""
+    written: List[bytes] = []
+
+    async def write(data: bytes) -> None:
+        written.append(data)
+
+    async def noop(*args: object) -> None:
+        return None
+
+    writer = Mock(write=write, write_headers=noop, write_eof=noop, drain=noop)
+    await respond_stream(
+        make_mocked_request("GET", "/api/devices_api/snapshot?stream=1", writer=writer),
+        ({"id": area} for area in ("office", "kitchen")),
+        lambda area: area,
+        chunk_size=1,
+        head=b'{"data":{"revision":1,"areas":[',
+        tail=b"]}}",
+    )
+
+    assert loads(b"".join(written)) == {"data": {"revision": 1, "areas": [{"id": "office"}, {"id": "kitchen"}]}}
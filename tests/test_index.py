@@ -0,0 +1,227 @@
+"""Tests for the registry index of the Devices API component."""
+from typing import Iterator, List, Set
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import area_registry as ar, device_registry as dr, entity_registry as er
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.devices_api.changes import ChangeLog
+from custom_components.devices_api.configuration import Configuration
+from custom_components.devices_api.constants import NO_AREA_ID
+from custom_components.devices_api.index import RegistryIndex
+
+
+# Returns the config entry the test devices and entities belong to
+@pytest.fixture
+def config_entry(hass: HomeAssistant) -> MockConfigEntry:
+    """Return the config entry the test devices and entities belong to."""
+    entry = MockConfigEntry(domain="test")
+    entry.add_to_hass(hass)
+    return entry
+
+
+# Returns the component configuration
+@pytest.fixture
+def config() -> Configuration:
+    """Return the component configuration."""
+    return Configuration.from_any({})
+
+
+# Returns a registry index kept current from the registry events
+@pytest.fixture
+def index(hass: HomeAssistant, config: Configuration) -> Iterator[RegistryIndex]:
+    """Return a registry index kept current from the registry events."""
+    registry_index = RegistryIndex(hass, config)
+    registry_index.async_setup()
+    yield registry_index
+    registry_index.async_shutdown()
+
+
+# Returns the IDs of the entities of the device, from a full scan of the entity registry
+def scan_device_entity_ids(hass: HomeAssistant, device_id: str) -> Set[str]:
+    """Return the IDs of the entities of the device, from a full scan of the entity registry."""
+    return {
+        entity.entity_id
+        for entity in er.async_get(hass).entities.values()
+        if entity.device_id == device_id
+    }
+
+
+# Returns the IDs of the devices in the area ordered by ID, from a full scan of the device registry
+def scan_area_device_ids(hass: HomeAssistant, area_id: str) -> List[str]:
+    """Return the IDs of the devices in the area ordered by ID, from a full scan of the device registry."""
+    return sorted(
+        device.id
+        for device in dr.async_get(hass).devices.values()
+        if (device.area_id or NO_AREA_ID) == area_id
+    )
+
+
+# Asserts that the index matches a full scan of the registries
+def assert_matches_scan(hass: HomeAssistant, index: RegistryIndex, *removed_ids: str) -> None:
+    """Assert that the index matches a full scan of the registries."""
+    device_ids = set(dr.async_get(hass).devices) | set(removed_ids)
+    for device_id in device_ids:
+        indexed = {entity.entity_id for entity in index.get_device_entities(device_id)}
+        assert indexed == scan_device_entity_ids(hass, device_id), device_id
+
+    area_ids = set(ar.async_get(hass).areas) | {NO_AREA_ID}
+    for area_id in area_ids:
+        assert index.get_area_device_ids(area_id) == scan_area_device_ids(hass, area_id), area_id
+
+
+async def test_index_matches_scan_after_entity_changes(
+    hass: HomeAssistant, config_entry: MockConfigEntry, index: RegistryIndex
+) -> None:
+    """Test that the index follows the entity creations, updates and removals."""
+    device_registry = dr.async_get(hass)
+    entity_registry = er.async_get(hass)
+    first = device_registry.async_get_or_create(
+        config_entry_id=config_entry.entry_id, identifiers={("test", "first")}
+    )
+    second = device_registry.async_get_or_create(
+        config_entry_id=config_entry.entry_id, identifiers={("test", "second")}
+    )
+    await hass.async_block_till_done()
+    assert_matches_scan(hass, index)
+
+    temperature = entity_registry.async_get_or_create(
+        "sensor", "test", "temperature", config_entry=config_entry, device_id=first.id
+    )
+    humidity = entity_registry.async_get_or_create(
+        "sensor", "test", "humidity", config_entry=config_entry, device_id=first.id
+    )
+    entity_registry.async_get_or_create("light", "test", "standalone", config_entry=config_entry)
+    await hass.async_block_till_done()
+    assert_matches_scan(hass, index)
+    assert len(index.get_device_entities(first.id)) == 2
+
+    # Moved to another device
+    entity_registry.async_update_entity(humidity.entity_id, device_id=second.id)
+    await hass.async_block_till_done()
+    assert_matches_scan(hass, index)
+
+    # Renamed
+    entity_registry.async_update_entity(temperature.entity_id, new_entity_id="sensor.renamed")
+    await hass.async_block_till_done()
+    assert_matches_scan(hass, index)
+    assert [entity.entity_id for entity in index.get_device_entities(first.id)] == ["sensor.renamed"]
+
+    # Detached from its device
+    entity_registry.async_update_entity("sensor.renamed", device_id=None)
+    await hass.async_block_till_done()
+    assert_matches_scan(hass, index)
+    assert index.get_device_entities(first.id) == []
+
+    entity_registry.async_remove(humidity.entity_id)
+    await hass.async_block_till_done()
+    assert_matches_scan(hass, index)
+    assert index.get_device_entities(second.id) == []
+
+
+async def test_index_matches_scan_after_device_changes(
+    hass: HomeAssistant, config_entry: MockConfigEntry, index: RegistryIndex
+) -> None:
+    """Test that the index follows the devices moving between areas and being removed."""
+    area_registry = ar.async_get(hass)
+    device_registry = dr.async_get(hass)
+    entity_registry = er.async_get(hass)
+    kitchen = area_registry.async_create("Kitchen")
+    office = area_registry.async_create("Office")
+    device = device_registry.async_get_or_create(
+        config_entry_id=config_entry.entry_id, identifiers={("test", "device")}
+    )
+    other = device_registry.async_get_or_create(
+        config_entry_id=config_entry.entry_id, identifiers={("test", "other")}
+    )
+    entity_registry.async_get_or_create(
+        "sensor", "test", "power", config_entry=config_entry, device_id=device.id
+    )
+    await hass.async_block_till_done()
+    assert_matches_scan(hass, index)
+    assert index.get_area_device_ids(NO_AREA_ID) == sorted([device.id, other.id])
+
+    device_registry.async_update_device(device.id, area_id=kitchen.id)
+    await hass.async_block_till_done()
+    assert_matches_scan(hass, index)
+    assert index.get_area_device_ids(kitchen.id) == [device.id]
+
+    device_registry.async_update_device(device.id, area_id=office.id)
+    device_registry.async_update_device(other.id, area_id=kitchen.id)
+    await hass.async_block_till_done()
+    assert_matches_scan(hass, index)
+    assert index.get_area_device_ids(office.id) == [device.id]
+    assert index.get_area_device_ids(kitchen.id) == [other.id]
+
+    # Devices of a removed area end up without an area
+    area_registry.async_delete(kitchen.id)
+    await hass.async_block_till_done()
+    assert_matches_scan(hass, index)
+    assert index.get_area_device_ids(NO_AREA_ID) == [other.id]
+
+    device_registry.async_remove_device(device.id)
+    await hass.async_block_till_done()
+    # Its entities are removed by the entity registry, on the device removal event
+    await hass.async_block_till_done()
+    assert_matches_scan(hass, index, device.id)
+    assert index.get_device_area(device.id) is None
+
+
+async def test_enabled_device_ids_pages(
+    hass: HomeAssistant, config_entry: MockConfigEntry, index: RegistryIndex
+) -> None:
+    """Test that the pages of an area follow the cursor, skipping the disabled devices."""
+    device_registry = dr.async_get(hass)
+    kitchen = ar.async_get(hass).async_create("Kitchen")
+    device_ids = []
+    for number in range(7):
+        device = device_registry.async_get_or_create(
+            config_entry_id=config_entry.entry_id, identifiers={("test", str(number))}
+        )
+        device_registry.async_update_device(device.id, area_id=kitchen.id)
+        device_ids.append(device.id)
+    device_registry.async_update_device(device_ids[3], disabled_by=dr.DeviceEntryDisabler.USER)
+    await hass.async_block_till_done()
+    enabled = sorted(device_ids[:3] + device_ids[4:])
+
+    pages: List[str] = []
+    after = None
+    while True:
+        page, more = index.get_enabled_device_ids_page(after, 4, kitchen.id)
+        pages.append(page)
+        if not more:
+            break
+        after = page[-1]
+
+    assert pages == [enabled[:4], enabled[4:]]
+    assert index.count_enabled_devices(kitchen.id) == 6
+    # A cursor on a removed device still starts the page after it
+    assert index.get_enabled_device_ids_page(enabled[1] + "0", 10, kitchen.id) == (enabled[2:], False)
+
+
+async def test_ignored_domains_change_is_logged(
+    hass: HomeAssistant, config_entry: MockConfigEntry, config: Configuration, index: RegistryIndex
+) -> None:
+    """Test that the entities an ignored domains change hides or shows are in the change log."""
+    entity_registry = er.async_get(hass)
+    light = entity_registry.async_get_or_create("light", "test", "ceiling", config_entry=config_entry)
+    entity_registry.async_get_or_create("sensor", "test", "power", config_entry=config_entry)
+    await hass.async_block_till_done()
+    change_log = ChangeLog()
+    index.async_add_listener(change_log.append)
+    revision = index.get_revision()
+
+    config.get_ignored_domains().add_ignored_domain("light")
+    assert index.get_revision() == revision + 1
+    changes = change_log.get_since(revision, index.get_revision())
+    assert [(change.get_action(), change.get_id()) for change in changes] == [("remove", light.entity_id)]
+
+    # Nothing else is hidden
+    config.get_ignored_domains().add_ignored_domain("switch")
+    assert index.get_revision() == revision + 1
+
+    config.get_ignored_domains().remove_ignored_domain("light")
+    assert index.get_revision() == revision + 2
+    changes = change_log.get_since(revision + 1, index.get_revision())
+    assert [(change.get_action(), change.get_id()) for change in changes] == [("create", light.entity_id)]
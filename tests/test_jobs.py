@@ -0,0 +1,44 @@
+"""Tests for the background automation generation jobs of the Devices API component."""
+from typing import Any, Dict
+from unittest.mock import Mock
+
+from homeassistant.core import HomeAssistant
+import pytest
+
+from custom_components.devices_api.configuration import Configuration
+from custom_components.devices_api.errors import ERROR_JOB_QUEUE_FULL, Error
+from custom_components.devices_api.jobs import JobQueue
+
+
+# Returns a job queue without workers, so every submitted work item stays queued
+def build_queue(hass: HomeAssistant, jobs: Dict[str, Any]) -> JobQueue:
+    """Return a job queue without workers, so every submitted work item stays queued."""
+    config = Configuration.from_dict({"jobs": {"concurrency": 0, **jobs}})
+    return JobQueue(hass, config, Mock())
+
+
+async def test_submissions_past_the_queued_items_limit_are_rejected(hass: HomeAssistant) -> None:
+    """Test that a submission queuing more work items than configured is rejected."""
+    queue = build_queue(hass, {"max_queued": 3})
+    queue.async_submit("Turn on", ["a", "b"])
+
+    with pytest.raises(Error) as error:
+        queue.async_submit("Turn off", ["a", "b"])
+    assert error.value.get_code() == ERROR_JOB_QUEUE_FULL.get_code()
+
+    # Items shared with the queued ones do not count against the limit
+    queue.async_submit("Turn on", ["a", "b"])
+    queue.async_submit("Turn off", ["c"])
+    assert queue.as_dict()["queued"] == 3
+
+
+async def test_submissions_past_the_unfinished_jobs_limit_are_rejected(hass: HomeAssistant) -> None:
+    """Test that a submission is rejected while the configured number of jobs are unfinished."""
+    queue = build_queue(hass, {"max_jobs": 2})
+    queue.async_submit("Turn on", ["a"])
+    queue.async_submit("Turn on", ["b"])
+
+    with pytest.raises(Error) as error:
+        queue.async_submit("Turn on", ["c"])
+    assert error.value.get_code() == ERROR_JOB_QUEUE_FULL.get_code()
+    assert queue.as_dict()["jobs"] == 2
@@ -0,0 +1,38 @@
+"""Tests for the managers of the Devices API component."""
+from custom_components.devices_api.pagination import Pagination
+
+from .benchmarks.builders import get_device_manager
+from .benchmarks.registry_generator import generate_registries, setup_component_data
+
+
+def test_devices_page_skips_devices_removed_before_the_index_update() -> None:
+    """Test that a device still in the index but gone from the registry is left out of the page."""
+    hass = generate_registries(1000)
+    setup_component_data(hass)
+    manager = get_device_manager(hass)
+    first = manager.get_devices_page(Pagination(limit=5))
+    removed = first.get_items()[0].get_id()
+
+    # The registry listener of the index has not run yet
+    del hass.device_registry.devices[removed]
+    page = manager.get_devices_page(Pagination(limit=5))
+
+    assert [device.get_id() for device in page.get_items()] == [
+        device.get_id() for device in first.get_items()[1:]
+    ]
+
+
+def test_device_ids_are_resolved_from_the_index() -> None:
+    """Test that the resolved IDs match the devices of the batch, without loading them."""
+    hass = generate_registries(1000)
+    setup_component_data(hass)
+    manager = get_device_manager(hass)
+    device_ids = list(hass.device_registry.devices)[:3] + ["unknown_device"]
+    area_ids = list(hass.area_registry.areas)[:2] + ["unknown_area"]
+
+    devices, missing_devices, missing_areas = manager.get_devices_batch(device_ids, area_ids)
+    resolved = manager.resolve_device_ids(device_ids, area_ids)
+
+    assert resolved == ([device.get_id() for device in devices], missing_devices, missing_areas)
+    assert missing_devices == ["unknown_device"]
+    assert missing_areas == ["unknown_area"]
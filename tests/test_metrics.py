@@ -0,0 +1,86 @@
+"""Tests for the request metrics of the Devices API component."""
+from asyncio import CancelledError
+
+from aiohttp.test_utils import make_mocked_request
+from aiohttp.web import HTTPNotFound, Request, Response
+from homeassistant.core import HomeAssistant
+import pytest
+
+from custom_components.devices_api.cache import ResponseCache
+from custom_components.devices_api.coalescing import RequestCoalescer
+from custom_components.devices_api.metrics import Metrics
+
+
+# Class: FailingView
+class FailingView:
+    """View whose handler raises the error given in the query string."""
+
+    # Name of the view
+    name = "failing"
+
+    # Raises the requested error (or responds)
+    async def get(self, request: Request) -> Response:
+        """Raise the requested error, or respond."""
+        error = request.query.get("error")
+        if error == "not_found":
+            raise HTTPNotFound()
+        if error == "cancelled":
+            raise CancelledError()
+        if error == "crash":
+            raise ValueError(error)
+        return Response(body=b"{}")
+
+
+# Class: StreamView
+class StreamView:
+    """Long-lived view."""
+
+    # Name of the view
+    name = "stream"
+
+    # The stream lasts as long as the client stays connected
+    long_lived = True
+
+    # Responds
+    async def get(self, request: Request) -> Response:
+        """Respond."""
+        return Response(body=b"{}")
+
+
+# Returns the metrics in the Prometheus text format
+def render(metrics: Metrics) -> str:
+    """Return the metrics in the Prometheus text format."""
+    return metrics.render(ResponseCache(), RequestCoalescer())
+
+
+async def test_failed_requests_are_recorded(hass: HomeAssistant) -> None:
+    """Test that the requests whose handler raises are recorded with their status."""
+    metrics = Metrics()
+    view = FailingView()
+    metrics.instrument(view)
+
+    await view.get(make_mocked_request("GET", "/failing"))
+    with pytest.raises(HTTPNotFound):
+        await view.get(make_mocked_request("GET", "/failing?error=not_found"))
+    with pytest.raises(CancelledError):
+        await view.get(make_mocked_request("GET", "/failing?error=cancelled"))
+    with pytest.raises(ValueError):
+        await view.get(make_mocked_request("GET", "/failing?error=crash"))
+
+    text = render(metrics)
+    for status in (200, 404, 499, 500):
+        assert f'devices_api_requests_total{{endpoint="failing",status="{status}"}} 1' in text
+    assert 'devices_api_request_duration_seconds_count{endpoint="failing"} 4' in text
+
+
+async def test_long_lived_requests_have_no_latency(hass: HomeAssistant) -> None:
+    """Test that long-lived requests are counted but left out of the latency histogram."""
+    metrics = Metrics()
+    view = StreamView()
+    metrics.instrument(view)
+
+    await view.get(make_mocked_request("GET", "/stream"))
+
+    text = render(metrics)
+    assert 'devices_api_requests_total{endpoint="stream",status="200"} 1' in text
+    assert 'devices_api_request_duration_seconds_count{endpoint="stream"} 0' in text
@@ -0,0 +1,43 @@
+"""Tests for the token-budgeted prompt context of the Devices API component."""
+from homeassistant.helpers.entity_registry import RegistryEntry
+
+from custom_components.devices_api.constants import CONFIG, DOMAIN
+from custom_components.devices_api.manager import DeviceManager, Entity
+from custom_components.devices_api.prompt import PromptContextEncoder
+
+from .benchmarks.registry_generator import generate_registries, setup_component_data
+
+
+# Returns an entity of the device, named after the given words
+def build_entity(device_id: str, object_id: str, words: int) -> Entity:
+    """Return an entity of the device, named after the given words."""
+    return Entity(
+        RegistryEntry(
+            entity_id=f"sensor.{object_id}",
+            unique_id=object_id,
+            platform="synthetic",
+            device_id=device_id,
+            original_name=" ".join(["word"] * words),
+        )
+    )
+
+
+def test_encode_device_keeps_smaller_entities_after_one_that_does_not_fit() -> None:
+    """Test that an entity too large for the budget does not leave out the smaller ones ranked after it."""
+    hass = generate_registries(100)
+    setup_component_data(hass)
+    manager = DeviceManager(hass, hass.data[DOMAIN][CONFIG])
+
+    small_device = manager.get_devices()[0]
+    small_device.get_entities().append(build_entity(small_device.get_id(), "small", 1))
+    budget = PromptContextEncoder(10000).encode_device(small_device).get_tokens() + 10
+
+    device = manager.get_devices()[0]
+    device.get_entities().append(build_entity(device.get_id(), "large", 100))
+    device.get_entities().append(build_entity(device.get_id(), "small", 1))
+    context = PromptContextEncoder(budget).encode_device(device)
+
+    assert context.get_omitted_entities() == 1
+    assert "sensor.small" in context.get_text()
+    assert "sensor.large" not in context.get_text()
+    assert context.get_tokens() <= budget
@@ -0,0 +1,17 @@
+"""Tests for the fuzzy name search of the Devices API component."""
+from custom_components.devices_api.constants import CONFIG, DOMAIN
+from custom_components.devices_api.manager import SearchManager
+
+from .benchmarks.registry_generator import generate_registries, setup_component_data
+
+
+def test_search_skips_ignored_entities() -> None:
+    """Test that ignored entities do not take the place of other matches."""
+    hass = generate_registries(1000)
+    setup_component_data(hass, {"ignored_domains": ["sensor"]})
+    manager = SearchManager(hass, hass.data[DOMAIN][CONFIG])
+
+    results = manager.search("temperature", 5)
+
+    assert len(results) == 5
+    assert not [result for result in results if result["id"].startswith("sensor.")]
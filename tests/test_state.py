@@ -0,0 +1,117 @@
+"""Tests for the live entity states of the Devices API component."""
+from json import loads
+from typing import Any
+from unittest.mock import patch
+
+from aiohttp.test_utils import make_mocked_request
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import area_registry as ar, device_registry as dr, entity_registry as er
+from homeassistant.setup import async_setup_component
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.devices_api.encoder import Fragment, encode, encode_fragment
+from custom_components.devices_api.errors import ERROR_INVALID_INCLUDE, Error
+from custom_components.devices_api.state import EntityStates, StateCache
+
+
+async def test_state_change_drops_the_entity_fragments(hass: HomeAssistant) -> None:
+    """Test that a state change drops the fragments of its entity only."""
+    cache = StateCache(hass)
+    cache.async_setup()
+    hass.states.async_set("sensor.power", "10", {"unit_of_measurement": "W"})
+    hass.states.async_set("light.lamp", "on")
+    await hass.async_block_till_done()
+
+    cache.get_state("sensor.power")
+    cache.get_attributes("sensor.power")
+    lamp = cache.get_state("light.lamp")
+    assert cache.as_dict() == {"states": 2, "attributes": 1}
+
+    hass.states.async_set("sensor.power", "20", {"unit_of_measurement": "W"})
+    await hass.async_block_till_done()
+
+    assert cache.as_dict() == {"states": 1, "attributes": 0}
+    assert cache.get_state("light.lamp") is lamp
+    assert b"20" in cache.get_state("sensor.power").get_json()
+
+
+async def test_unchanged_entity_fragments_are_spliced_without_encoding(hass: HomeAssistant) -> None:
+    """Test that the encoded fragment of an unchanged entity is reused after another entity changes."""
+    cache = StateCache(hass)
+    cache.async_setup()
+    hass.states.async_set("sensor.power", "10")
+    hass.states.async_set("light.lamp", "on")
+    await hass.async_block_till_done()
+    lamp = cache.get_state("light.lamp")
+    cache.get_state("sensor.power")
+
+    hass.states.async_set("sensor.power", "20")
+    await hass.async_block_till_done()
+    with patch("custom_components.devices_api.state.encode_fragment", wraps=encode_fragment) as encoded:
+        entities = [{"state": cache.get_state(entity_id)} for entity_id in ("light.lamp", "sensor.power")]
+
+    assert isinstance(lamp, Fragment)
+    assert entities[0]["state"] is lamp
+    assert encoded.call_count == 1
+    for pretty in (False, True):
+        body = loads(encode({"entities": entities}, pretty=pretty))
+        assert [entity["state"]["state"] for entity in body["entities"]] == ["on", "20"]
+
+
+async def test_stop_unsubscribes_from_the_state_changes(hass: HomeAssistant) -> None:
+    """Test that the cache stops listening to the state changes when Home Assistant stops."""
+    cache = StateCache(hass)
+    listeners = hass.bus.async_listeners()
+    cache.async_setup()
+    hass.states.async_set("light.lamp", "on")
+    cache.get_state("light.lamp")
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STOP)
+    await hass.async_block_till_done()
+
+    assert cache.as_dict() == {"states": 0, "attributes": 0}
+    assert hass.bus.async_listeners() == listeners
+
+
+async def test_unknown_include_values_are_rejected(hass: HomeAssistant) -> None:
+    """Test that unknown `include` values raise a copy of the error constant."""
+    request = make_mocked_request("GET", "/api/devices_api/devices?include=state,history")
+
+    with pytest.raises(Error) as rejected:
+        EntityStates.from_request(request, StateCache(hass))
+
+    assert rejected.value is not ERROR_INVALID_INCLUDE
+    assert rejected.value.as_dict() == ERROR_INVALID_INCLUDE.as_dict()
+
+
+async def test_device_lists_include_the_entity_states(hass: HomeAssistant, hass_client: Any) -> None:
+    """Test that the device lists load the entities of every device when their live data is included."""
+    entry = MockConfigEntry(domain="test")
+    entry.add_to_hass(hass)
+    area = ar.async_get(hass).async_create("Office")
+    device = dr.async_get(hass).async_get_or_create(
+        config_entry_id=entry.entry_id, identifiers={("test", "lamp")}, name="Lamp"
+    )
+    dr.async_get(hass).async_update_device(device.id, area_id=area.id)
+    er.async_get(hass).async_get_or_create("light", "test", "lamp", device_id=device.id, config_entry=entry)
+    assert await async_setup_component(hass, "devices_api", {"devices_api": {}})
+    hass.states.async_set("light.test_lamp", "on")
+    client = await hass_client()
+
+    for url in (
+        "/api/devices_api/devices?include=state",
+        "/api/devices_api/devices?include=state&page=1",
+        f"/api/devices_api/areas/{area.id}/devices?include=state",
+        f"/api/devices_api/areas/{area.id}/devices?include=state&stream=1",
+    ):
+        response = await client.get(url)
+        assert response.status == 200, url
+        devices = (await response.json())["data"]
+        if isinstance(devices, dict):
+            devices = devices["items"]
+        assert [entity["state"]["state"] for entity in devices[0]["entities"]] == ["on"], url
+
+    response = await client.get("/api/devices_api/devices?include=history")
+    assert response.status == 400